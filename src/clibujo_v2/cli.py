@@ -6,7 +6,13 @@ from datetime import date
 from . import __version__
 from .core.db import ensure_db, init_db
 from .core.entries import get_entries_by_date, create_entry
-from .core.habits import get_habits_due_on_date, is_completed_on_date, record_completion, get_habit_by_name
+from .core.habits import (
+    get_habits_due_on_date,
+    is_completed_on_date,
+    record_completion,
+    get_habit_by_name,
+    pinned_today,
+)
 from .core.collections import get_collection_by_name
 from .core.undo import undo_last_action
 from .commands.entries import entries, parse_date_arg, parse_signifier
@@ -31,6 +37,11 @@ def cli(ctx, version):
     """
     ensure_db()
 
+    # One-shot commands see a single "today"; interactive sessions can
+    # outlive the day they started on.
+    if ctx.invoked_subcommand != "interactive":
+        ctx.with_resource(pinned_today())
+
     if version:
         click.echo(f"CLIBuJo v{__version__}")
         return
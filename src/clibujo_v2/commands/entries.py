@@ -31,8 +31,9 @@ def parse_signifier(text: str) -> tuple:
 
     Returns (signifier, remaining_text).
     """
-    if text and text[0] in SIGNIFIER_FROM_SYMBOL:
-        return SIGNIFIER_FROM_SYMBOL[text[0]], text[1:].strip()
+    signifier = SIGNIFIER_FROM_SYMBOL.get(text[:1])
+    if signifier:
+        return signifier, text[1:].strip()
     return None, text
 
 
@@ -182,7 +183,7 @@ def reopen_task(entry_id: int):
     if entry:
         click.echo(f"Reopened: {format_entry(entry)}")
     else:
-        raise click.ClickException(f"Entry not found: {entry_id}")
+        raise click.ClickException(f"Entry not found or not a task: {entry_id}")
 
 
 @entries.command("edit")
@@ -21,6 +21,7 @@ from ..core.habits import (
     is_completed_on_date,
     get_habits_due_on_date,
     get_habit_progress,
+    get_all_progress,
     get_habit_calendar,
     get_categories,
 )
@@ -52,11 +53,10 @@ def list_habits(show_all: bool, category: str):
     today_str = today.isoformat()
 
     # Build progress and completion maps
-    progress_map = {}
+    progress_map = get_all_progress(habit_list, today)
     completed_map = {}
 
     for h in habit_list:
-        progress_map[h.id] = get_habit_progress(h, today)
         completed_map[h.id] = is_completed_on_date(h.id, today_str)
 
     output = format_habits_list(habit_list, progress_map, completed_map)
@@ -342,9 +342,10 @@ def today():
 
     click.echo(f"\n== Habits for {today_date.isoformat()} ==\n")
 
+    progress_map = get_all_progress(habits_due, today_date)
     for habit in habits_due:
         completed = is_completed_on_date(habit.id, today_date.isoformat())
-        progress = get_habit_progress(habit, today_date)
+        progress = progress_map[habit.id]
         line = format_habit_status(habit, progress, completed)
         click.echo(f"  {line}")
 
@@ -2,6 +2,7 @@
 
 import click
 from datetime import date
+from typing import Optional
 
 from ..core.db import ensure_db
 from ..core.migrations import (
@@ -186,13 +187,14 @@ def bulk(before_date: str, yes: bool):
 
 @migrate.command("history")
 @click.argument("entry_id", type=int)
-def history(entry_id: int):
+@click.option("--limit", "-n", type=click.IntRange(min=1), help="Show only the most recent N")
+def history(entry_id: int, limit: Optional[int]):
     """View migration history for an entry."""
     entry = get_entry(entry_id)
     if not entry:
         raise click.ClickException(f"Entry not found: {entry_id}")
 
-    migrations = get_migration_history(entry_id)
+    migrations = get_migration_history(entry_id, limit=limit)
 
     if not migrations:
         click.echo(f"No migration history for entry #{entry_id}")
@@ -1,14 +1,16 @@
 """Mood tracking CLI commands for CLIBuJo v2."""
 
+import re
+
 import click
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from ..core.db import ensure_db
 from ..core.mood import (
-    MoodEntry, WatchData, Medication, Episode, MoodTrigger,
+    MoodEntry, Medication, Episode, MoodTrigger,
     get_mood_entry, save_mood_entry, undo_mood_entry,
-    get_watch_data, save_watch_data,
+    update_mood_note, get_watch_data, update_watch_fields,
     get_medications, get_medication_by_name, add_medication,
     deactivate_medication, log_medication, get_med_logs_for_date,
     get_current_episode, start_episode, end_episode, add_episode, get_episodes,
@@ -22,18 +24,51 @@ from ..core.mood_display import (
 )
 
 
+_ONE_DAY = timedelta(days=1)
+
+# ASCII digits only: int() alone would accept signs, spaces and other scripts
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+_YEAR_MONTH_RE = re.compile(r"(\d{4})-(\d{2})", re.ASCII)
+
+# Any of <, >, <=, >=, =, != contains one of these characters
+_TRIGGER_OP_RE = re.compile(r"[<>=]")
+
+# Row formatters for the list views
+_MED_ROW = "{:<20} {:<12} {:<12} {}".format
+_TRIG_ROW = "{:<5} {:<8} {:<30} {}".format
+_BASELINE_ROW = "  {:12} {:>6.1f} (std = {:.1f})".format
+_BASELINE_RANGE = "  {:12} Normal range: {:.1f} to {:.1f}".format
+
+
+def _fast_iso_date(s: str) -> date:
+    """Parse an exact 'YYYY-MM-DD' string without going through strptime."""
+    if not _ISO_DATE_RE.fullmatch(s):
+        raise ValueError(f"Invalid date: {s}")
+    return date.fromisoformat(s)
+
+
+def _fast_year_month(s: str) -> Tuple[int, int]:
+    """Parse an exact 'YYYY-MM' string into (year, month)."""
+    match = _YEAR_MONTH_RE.fullmatch(s)
+    if not match:
+        raise ValueError(f"Invalid month: {s}")
+    year, month = int(match[1]), int(match[2])
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month: {s}")
+    return year, month
+
+
 def parse_mood_date(date_str: Optional[str]) -> str:
     """Parse date string or return today's date."""
     if date_str is None:
         return date.today().isoformat()
     if date_str == "yesterday":
-        return (date.today() - timedelta(days=1)).isoformat()
+        return (date.today() - _ONE_DAY).isoformat()
     if date_str == "today":
         return date.today().isoformat()
     # Try to parse as date
     try:
-        parsed = datetime.strptime(date_str, "%Y-%m-%d")
-        return parsed.date().isoformat()
+        return _fast_iso_date(date_str).isoformat()
     except ValueError:
         raise click.BadParameter(f"Invalid date format: {date_str}. Use YYYY-MM-DD")
 
@@ -205,8 +240,7 @@ def mood_watch(values: tuple, date_str: Optional[str]):
             click.echo(f"Error: Invalid value for {key}: {val}")
             return
 
-    data = WatchData(date=target_date, **updates)
-    save_watch_data(data)
+    update_watch_fields(target_date, updates)
 
     click.echo(f"[x] Added watch data for {target_date}")
 
@@ -221,26 +255,27 @@ def mood_note(text: Optional[str], date_str: Optional[str]):
     if text is None:
         text = click.prompt("Note")
 
-    entry = MoodEntry(date=target_date, note=text)
-    save_mood_entry(entry)
+    update_mood_note(target_date, text)
     click.echo(f"[x] Note saved for {target_date}")
 
 
 # ============ Viewing Commands ============
 
+def _show_for_date(date_str: str) -> None:
+    """Print the single-day mood view for a date."""
+    click.echo(format_mood_today(date_str))
+
+
 @mood.command("today")
 def mood_today():
     """Show today's mood entry."""
-    output = format_mood_today(date.today().isoformat())
-    click.echo(output)
+    _show_for_date(date.today().isoformat())
 
 
 @mood.command("yesterday")
 def mood_yesterday():
     """Show yesterday's mood entry."""
-    yesterday_date = (date.today() - timedelta(days=1)).isoformat()
-    output = format_mood_today(yesterday_date)
-    click.echo(output)
+    _show_for_date((date.today() - _ONE_DAY).isoformat())
 
 
 @mood.command("week")
@@ -256,14 +291,15 @@ def mood_week(offset: int):
 def mood_month(month_str: Optional[str]):
     """Show monthly mood summary."""
     if month_str is None:
-        target_date = date.today()
+        today = date.today()
+        year, month = today.year, today.month
     else:
         try:
-            target_date = datetime.strptime(month_str, "%Y-%m").date()
+            year, month = _fast_year_month(month_str)
         except ValueError:
             click.echo("Error: Invalid month format. Use YYYY-MM")
             return
-    output = format_mood_month(target_date.year, target_date.month)
+    output = format_mood_month(year, month)
     click.echo(output)
 
 
@@ -301,13 +337,15 @@ def meds_list(show_all: bool):
         click.echo("No medications configured. Use 'bujo mood meds add' to add one.")
         return
 
-    click.echo("\nMedications\n")
-    click.echo(f"{'Name':<20} {'Dose':<12} {'Time':<12} {'Status'}")
-    click.echo("-" * 60)
+    lines = ["\nMedications\n"]
+    lines.append(_MED_ROW("Name", "Dose", "Time", "Status"))
+    lines.append("-" * 60)
 
     for med in medications:
         status = "active" if med.active else f"inactive ({med.deactivated_at[:10] if med.deactivated_at else ''})"
-        click.echo(f"{med.name:<20} {med.dosage or '-':<12} {med.time_of_day or '-':<12} {status}")
+        lines.append(_MED_ROW(med.name, med.dosage or "-", med.time_of_day or "-", status))
+
+    click.echo("\n".join(lines))
 
 
 @meds.command("add")
@@ -440,8 +478,8 @@ def episode_add_cmd(start_date: str, end_date: str, ep_type: str,
     """Add a past episode with start and end dates."""
     # Validate dates
     try:
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
+        start = _fast_iso_date(start_date)
+        end = _fast_iso_date(end_date)
     except ValueError:
         click.echo("Error: Invalid date format. Use YYYY-MM-DD")
         return
@@ -465,7 +503,7 @@ def episode_list(months: int):
         click.echo(f"No episodes in the last {months} months.")
         return
 
-    click.echo(f"\nEpisodes (last {months} months)\n")
+    lines = [f"\nEpisodes (last {months} months)\n"]
 
     for ep in episodes:
         if ep.end_date:
@@ -477,11 +515,13 @@ def episode_list(months: int):
             date_range = f"{ep.start_date} - (ongoing)"
 
         severity_str = f"Severity: {ep.severity}/5" if ep.severity else ""
-        click.echo(f"  {date_range}")
-        click.echo(f"    {ep.type.capitalize()} {severity_str}")
+        lines.append(f"  {date_range}")
+        lines.append(f"    {ep.type.capitalize()} {severity_str}")
         if ep.note:
-            click.echo(f'    "{ep.note}"')
-        click.echo()
+            lines.append(f'    "{ep.note}"')
+        lines.append("")
+
+    click.echo("\n".join(lines))
 
 
 # ============ Trigger Commands ============
@@ -497,7 +537,7 @@ def trigger():
 @click.option("--warn", "-w", "message", required=True, help="Warning message")
 def trigger_add(condition: str, message: str):
     """Add a custom trigger. Condition format: 'sleep < 5.5 for 2 days'"""
-    if not any(op in condition for op in ["<", ">", "=", "!="]):
+    if _TRIGGER_OP_RE.search(condition) is None:
         click.echo("Error: Invalid condition. Must contain a comparison operator (<, >, <=, >=, =, !=)")
         return
 
@@ -515,14 +555,16 @@ def trigger_list(show_all: bool):
         click.echo("No triggers configured.")
         return
 
-    click.echo("\nTriggers\n")
-    click.echo(f"{'ID':<5} {'Active':<8} {'Condition':<30} Message")
-    click.echo("-" * 70)
+    lines = ["\nTriggers\n"]
+    lines.append(_TRIG_ROW("ID", "Active", "Condition", "Message"))
+    lines.append("-" * 70)
 
     for trig in triggers:
         active = "yes" if trig.active else "no"
         cond = trig.condition if len(trig.condition) < 28 else trig.condition[:25] + "..."
-        click.echo(f"{trig.id:<5} {active:<8} {cond:<30} {trig.message}")
+        lines.append(_TRIG_ROW(trig.id, active, cond, trig.message))
+
+    click.echo("\n".join(lines))
 
 
 @trigger.command("enable")
@@ -580,16 +622,18 @@ def baseline_show():
         click.echo("No baselines calculated yet. Use 'bujo mood baseline recalculate' after logging data.")
         return
 
-    click.echo("\nYour Baselines\n")
+    lines = ["\nYour Baselines\n"]
 
     for b in baselines:
         low = b.value - b.std_dev
         high = b.value + b.std_dev
-        click.echo(f"  {b.metric:12} {b.value:>6.1f} (std = {b.std_dev:.1f})")
-        click.echo(f"  {'':12} Normal range: {low:.1f} to {high:.1f}")
-        click.echo()
+        lines.append(_BASELINE_ROW(b.metric, b.value, b.std_dev))
+        lines.append(_BASELINE_RANGE("", low, high))
+        lines.append("")
+
+    lines.append(f"(Based on {baselines[0].days_used} days of data, calculated {baselines[0].calculated_at[:10]})")
 
-    click.echo(f"(Based on {baselines[0].days_used} days of data, calculated {baselines[0].calculated_at[:10]})")
+    click.echo("\n".join(lines))
 
 
 @baseline.command("recalculate")
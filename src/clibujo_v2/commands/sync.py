@@ -62,34 +62,34 @@ def status(remote):
     """Show sync status."""
     info = get_sync_status(remote)
 
-    click.echo("\n== Sync Status ==\n")
+    lines = ["\n== Sync Status ==\n"]
 
     # rclone status
     if info["rclone_available"]:
-        click.echo("rclone: installed")
+        lines.append("rclone: installed")
     else:
-        click.echo("rclone: NOT INSTALLED")
-        click.echo("  Install from: https://rclone.org/install/")
+        lines.append("rclone: NOT INSTALLED")
+        lines.append("  Install from: https://rclone.org/install/")
 
     # Remote config
     if info["remote"]:
-        click.echo(f"Remote: {info['remote']}")
+        lines.append(f"Remote: {info['remote']}")
     else:
-        click.echo("Remote: NOT CONFIGURED")
-        click.echo("  Set BUJO_SYNC_REMOTE environment variable")
+        lines.append("Remote: NOT CONFIGURED")
+        lines.append("  Set BUJO_SYNC_REMOTE environment variable")
 
-    click.echo()
+    lines.append("")
 
     # Timestamps
     if info["local_mtime"]:
-        click.echo(f"Local modified:  {info['local_mtime']}")
+        lines.append(f"Local modified:  {info['local_mtime']}")
     else:
-        click.echo("Local database:  NOT FOUND")
+        lines.append("Local database:  NOT FOUND")
 
     if info["remote_mtime"]:
-        click.echo(f"Remote modified: {info['remote_mtime']}")
+        lines.append(f"Remote modified: {info['remote_mtime']}")
     elif info["remote"]:
-        click.echo("Remote database: NOT FOUND")
+        lines.append("Remote database: NOT FOUND")
 
     # Status
     status_messages = {
@@ -102,8 +102,10 @@ def status(remote):
         "unknown": "Unknown",
     }
 
-    click.echo(f"\nStatus: {status_messages.get(info['status'], info['status'])}")
-    click.echo(f"Backups: {info['backups']} available")
+    lines.append(f"\nStatus: {status_messages.get(info['status'], info['status'])}")
+    lines.append(f"Backups: {info['backups']} available")
+
+    click.echo("\n".join(lines))
 
 
 @sync.command("backups")
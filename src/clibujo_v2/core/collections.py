@@ -1,12 +1,69 @@
 """Collection CRUD operations for CLIBuJo v2."""
 
-import json
 import sqlite3
-from datetime import datetime
-from typing import Optional, List
-
-from .db import get_connection, ensure_db, cleanup_undo_history
-from .models import Collection, CollectionType
+from typing import Optional, List, Dict, Sequence
+
+from .db import get_shared_connection, get_read_connection, transaction, sqlite_now
+from .models import Collection, dump_json
+from .entries import escape_fts_query
+
+
+# Statements shared by several functions; constant text keeps them in the
+# connection's prepared statement cache.
+_SQL_GET_BY_ID = "SELECT * FROM collections WHERE id = ?"
+_SQL_GET_BY_NAME = "SELECT * FROM collections WHERE name = ? COLLATE NOCASE"
+_SQL_INSERT = """
+    INSERT INTO collections (name, type, description)
+    VALUES (?, ?, ?)
+    RETURNING *
+"""
+_SQL_ALL = "SELECT * FROM collections ORDER BY type, name"
+_SQL_ALL_ACTIVE = "SELECT * FROM collections WHERE archived_at IS NULL ORDER BY type, name"
+_SQL_ALL_OF_TYPE = "SELECT * FROM collections WHERE type = ? ORDER BY type, name"
+_SQL_ALL_ACTIVE_OF_TYPE = (
+    "SELECT * FROM collections WHERE archived_at IS NULL AND type = ? ORDER BY type, name"
+)
+_SQL_SET_ARCHIVED = "UPDATE collections SET archived_at = ? WHERE id = ? RETURNING *"
+_SQL_RECORD_UNDO = """
+    INSERT INTO undo_history (action_type, table_name, record_id, old_data, new_data)
+    VALUES (?, 'collections', ?, ?, ?)
+"""
+_SQL_STATS = """
+    SELECT
+        COUNT(*) AS total,
+        COALESCE(SUM(entry_type = 'task'), 0) AS tasks,
+        COALESCE(SUM(entry_type = 'event'), 0) AS events,
+        COALESCE(SUM(entry_type = 'note'), 0) AS notes,
+        COALESCE(SUM(entry_type = 'task' AND status = 'open'), 0) AS open,
+        COALESCE(SUM(entry_type = 'task' AND status = 'complete'), 0) AS complete
+    FROM entries
+    WHERE collection_id = ?
+"""
+_SQL_SEARCH = """
+    SELECT c.* FROM collections c
+    JOIN collections_fts f ON f.rowid = c.id
+    WHERE collections_fts MATCH ?
+    ORDER BY c.type, c.name
+"""
+_SQL_SEARCH_ACTIVE = """
+    SELECT c.* FROM collections c
+    JOIN collections_fts f ON f.rowid = c.id
+    WHERE collections_fts MATCH ?
+      AND c.archived_at IS NULL
+    ORDER BY c.type, c.name
+"""
+# The trigram tokenizer can't match fewer than 3 characters
+_SQL_SEARCH_SHORT = """
+    SELECT * FROM collections
+    WHERE name LIKE ?
+    ORDER BY type, name
+"""
+_SQL_SEARCH_SHORT_ACTIVE = """
+    SELECT * FROM collections
+    WHERE name LIKE ?
+      AND archived_at IS NULL
+    ORDER BY type, name
+"""
 
 
 def validate_name(name: str) -> str:
@@ -27,20 +84,19 @@ def _record_undo(
     old_data: Optional[dict] = None,
     new_data: Optional[dict] = None,
 ) -> None:
-    """Record an action for undo capability."""
+    """Record an action for undo capability.
+
+    History is capped by the undo_history_cap trigger.
+    """
     conn.execute(
-        """
-        INSERT INTO undo_history (action_type, table_name, record_id, old_data, new_data)
-        VALUES (?, 'collections', ?, ?, ?)
-        """,
+        _SQL_RECORD_UNDO,
         (
             action_type,
             record_id,
-            json.dumps(old_data) if old_data else None,
-            json.dumps(new_data) if new_data else None,
+            dump_json(old_data) if old_data else None,
+            dump_json(new_data) if new_data else None,
         ),
     )
-    cleanup_undo_history(conn)
 
 
 def create_collection(
@@ -65,68 +121,70 @@ def create_collection(
     # Validate name
     name = validate_name(name)
 
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    try:
+    with transaction(conn):
         cursor = conn.execute(
-            """
-            INSERT INTO collections (name, type, description)
-            VALUES (?, ?, ?)
-            """,
+            _SQL_INSERT,
             (name, collection_type, description),
         )
-        collection_id = cursor.lastrowid
-
-        # Fetch the created collection
-        cursor = conn.execute("SELECT * FROM collections WHERE id = ?", (collection_id,))
-        collection = Collection.from_row(cursor.fetchone())
+        row = cursor.fetchone()
 
         # Record for undo
-        _record_undo(conn, "create", collection_id, new_data=collection.to_dict())
+        _record_undo(conn, "create", row["id"], new_data=dict(row))
 
-        conn.commit()
-        return collection
-    finally:
-        if should_close:
-            conn.close()
+        return Collection.from_tuple(row)
 
 
 def get_collection(collection_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Collection]:
     """Get a collection by ID."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        cursor = conn.execute("SELECT * FROM collections WHERE id = ?", (collection_id,))
-        row = cursor.fetchone()
-        return Collection.from_row(row) if row else None
-    finally:
-        if should_close:
-            conn.close()
+    cursor = conn.execute(_SQL_GET_BY_ID, (collection_id,))
+    row = cursor.fetchone()
+    return Collection.from_tuple(row) if row else None
 
 
 def get_collection_by_name(name: str, conn: Optional[sqlite3.Connection] = None) -> Optional[Collection]:
     """Get a collection by name (case-insensitive)."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
+
+    cursor = conn.execute(_SQL_GET_BY_NAME, (name,))
+    row = cursor.fetchone()
+    return Collection.from_tuple(row) if row else None
+
+
+# Stay under SQLite's default host parameter limit (999)
+_IN_CHUNK_SIZE = 900
+
+
+def get_collections(
+    collection_ids: Sequence[int],
+    conn: Optional[sqlite3.Connection] = None,
+) -> Dict[int, Collection]:
+    """Get many collections by ID in as few queries as possible.
+
+    Returns dict mapping id to Collection; unknown ids are omitted.
+    """
+    if conn is None:
+        conn = get_read_connection()
 
-    try:
+    ids = list(dict.fromkeys(collection_ids))
+    result = {}
+    for start in range(0, len(ids), _IN_CHUNK_SIZE):
+        chunk = ids[start:start + _IN_CHUNK_SIZE]
+        placeholders = ",".join("?" * len(chunk))
         cursor = conn.execute(
-            "SELECT * FROM collections WHERE name = ? COLLATE NOCASE",
-            (name,),
+            f"SELECT * FROM collections WHERE id IN ({placeholders})",
+            chunk,
         )
-        row = cursor.fetchone()
-        return Collection.from_row(row) if row else None
-    finally:
-        if should_close:
-            conn.close()
+        for row in cursor.fetchall():
+            collection = Collection.from_tuple(row)
+            result[collection.id] = collection
+    return result
 
 
 def get_all_collections(
@@ -143,36 +201,15 @@ def get_all_collections(
     Returns:
         List of collections
     """
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    try:
-        conditions = []
-        params = []
-
-        if not include_archived:
-            conditions.append("archived_at IS NULL")
+        conn = get_read_connection()
 
-        if collection_type:
-            conditions.append("type = ?")
-            params.append(collection_type)
-
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-        cursor = conn.execute(
-            f"""
-            SELECT * FROM collections
-            WHERE {where_clause}
-            ORDER BY type, name
-            """,
-            params,
-        )
-        return [Collection.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    if collection_type:
+        sql = _SQL_ALL_OF_TYPE if include_archived else _SQL_ALL_ACTIVE_OF_TYPE
+        cursor = conn.execute(sql, (collection_type,))
+    else:
+        cursor = conn.execute(_SQL_ALL if include_archived else _SQL_ALL_ACTIVE)
+    return list(map(Collection.from_tuple, cursor.fetchall()))
 
 
 def update_collection(
@@ -186,20 +223,18 @@ def update_collection(
     Only provided fields are updated.
     Returns updated Collection or None if not found.
     """
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    try:
+    with transaction(conn):
         # Get current collection for undo
-        cursor = conn.execute("SELECT * FROM collections WHERE id = ?", (collection_id,))
+        cursor = conn.execute(_SQL_GET_BY_ID, (collection_id,))
         row = cursor.fetchone()
         if not row:
             return None
 
-        old_collection = Collection.from_row(row)
-        old_data = old_collection.to_dict()
+        # Snapshot for undo straight from the row
+        old_data = dict(row)
 
         # Build update query
         updates = []
@@ -213,99 +248,60 @@ def update_collection(
             params.append(description if description else None)
 
         if not updates:
-            return old_collection
+            return Collection.from_tuple(row)
 
         params.append(collection_id)
 
-        conn.execute(
-            f"UPDATE collections SET {', '.join(updates)} WHERE id = ?",
+        cursor = conn.execute(
+            f"UPDATE collections SET {', '.join(updates)} WHERE id = ? RETURNING *",
             params,
         )
-
-        # Fetch updated collection
-        cursor = conn.execute("SELECT * FROM collections WHERE id = ?", (collection_id,))
-        new_collection = Collection.from_row(cursor.fetchone())
+        new_row = cursor.fetchone()
 
         # Record for undo
-        _record_undo(conn, "update", collection_id, old_data=old_data, new_data=new_collection.to_dict())
+        _record_undo(conn, "update", collection_id, old_data=old_data, new_data=dict(new_row))
 
-        conn.commit()
-        return new_collection
-    finally:
-        if should_close:
-            conn.close()
+        return Collection.from_tuple(new_row)
 
 
-def archive_collection(collection_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Collection]:
-    """Archive a collection."""
-    ensure_db()
-    should_close = conn is None
+def _set_archive(
+    collection_id: int,
+    archived: bool,
+    conn: Optional[sqlite3.Connection] = None,
+) -> Optional[Collection]:
+    """Set or clear archived_at, recording the change for undo."""
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    try:
+    with transaction(conn):
         # Get current collection for undo
-        cursor = conn.execute("SELECT * FROM collections WHERE id = ?", (collection_id,))
+        cursor = conn.execute(_SQL_GET_BY_ID, (collection_id,))
         row = cursor.fetchone()
         if not row:
             return None
 
-        old_collection = Collection.from_row(row)
-        old_data = old_collection.to_dict()
+        old_data = dict(row)
 
-        conn.execute(
-            "UPDATE collections SET archived_at = datetime('now') WHERE id = ?",
-            (collection_id,),
+        cursor = conn.execute(
+            _SQL_SET_ARCHIVED,
+            (sqlite_now() if archived else None, collection_id),
         )
-
-        # Fetch updated collection
-        cursor = conn.execute("SELECT * FROM collections WHERE id = ?", (collection_id,))
-        new_collection = Collection.from_row(cursor.fetchone())
+        new_row = cursor.fetchone()
 
         # Record for undo
-        _record_undo(conn, "update", collection_id, old_data=old_data, new_data=new_collection.to_dict())
-
-        conn.commit()
-        return new_collection
-    finally:
-        if should_close:
-            conn.close()
-
-
-def unarchive_collection(collection_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Collection]:
-    """Unarchive a collection."""
-    ensure_db()
-    should_close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    try:
-        # Get current collection for undo
-        cursor = conn.execute("SELECT * FROM collections WHERE id = ?", (collection_id,))
-        row = cursor.fetchone()
-        if not row:
-            return None
+        _record_undo(conn, "update", collection_id, old_data=old_data, new_data=dict(new_row))
 
-        old_collection = Collection.from_row(row)
-        old_data = old_collection.to_dict()
+        return Collection.from_tuple(new_row)
 
-        conn.execute(
-            "UPDATE collections SET archived_at = NULL WHERE id = ?",
-            (collection_id,),
-        )
 
-        # Fetch updated collection
-        cursor = conn.execute("SELECT * FROM collections WHERE id = ?", (collection_id,))
-        new_collection = Collection.from_row(cursor.fetchone())
+def archive_collection(collection_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Collection]:
+    """Archive a collection."""
+    return _set_archive(collection_id, True, conn)
 
-        # Record for undo
-        _record_undo(conn, "update", collection_id, old_data=old_data, new_data=new_collection.to_dict())
 
-        conn.commit()
-        return new_collection
-    finally:
-        if should_close:
-            conn.close()
+def unarchive_collection(collection_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Collection]:
+    """Unarchive a collection."""
+    return _set_archive(collection_id, False, conn)
 
 
 def delete_collection(
@@ -322,20 +318,12 @@ def delete_collection(
     Returns:
         True if deleted
     """
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    try:
-        # Get collection for undo
-        cursor = conn.execute("SELECT * FROM collections WHERE id = ?", (collection_id,))
-        row = cursor.fetchone()
-        if not row:
-            return False
-
-        old_collection = Collection.from_row(row)
+        conn = get_shared_connection()
 
+    with transaction(conn):
+        # Entries must let go of the collection before it can be deleted;
+        # both statements are no-ops if the collection doesn't exist.
         if delete_entries:
             conn.execute("DELETE FROM entries WHERE collection_id = ?", (collection_id,))
         else:
@@ -344,15 +332,18 @@ def delete_collection(
                 (collection_id,),
             )
 
-        # Record for undo before deleting
-        _record_undo(conn, "delete", collection_id, old_data=old_collection.to_dict())
+        cursor = conn.execute(
+            "DELETE FROM collections WHERE id = ? RETURNING *",
+            (collection_id,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            return False
+
+        # Record for undo
+        _record_undo(conn, "delete", collection_id, old_data=dict(row))
 
-        conn.execute("DELETE FROM collections WHERE id = ?", (collection_id,))
-        conn.commit()
         return True
-    finally:
-        if should_close:
-            conn.close()
 
 
 def get_collection_stats(
@@ -360,42 +351,11 @@ def get_collection_stats(
     conn: Optional[sqlite3.Connection] = None,
 ) -> dict:
     """Get statistics for a collection."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    try:
-        stats = {"total": 0, "tasks": 0, "events": 0, "notes": 0, "open": 0, "complete": 0}
-
-        cursor = conn.execute(
-            """
-            SELECT entry_type, status, COUNT(*) as count
-            FROM entries
-            WHERE collection_id = ?
-            GROUP BY entry_type, status
-            """,
-            (collection_id,),
-        )
-
-        for row in cursor.fetchall():
-            entry_type = row["entry_type"]
-            status = row["status"]
-            count = row["count"]
-
-            stats["total"] += count
-            stats[entry_type + "s"] = stats.get(entry_type + "s", 0) + count
-
-            if entry_type == "task":
-                if status == "complete":
-                    stats["complete"] += count
-                elif status == "open":
-                    stats["open"] += count
+        conn = get_read_connection()
 
-        return stats
-    finally:
-        if should_close:
-            conn.close()
+    row = conn.execute(_SQL_STATS, (collection_id,)).fetchone()
+    return dict(row)
 
 
 def search_collections(
@@ -403,33 +363,18 @@ def search_collections(
     include_archived: bool = False,
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Collection]:
-    """Search collections by name."""
-    ensure_db()
-    should_close = conn is None
+    """Search collections by name (case-insensitive substring).
+
+    Uses the trigram index; queries shorter than 3 characters fall back
+    to a LIKE scan.
+    """
     if conn is None:
-        conn = get_connection()
-
-    try:
-        if include_archived:
-            cursor = conn.execute(
-                """
-                SELECT * FROM collections
-                WHERE name LIKE ?
-                ORDER BY type, name
-                """,
-                (f"%{query}%",),
-            )
-        else:
-            cursor = conn.execute(
-                """
-                SELECT * FROM collections
-                WHERE name LIKE ?
-                  AND archived_at IS NULL
-                ORDER BY type, name
-                """,
-                (f"%{query}%",),
-            )
-        return [Collection.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+        conn = get_read_connection()
+
+    if len(query) < 3:
+        sql = _SQL_SEARCH_SHORT if include_archived else _SQL_SEARCH_SHORT_ACTIVE
+        cursor = conn.execute(sql, (f"%{query}%",))
+    else:
+        sql = _SQL_SEARCH if include_archived else _SQL_SEARCH_ACTIVE
+        cursor = conn.execute(sql, (escape_fts_query(query),))
+    return list(map(Collection.from_tuple, cursor.fetchall()))
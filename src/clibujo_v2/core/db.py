@@ -1,9 +1,19 @@
 """Database initialization and connection management for CLIBuJo v2."""
 
+import atexit
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+
+def sqlite_now() -> str:
+    """Current UTC time in the same format as SQLite's datetime('now')."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
 
 # Default data directory - respect BUJO_DIR env var
 def get_data_dir() -> Path:
@@ -46,6 +56,9 @@ CREATE TABLE IF NOT EXISTS collections (
 );
 
 -- Entries (tasks, events, notes)
+-- entry_type/status/signifier stay TEXT: the values are short, every
+-- module and export filters on the names, and the covering
+-- (collection_id, entry_type, status) index already keeps stats off the table.
 CREATE TABLE IF NOT EXISTS entries (
     id INTEGER PRIMARY KEY,
     collection_id INTEGER,
@@ -92,6 +105,9 @@ CREATE TABLE IF NOT EXISTS habits (
 );
 
 -- Habit completions
+-- completion_date stays ISO TEXT like every other date column: ISO strings
+-- sort and compare in date order, so BETWEEN uses the (habit_id,
+-- completion_date) unique index, and undo, sync and export read them as-is.
 CREATE TABLE IF NOT EXISTS habit_completions (
     id INTEGER PRIMARY KEY,
     habit_id INTEGER NOT NULL,
@@ -226,20 +242,53 @@ CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
     content_rowid=id
 );
 
+-- Substring search for collection names
+CREATE VIRTUAL TABLE IF NOT EXISTS collections_fts USING fts5(
+    name,
+    content=collections,
+    content_rowid=id,
+    tokenize='trigram'
+);
+
 -- Indexes
-CREATE INDEX IF NOT EXISTS idx_entries_date ON entries(entry_date);
-CREATE INDEX IF NOT EXISTS idx_entries_month ON entries(entry_month);
-CREATE INDEX IF NOT EXISTS idx_entries_collection ON entries(collection_id);
+-- Entry indexes end in sort_order so the daily and monthly views
+-- and the open task list read rows already in display order
+CREATE INDEX IF NOT EXISTS idx_entries_date_sort ON entries(entry_date, sort_order);
+CREATE INDEX IF NOT EXISTS idx_entries_month_sort ON entries(entry_month, entry_date, sort_order);
+-- Exact (collection, date, month) context for create_entry's next sort_order;
+-- its collection_id prefix also serves the collection view
+CREATE INDEX IF NOT EXISTS idx_entries_context_sort ON entries(collection_id, entry_date, entry_month, sort_order);
+-- Partial index over open tasks only: get_tasks_needing_migration reads it
+-- in ORDER BY order without a sort, and it stays small as tasks close
+CREATE INDEX IF NOT EXISTS idx_entries_open_tasks_due ON entries(entry_date, entry_month, sort_order)
+    WHERE entry_type = 'task' AND status = 'open';
+-- Covers get_collection_stats' aggregation
+CREATE INDEX IF NOT EXISTS idx_entries_collection_type_status ON entries(collection_id, entry_type, status);
+DROP INDEX IF EXISTS idx_entries_collection;
+DROP INDEX IF EXISTS idx_entries_open_tasks;
+DROP INDEX IF EXISTS idx_entries_collection_sort;
+DROP INDEX IF EXISTS idx_entries_date;
+DROP INDEX IF EXISTS idx_entries_month;
+DROP INDEX IF EXISTS idx_entries_type;
 CREATE INDEX IF NOT EXISTS idx_entries_status ON entries(status);
-CREATE INDEX IF NOT EXISTS idx_entries_type ON entries(entry_type);
 CREATE INDEX IF NOT EXISTS idx_habit_completions_date ON habit_completions(completion_date);
-CREATE INDEX IF NOT EXISTS idx_habit_completions_habit ON habit_completions(habit_id);
-CREATE INDEX IF NOT EXISTS idx_migrations_entry ON migrations(entry_id);
+-- UNIQUE(habit_id, completion_date) already indexes per-habit lookups
+DROP INDEX IF EXISTS idx_habit_completions_habit;
+-- get_migration_history reads one entry's records newest first straight
+-- from this index; the entry_id prefix also serves the FK cascade
+CREATE INDEX IF NOT EXISTS idx_migrations_entry_time ON migrations(entry_id, migrated_at);
+DROP INDEX IF EXISTS idx_migrations_entry;
 CREATE INDEX IF NOT EXISTS idx_undo_created ON undo_history(created_at);
-CREATE INDEX IF NOT EXISTS idx_mood_entries_date ON mood_entries(date);
-CREATE INDEX IF NOT EXISTS idx_watch_data_date ON watch_data(date);
-CREATE INDEX IF NOT EXISTS idx_med_logs_date ON med_logs(date);
-CREATE INDEX IF NOT EXISTS idx_episodes_dates ON episodes(start_date, end_date);
+-- UNIQUE(date) and UNIQUE(med_id, date) already index the mood date lookups
+DROP INDEX IF EXISTS idx_mood_entries_date;
+DROP INDEX IF EXISTS idx_watch_data_date;
+DROP INDEX IF EXISTS idx_med_logs_date;
+-- Open episode lookup (end_date IS NULL ORDER BY start_date DESC) and recent range
+CREATE INDEX IF NOT EXISTS idx_episodes_open ON episodes(start_date) WHERE end_date IS NULL;
+CREATE INDEX IF NOT EXISTS idx_episodes_start ON episodes(start_date);
+DROP INDEX IF EXISTS idx_episodes_dates;
+-- Active medication list, already in display order
+CREATE INDEX IF NOT EXISTS idx_medications_active ON medications(active, time_of_day, name);
 """
 
 # FTS triggers - each stored separately to avoid parsing issues
@@ -262,7 +311,63 @@ CREATE TRIGGER IF NOT EXISTS entries_fts_update AFTER UPDATE OF content ON entri
 END
 """
 
-FTS_TRIGGERS = [FTS_TRIGGER_INSERT, FTS_TRIGGER_DELETE, FTS_TRIGGER_UPDATE]
+COLLECTIONS_FTS_TRIGGER_INSERT = """
+CREATE TRIGGER IF NOT EXISTS collections_fts_insert AFTER INSERT ON collections BEGIN
+    INSERT INTO collections_fts(rowid, name) VALUES (new.id, new.name);
+END
+"""
+
+COLLECTIONS_FTS_TRIGGER_DELETE = """
+CREATE TRIGGER IF NOT EXISTS collections_fts_delete AFTER DELETE ON collections BEGIN
+    INSERT INTO collections_fts(collections_fts, rowid, name) VALUES('delete', old.id, old.name);
+END
+"""
+
+COLLECTIONS_FTS_TRIGGER_UPDATE = """
+CREATE TRIGGER IF NOT EXISTS collections_fts_update AFTER UPDATE OF name ON collections BEGIN
+    INSERT INTO collections_fts(collections_fts, rowid, name) VALUES('delete', old.id, old.name);
+    INSERT INTO collections_fts(rowid, name) VALUES (new.id, new.name);
+END
+"""
+
+FTS_TRIGGERS = [
+    FTS_TRIGGER_INSERT, FTS_TRIGGER_DELETE, FTS_TRIGGER_UPDATE,
+    COLLECTIONS_FTS_TRIGGER_INSERT, COLLECTIONS_FTS_TRIGGER_DELETE, COLLECTIONS_FTS_TRIGGER_UPDATE,
+]
+
+# Number of undo levels kept
+UNDO_HISTORY_LIMIT = 50
+
+# Cap undo history on insert instead of sweeping it after every write
+UNDO_TRIGGER_CAP = f"""
+CREATE TRIGGER IF NOT EXISTS undo_history_cap AFTER INSERT ON undo_history BEGIN
+    DELETE FROM undo_history WHERE id <= new.id - {UNDO_HISTORY_LIMIT};
+END
+"""
+
+# Snapshot the previous mood_entries row for one-level undo; any UPDATE,
+# including an UPSERT's DO UPDATE, records it without a Python round trip
+MOOD_HISTORY_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS mood_entry_history_snapshot AFTER UPDATE ON mood_entries BEGIN
+    INSERT INTO mood_entry_history (entry_id, previous_data, changed_at)
+    VALUES (old.id, json_object(
+        'id', old.id, 'date', old.date, 'mood', old.mood, 'energy', old.energy,
+        'sleep_hours', old.sleep_hours, 'sleep_quality', old.sleep_quality,
+        'irritability', old.irritability, 'anxiety', old.anxiety,
+        'racing_thoughts', old.racing_thoughts, 'impulsivity', old.impulsivity,
+        'concentration', old.concentration, 'social_drive', old.social_drive,
+        'appetite', old.appetite, 'note', old.note,
+        'created_at', old.created_at, 'updated_at', old.updated_at
+    ), new.updated_at);
+END
+"""
+
+# Bump whenever SCHEMA or the trigger/index set changes; stored in
+# PRAGMA user_version so ensure_db() upgrades older databases.
+SCHEMA_VERSION = 8
+
+# Per-connection prepared statement cache size (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
 
 
 def get_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
@@ -270,13 +375,149 @@ def get_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
     if db_path is None:
         db_path = get_db_path()
 
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")  # Better concurrency
+    # WAL stays consistent with NORMAL; only the last commits before a
+    # power loss can be lost, and it saves an fsync per commit
+    conn.execute("PRAGMA synchronous = NORMAL")
+    _tune_cache(conn)
+    return conn
+
+
+def _tune_cache(conn: sqlite3.Connection) -> None:
+    """Apply per-connection cache settings."""
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -64000")  # ~64 MB
+    conn.execute("PRAGMA mmap_size = 268435456")  # 256 MB
+
+
+# Long-lived per-thread connection reused by the core modules
+_local = threading.local()
+
+
+def get_read_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """Get this thread's read-only connection, opening it on first use.
+
+    Readers open the file with mode=ro so they never take the write lock
+    and, under WAL, never block (or get blocked by) the writer. Opening
+    creates or upgrades the database first, so callers need no ensure_db().
+    """
+    if db_path is None:
+        db_path = get_db_path()
+
+    conn = getattr(_local, "read_conn", None)
+    if conn is not None and _local.read_path == db_path:
+        return conn
+
+    _close_read_connection()
+    # mode=ro can neither create the file nor apply the schema
+    if not Path(db_path).exists():
+        init_db(db_path)
+    conn = sqlite3.connect(
+        f"{Path(db_path).resolve().as_uri()}?mode=ro",
+        uri=True,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    _tune_cache(conn)
+    if get_schema_version(conn) < SCHEMA_VERSION:
+        init_db(db_path)
+    _local.read_conn = conn
+    _local.read_path = db_path
     return conn
 
 
+def _close_read_connection() -> None:
+    conn = getattr(_local, "read_conn", None)
+    if conn is not None:
+        conn.close()
+    _local.read_conn = None
+    _local.read_path = None
+
+
+def get_shared_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """Get this thread's long-lived connection, opening it on first use.
+
+    Keeping one connection alive preserves SQLite's page cache and avoids
+    reopening the file on every call. A different db_path (e.g. BUJO_DIR
+    changed) replaces the cached connection. Opening creates or upgrades
+    the database, so callers need no ensure_db(). Callers must not close it.
+    """
+    if db_path is None:
+        db_path = get_db_path()
+
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path == db_path:
+        return conn
+
+    _close_write_connection()
+    conn = get_connection(db_path)
+    if get_schema_version(conn) < SCHEMA_VERSION:
+        init_db(db_path)
+    _local.conn = conn
+    _local.path = db_path
+    return conn
+
+
+def _close_write_connection() -> None:
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        # Let SQLite refresh stale planner statistics for the queries this
+        # connection ran; cheap, and usually a no-op
+        try:
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+        conn.close()
+    _local.conn = None
+    _local.path = None
+
+
+def close_shared_connection() -> None:
+    """Close this thread's shared and read-only connections, if any."""
+    _close_write_connection()
+    _close_read_connection()
+
+
+# Close (and optimize) the main thread's connections when the CLI exits
+atexit.register(close_shared_connection)
+
+
+# Serializes writers across threads so they queue here instead of
+# spinning on SQLITE_BUSY. Reentrant so a nested transaction() on a
+# second connection in the same thread doesn't deadlock.
+_write_lock = threading.RLock()
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run a block as one BEGIN IMMEDIATE ... COMMIT, rolling back on error.
+
+    The write lock is taken up front so a read-then-write sequence can't
+    fail halfway with SQLITE_BUSY. If the connection is already inside a
+    transaction the block joins it and the outer owner commits.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+
+    with _write_lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get the schema version recorded in the database (0 if never set)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
 def init_db(db_path: Optional[Path] = None) -> None:
     """Initialize the database with schema."""
     if db_path is None:
@@ -284,11 +525,16 @@ def init_db(db_path: Optional[Path] = None) -> None:
 
     conn = get_connection(db_path)
 
+    # Schema is already current; skip re-parsing every CREATE ... IF NOT EXISTS
+    if get_schema_version(conn) >= SCHEMA_VERSION:
+        conn.close()
+        return
+
     # Create main schema
     conn.executescript(SCHEMA)
 
     # Create FTS triggers (separate to avoid parsing issues)
-    for trigger_sql in FTS_TRIGGERS:
+    for trigger_sql in FTS_TRIGGERS + [UNDO_TRIGGER_CAP, MOOD_HISTORY_TRIGGER]:
         trigger_sql = trigger_sql.strip()
         if trigger_sql:
             try:
@@ -296,6 +542,13 @@ def init_db(db_path: Optional[Path] = None) -> None:
             except sqlite3.OperationalError:
                 pass  # Trigger may already exist
 
+    # Index collections that predate collections_fts
+    conn.execute("INSERT INTO collections_fts(collections_fts) VALUES('rebuild')")
+
+    # Refresh planner statistics for the (possibly new) indexes
+    conn.execute("ANALYZE")
+
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
     conn.close()
 
@@ -313,14 +566,32 @@ def db_exists(db_path: Optional[Path] = None) -> bool:
     return db_path.exists()
 
 
+# BUJO_DIR value ensure_db last succeeded for (_UNCHECKED until then)
+_UNCHECKED = object()
+_db_ready_for = _UNCHECKED
+
+
 def ensure_db() -> None:
-    """Ensure database exists and is initialized."""
-    if not db_exists():
+    """Ensure database exists and its schema is current.
+
+    Runs once per process (per BUJO_DIR value); later calls return
+    immediately. Missing or older databases are (re)initialized.
+    """
+    global _db_ready_for
+    key = os.environ.get("BUJO_DIR")
+    if _db_ready_for is not _UNCHECKED and _db_ready_for == key:
+        return
+
+    if not db_exists() or get_schema_version(get_shared_connection()) < SCHEMA_VERSION:
         init_db()
+    _db_ready_for = key
 
 
-def cleanup_undo_history(conn: sqlite3.Connection, max_entries: int = 50) -> None:
-    """Keep only the most recent undo entries."""
+def cleanup_undo_history(conn: sqlite3.Connection, max_entries: int = UNDO_HISTORY_LIMIT) -> None:
+    """Keep only the most recent undo entries.
+
+    Does not commit; runs inside the caller's transaction.
+    """
     conn.execute("""
         DELETE FROM undo_history
         WHERE id NOT IN (
@@ -329,4 +600,3 @@ def cleanup_undo_history(conn: sqlite3.Connection, max_entries: int = 50) -> Non
             LIMIT ?
         )
     """, (max_entries,))
-    conn.commit()
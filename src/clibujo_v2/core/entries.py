@@ -1,13 +1,114 @@
 """Entry CRUD operations with FTS and undo support for CLIBuJo v2."""
 
-import json
 import re
 import sqlite3
-from datetime import date, datetime
-from typing import Optional, List, Tuple
-
-from .db import get_connection, ensure_db, cleanup_undo_history
-from .models import Entry, EntryType, TaskStatus, Signifier
+from datetime import date
+from typing import Optional, List, Tuple, Dict, Any
+
+from .db import (
+    get_shared_connection,
+    get_read_connection,
+    transaction,
+    sqlite_now,
+)
+from .models import Entry
+
+
+_SQL_INSERT = """
+    INSERT INTO entries (
+        collection_id, entry_date, entry_month, entry_type,
+        status, signifier, content, sort_order
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?,
+        (
+            SELECT COALESCE(MAX(sort_order), -1) + 1
+            FROM entries
+            WHERE entry_date IS ? AND entry_month IS ? AND collection_id IS ?
+        )
+    )
+    RETURNING *
+"""
+
+_ENTRY_COLUMNS = (
+    "id", "collection_id", "entry_date", "entry_month", "entry_type", "status",
+    "signifier", "content", "sort_order", "created_at", "updated_at", "completed_at",
+)
+# Undo snapshots of an entries row, serialized by SQLite's json_object
+_ENTRY_JSON = "json_object({})".format(", ".join(f"'{c}', {c}" for c in _ENTRY_COLUMNS))
+_SQL_UNDO_OLD = f"""
+    INSERT INTO undo_history (action_type, table_name, record_id, old_data)
+    SELECT ?, 'entries', id, {_ENTRY_JSON} FROM entries WHERE id = ?
+"""
+# Status changes only apply to tasks
+_SQL_UNDO_OLD_TASK = f"""
+    INSERT INTO undo_history (action_type, table_name, record_id, old_data)
+    SELECT ?, 'entries', id, {_ENTRY_JSON} FROM entries WHERE id = ? AND entry_type = 'task'
+"""
+_SQL_UNDO_NEW = f"""
+    INSERT INTO undo_history (action_type, table_name, record_id, new_data)
+    SELECT ?, 'entries', id, {_ENTRY_JSON} FROM entries WHERE id = ?
+"""
+_SQL_UNDO_SET_NEW = f"""
+    UPDATE undo_history
+    SET new_data = (SELECT {_ENTRY_JSON} FROM entries WHERE id = ?)
+    WHERE id = ?
+"""
+
+# One statement text for every update_entry call. A NULL parameter leaves
+# its column unchanged; '' (or -1 for collection_id) clears it.
+# completed_at is stamped on completion and cleared when a status change
+# leaves 'complete' (the CASE sees the pre-update status). A status
+# change matches tasks only.
+_SQL_UPDATE = """
+    UPDATE entries
+    SET content = COALESCE(?, content),
+        status = COALESCE(?, status),
+        signifier = CASE WHEN ? IS NULL THEN signifier ELSE NULLIF(?, '') END,
+        entry_date = CASE WHEN ? IS NULL THEN entry_date ELSE NULLIF(?, '') END,
+        entry_month = CASE WHEN ? IS NULL THEN entry_month ELSE NULLIF(?, '') END,
+        collection_id = CASE WHEN ? IS NULL THEN collection_id ELSE NULLIF(?, -1) END,
+        completed_at = CASE
+            WHEN ? = 'complete' THEN ?
+            WHEN ? IS NOT NULL AND status = 'complete' THEN NULL
+            ELSE completed_at
+        END,
+        updated_at = ?
+    WHERE id = ? AND (? IS NULL OR entry_type = 'task')
+    RETURNING *
+"""
+
+# Daily/monthly views with every entry type, the common case
+_SQL_BY_DATE_ALL = """
+    SELECT * FROM entries
+    WHERE entry_date = ?
+    ORDER BY sort_order, created_at
+"""
+_SQL_BY_MONTH_ALL = """
+    SELECT * FROM entries
+    WHERE entry_month = ?
+      AND entry_date IS NULL
+    ORDER BY sort_order, created_at
+"""
+
+# Rank and LIMIT inside FTS5 (rank is bm25 by default) so only the top
+# hits are joined back to entries
+_SQL_SEARCH = """
+    SELECT e.* FROM (
+        SELECT rowid, rank FROM entries_fts
+        WHERE entries_fts MATCH ?
+        ORDER BY rank
+        LIMIT ?
+    ) AS hits
+    JOIN entries e ON e.id = hits.rowid
+    ORDER BY hits.rank
+"""
+
+# Words FTS5 accepts unquoted; anything else is quoted
+_FTS_BAREWORD = re.compile(r"\w+")
+_FTS_KEYWORDS = frozenset(("AND", "OR", "NOT", "NEAR"))
+
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}', re.ASCII)
+_MONTH_RE = re.compile(r'\d{4}-\d{2}', re.ASCII)
 
 
 def validate_content(content: str) -> str:
@@ -16,9 +117,10 @@ def validate_content(content: str) -> str:
     Raises:
         ValueError: If content is empty or whitespace-only
     """
-    if not content or not content.strip():
+    content = content.strip() if content else ""
+    if not content:
         raise ValueError("Content cannot be empty or whitespace-only")
-    return content.strip()
+    return content
 
 
 def validate_date(date_str: str) -> str:
@@ -30,14 +132,14 @@ def validate_date(date_str: str) -> str:
     if not date_str:
         raise ValueError("Date cannot be empty")
 
-    # Check format with regex
-    if not re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
+    # Check format with regex; fromisoformat alone would also accept
+    # YYYYMMDD and week dates
+    if not _DATE_RE.fullmatch(date_str):
         raise ValueError(f"Invalid date format '{date_str}'. Use YYYY-MM-DD")
 
     # Validate it's a real date
     try:
-        year, month, day = map(int, date_str.split('-'))
-        datetime(year, month, day)  # Will raise if invalid
+        date.fromisoformat(date_str)
     except ValueError:
         raise ValueError(f"Invalid date '{date_str}'. Check month and day values")
 
@@ -54,7 +156,7 @@ def validate_month(month_str: str) -> str:
         raise ValueError("Month cannot be empty")
 
     # Check format with regex
-    if not re.match(r'^\d{4}-\d{2}$', month_str):
+    if not _MONTH_RE.fullmatch(month_str):
         raise ValueError(f"Invalid month format '{month_str}'. Use YYYY-MM")
 
     # Validate month is 01-12
@@ -78,27 +180,40 @@ def escape_fts_query(query: str) -> str:
     return f'"{escaped}"'
 
 
-def _record_undo(
-    conn: sqlite3.Connection,
-    action_type: str,
-    record_id: int,
-    old_data: Optional[dict] = None,
-    new_data: Optional[dict] = None,
-) -> None:
-    """Record an action for undo capability."""
-    conn.execute(
-        """
-        INSERT INTO undo_history (action_type, table_name, record_id, old_data, new_data)
-        VALUES (?, 'entries', ?, ?, ?)
-        """,
-        (
-            action_type,
-            record_id,
-            json.dumps(old_data) if old_data else None,
-            json.dumps(new_data) if new_data else None,
-        ),
+def escape_fts_terms(query: str) -> str:
+    """Turn a search string into an FTS5 query matching all of its words.
+
+    Plain words are passed through as barewords, so FTS5 intersects the
+    term lists without a phrase/position check. Words containing
+    operator or punctuation characters, and the AND/OR/NOT/NEAR
+    keywords, are quoted individually so they are matched literally.
+    """
+    return " ".join(
+        word if _FTS_BAREWORD.fullmatch(word) and word not in _FTS_KEYWORDS
+        else escape_fts_query(word)
+        for word in query.split()
     )
-    cleanup_undo_history(conn)
+
+
+def _record_undo(
+    conn: sqlite3.Connection, action_type: str, entry_id: int, task_only: bool = False
+) -> Optional[int]:
+    """Record an action for undo capability, snapshotting the stored entry.
+
+    SQLite builds the JSON itself. A 'create' snapshot is stored as
+    new_data, anything else as old_data (taken before the change).
+    Returns the undo_history id, or None if the entry doesn't exist
+    (or, with task_only, isn't a task).
+    """
+    if action_type == "create":
+        sql = _SQL_UNDO_NEW
+    else:
+        sql = _SQL_UNDO_OLD_TASK if task_only else _SQL_UNDO_OLD
+    cursor = conn.execute(sql, (action_type, entry_id))
+    if not cursor.rowcount:
+        return None
+    # History length is capped by the undo_history_cap trigger
+    return cursor.lastrowid
 
 
 def create_entry(
@@ -136,70 +251,63 @@ def create_entry(
     if entry_month:
         entry_month = validate_month(entry_month)
 
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    try:
+    with transaction(conn):
         # Default status for tasks
         if entry_type == "task" and status is None:
             status = "open"
         elif entry_type != "task":
             status = None
 
-        # Get next sort order for the context
-        cursor = conn.execute(
-            """
-            SELECT COALESCE(MAX(sort_order), -1) + 1
-            FROM entries
-            WHERE (entry_date = ? OR (entry_date IS NULL AND ? IS NULL))
-              AND (entry_month = ? OR (entry_month IS NULL AND ? IS NULL))
-              AND (collection_id = ? OR (collection_id IS NULL AND ? IS NULL))
-            """,
-            (entry_date, entry_date, entry_month, entry_month, collection_id, collection_id),
-        )
-        sort_order = cursor.fetchone()[0]
-
+        # Appends after the last entry in the same date/month/collection
         cursor = conn.execute(
-            """
-            INSERT INTO entries (
-                collection_id, entry_date, entry_month, entry_type,
-                status, signifier, content, sort_order
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (collection_id, entry_date, entry_month, entry_type, status, signifier, content, sort_order),
+            _SQL_INSERT,
+            (
+                collection_id, entry_date, entry_month, entry_type, status, signifier, content,
+                entry_date, entry_month, collection_id,
+            ),
         )
-        entry_id = cursor.lastrowid
-
-        # Fetch the created entry
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-        entry = Entry.from_row(cursor.fetchone())
+        entry = Entry.from_tuple(cursor.fetchone())
 
         # Record for undo
-        _record_undo(conn, "create", entry_id, new_data=entry.to_dict())
+        _record_undo(conn, "create", entry.id)
 
-        conn.commit()
         return entry
-    finally:
-        if should_close:
-            conn.close()
+
+
+def create_entries(
+    entries: List[Dict[str, Any]],
+    conn: Optional[sqlite3.Connection] = None,
+) -> List[Entry]:
+    """Create several entries in a single transaction.
+
+    Args:
+        entries: One dict of create_entry keyword arguments per entry
+        conn: Optional existing connection
+
+    Returns:
+        The created entries, in order
+
+    Raises:
+        ValueError: If any entry is invalid; nothing is created then
+    """
+    if conn is None:
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        return [create_entry(conn=conn, **fields) for fields in entries]
 
 
 def get_entry(entry_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Entry]:
     """Get an entry by ID."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-        row = cursor.fetchone()
-        return Entry.from_row(row) if row else None
-    finally:
-        if should_close:
-            conn.close()
+    cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
+    row = cursor.fetchone()
+    return Entry.from_tuple(row) if row else None
 
 
 def get_entries_by_date(
@@ -210,37 +318,34 @@ def get_entries_by_date(
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Entry]:
     """Get entries for a specific date."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        types = []
-        if include_tasks:
-            types.append("task")
-        if include_events:
-            types.append("event")
-        if include_notes:
-            types.append("note")
-
-        if not types:
-            return []
-
-        placeholders = ",".join("?" * len(types))
-        cursor = conn.execute(
-            f"""
-            SELECT * FROM entries
-            WHERE entry_date = ?
-              AND entry_type IN ({placeholders})
-            ORDER BY sort_order, created_at
-            """,
-            (entry_date, *types),
-        )
-        return [Entry.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    if include_tasks and include_events and include_notes:
+        return list(map(Entry.from_tuple, conn.execute(_SQL_BY_DATE_ALL, (entry_date,))))
+
+    types = []
+    if include_tasks:
+        types.append("task")
+    if include_events:
+        types.append("event")
+    if include_notes:
+        types.append("note")
+
+    if not types:
+        return []
+
+    placeholders = ",".join("?" * len(types))
+    cursor = conn.execute(
+        f"""
+        SELECT * FROM entries
+        WHERE entry_date = ?
+          AND entry_type IN ({placeholders})
+        ORDER BY sort_order, created_at
+        """,
+        (entry_date, *types),
+    )
+    return list(map(Entry.from_tuple, cursor))
 
 
 def get_entries_by_month(
@@ -251,38 +356,35 @@ def get_entries_by_month(
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Entry]:
     """Get entries for a specific month (future log style)."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        types = []
-        if include_tasks:
-            types.append("task")
-        if include_events:
-            types.append("event")
-        if include_notes:
-            types.append("note")
-
-        if not types:
-            return []
-
-        placeholders = ",".join("?" * len(types))
-        cursor = conn.execute(
-            f"""
-            SELECT * FROM entries
-            WHERE entry_month = ?
-              AND entry_date IS NULL
-              AND entry_type IN ({placeholders})
-            ORDER BY sort_order, created_at
-            """,
-            (entry_month, *types),
-        )
-        return [Entry.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    if include_tasks and include_events and include_notes:
+        return list(map(Entry.from_tuple, conn.execute(_SQL_BY_MONTH_ALL, (entry_month,))))
+
+    types = []
+    if include_tasks:
+        types.append("task")
+    if include_events:
+        types.append("event")
+    if include_notes:
+        types.append("note")
+
+    if not types:
+        return []
+
+    placeholders = ",".join("?" * len(types))
+    cursor = conn.execute(
+        f"""
+        SELECT * FROM entries
+        WHERE entry_month = ?
+          AND entry_date IS NULL
+          AND entry_type IN ({placeholders})
+        ORDER BY sort_order, created_at
+        """,
+        (entry_month, *types),
+    )
+    return list(map(Entry.from_tuple, cursor))
 
 
 def get_entries_by_collection(
@@ -291,35 +393,29 @@ def get_entries_by_collection(
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Entry]:
     """Get entries for a specific collection."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        if include_completed:
-            cursor = conn.execute(
-                """
-                SELECT * FROM entries
-                WHERE collection_id = ?
-                ORDER BY sort_order, created_at
-                """,
-                (collection_id,),
-            )
-        else:
-            cursor = conn.execute(
-                """
-                SELECT * FROM entries
-                WHERE collection_id = ?
-                  AND (entry_type != 'task' OR status NOT IN ('complete', 'cancelled'))
-                ORDER BY sort_order, created_at
-                """,
-                (collection_id,),
-            )
-        return [Entry.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    if include_completed:
+        cursor = conn.execute(
+            """
+            SELECT * FROM entries
+            WHERE collection_id = ?
+            ORDER BY sort_order, created_at
+            """,
+            (collection_id,),
+        )
+    else:
+        cursor = conn.execute(
+            """
+            SELECT * FROM entries
+            WHERE collection_id = ?
+              AND (entry_type != 'task' OR status NOT IN ('complete', 'cancelled'))
+            ORDER BY sort_order, created_at
+            """,
+            (collection_id,),
+        )
+    return list(map(Entry.from_tuple, cursor))
 
 
 def get_open_tasks(
@@ -327,36 +423,30 @@ def get_open_tasks(
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Entry]:
     """Get all open tasks, optionally before a certain date."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        if before_date:
-            cursor = conn.execute(
-                """
-                SELECT * FROM entries
-                WHERE entry_type = 'task'
-                  AND status = 'open'
-                  AND entry_date < ?
-                ORDER BY entry_date, sort_order
-                """,
-                (before_date,),
-            )
-        else:
-            cursor = conn.execute(
-                """
-                SELECT * FROM entries
-                WHERE entry_type = 'task'
-                  AND status = 'open'
-                ORDER BY entry_date, entry_month, sort_order
-                """
-            )
-        return [Entry.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    if before_date:
+        cursor = conn.execute(
+            """
+            SELECT * FROM entries
+            WHERE entry_type = 'task'
+              AND status = 'open'
+              AND entry_date < ?
+            ORDER BY entry_date, sort_order
+            """,
+            (before_date,),
+        )
+    else:
+        cursor = conn.execute(
+            """
+            SELECT * FROM entries
+            WHERE entry_type = 'task'
+              AND status = 'open'
+            ORDER BY entry_date, entry_month, sort_order
+            """
+        )
+    return list(map(Entry.from_tuple, cursor))
 
 
 def update_entry(
@@ -372,74 +462,43 @@ def update_entry(
     """Update an entry.
 
     Only provided fields are updated. Pass empty string to clear signifier.
-    Returns updated Entry or None if not found.
+    Returns updated Entry or None if not found. Setting status only
+    applies to tasks; for other entry types nothing changes and None is
+    returned.
     """
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    try:
-        # Get current entry for undo
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-        row = cursor.fetchone()
-        if not row:
-            return None
+    with transaction(conn):
+        if (content, status, signifier, entry_date, entry_month, collection_id) == (None,) * 6:
+            cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
+            row = cursor.fetchone()
+            return Entry.from_tuple(row) if row else None
 
-        old_entry = Entry.from_row(row)
-        old_data = old_entry.to_dict()
-
-        # Build update query dynamically
-        updates = []
-        params = []
-
-        if content is not None:
-            updates.append("content = ?")
-            params.append(content)
-        if status is not None:
-            updates.append("status = ?")
-            params.append(status)
-            # Set completed_at if completing
-            if status == "complete":
-                updates.append("completed_at = datetime('now')")
-            elif old_entry.status == "complete":
-                updates.append("completed_at = NULL")
-        if signifier is not None:
-            updates.append("signifier = ?")
-            params.append(signifier if signifier else None)
-        if entry_date is not None:
-            updates.append("entry_date = ?")
-            params.append(entry_date if entry_date else None)
-        if entry_month is not None:
-            updates.append("entry_month = ?")
-            params.append(entry_month if entry_month else None)
-        if collection_id is not None:
-            updates.append("collection_id = ?")
-            params.append(collection_id if collection_id != -1 else None)
-
-        if not updates:
-            return old_entry
-
-        updates.append("updated_at = datetime('now')")
-        params.append(entry_id)
+        # Record for undo; new_data is filled in once the row has changed
+        undo_id = _record_undo(conn, "update", entry_id, task_only=status is not None)
+        if undo_id is None:
+            return None
 
-        conn.execute(
-            f"UPDATE entries SET {', '.join(updates)} WHERE id = ?",
-            params,
+        now = sqlite_now()
+        cursor = conn.execute(
+            _SQL_UPDATE,
+            (
+                content,
+                status,
+                signifier, signifier,
+                entry_date, entry_date,
+                entry_month, entry_month,
+                collection_id, collection_id,
+                status, now, status,
+                now,
+                entry_id, status,
+            ),
         )
+        new_entry = Entry.from_tuple(cursor.fetchone())
+        conn.execute(_SQL_UNDO_SET_NEW, (entry_id, undo_id))
 
-        # Fetch updated entry
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-        new_entry = Entry.from_row(cursor.fetchone())
-
-        # Record for undo
-        _record_undo(conn, "update", entry_id, old_data=old_data, new_data=new_entry.to_dict())
-
-        conn.commit()
         return new_entry
-    finally:
-        if should_close:
-            conn.close()
 
 
 def complete_entry(entry_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Entry]:
@@ -459,29 +518,16 @@ def reopen_entry(entry_id: int, conn: Optional[sqlite3.Connection] = None) -> Op
 
 def delete_entry(entry_id: int, conn: Optional[sqlite3.Connection] = None) -> bool:
     """Delete an entry. Returns True if deleted."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    try:
-        # Get entry for undo
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-        row = cursor.fetchone()
-        if not row:
-            return False
-
-        old_entry = Entry.from_row(row)
+        conn = get_shared_connection()
 
+    with transaction(conn):
         # Record for undo before deleting
-        _record_undo(conn, "delete", entry_id, old_data=old_entry.to_dict())
+        if _record_undo(conn, "delete", entry_id) is None:
+            return False
 
         conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
-        conn.commit()
         return True
-    finally:
-        if should_close:
-            conn.close()
 
 
 def search_entries(
@@ -489,36 +535,21 @@ def search_entries(
     limit: int = 50,
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Entry]:
-    """Full-text search entries.
+    """Full-text search entries containing all of the query's words.
 
     Special characters are escaped to prevent FTS5 syntax errors.
     """
     if not query or not query.strip():
         return []
 
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        # Escape special characters for FTS5
-        escaped_query = escape_fts_query(query.strip())
+    # Escape special characters for FTS5
+    escaped_query = escape_fts_terms(query)
 
-        cursor = conn.execute(
-            """
-            SELECT e.* FROM entries e
-            JOIN entries_fts fts ON e.id = fts.rowid
-            WHERE entries_fts MATCH ?
-            ORDER BY rank
-            LIMIT ?
-            """,
-            (escaped_query, limit),
-        )
-        return [Entry.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    cursor = conn.execute(_SQL_SEARCH, (escaped_query, limit))
+    return list(map(Entry.from_tuple, cursor))
 
 
 def get_entries_date_range(
@@ -527,24 +558,18 @@ def get_entries_date_range(
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Entry]:
     """Get all entries within a date range."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        cursor = conn.execute(
-            """
-            SELECT * FROM entries
-            WHERE entry_date BETWEEN ? AND ?
-            ORDER BY entry_date, sort_order
-            """,
-            (start_date, end_date),
-        )
-        return [Entry.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    cursor = conn.execute(
+        """
+        SELECT * FROM entries
+        WHERE entry_date BETWEEN ? AND ?
+        ORDER BY entry_date, sort_order
+        """,
+        (start_date, end_date),
+    )
+    return list(map(Entry.from_tuple, cursor))
 
 
 def reorder_entry(
@@ -553,19 +578,17 @@ def reorder_entry(
     conn: Optional[sqlite3.Connection] = None,
 ) -> bool:
     """Reorder an entry within its context (date/month/collection)."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    try:
+    with transaction(conn):
         # Get entry
         cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
         row = cursor.fetchone()
         if not row:
             return False
 
-        entry = Entry.from_row(row)
+        entry = Entry.from_tuple(row)
         old_position = entry.sort_order
 
         if old_position == new_position:
@@ -616,32 +639,22 @@ def reorder_entry(
             (new_position, entry_id),
         )
 
-        conn.commit()
         return True
-    finally:
-        if should_close:
-            conn.close()
 
 
 def get_entry_count_by_status(
     conn: Optional[sqlite3.Connection] = None,
 ) -> dict:
     """Get count of entries by status."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        cursor = conn.execute(
-            """
-            SELECT status, COUNT(*) as count
-            FROM entries
-            WHERE entry_type = 'task'
-            GROUP BY status
-            """
-        )
-        return {row["status"]: row["count"] for row in cursor.fetchall()}
-    finally:
-        if should_close:
-            conn.close()
+    cursor = conn.execute(
+        """
+        SELECT status, COUNT(*) as count
+        FROM entries
+        WHERE entry_type = 'task'
+        GROUP BY status
+        """
+    )
+    return dict(cursor.fetchall())
@@ -1,13 +1,174 @@
 """Habit tracking operations for CLIBuJo v2."""
 
-import json
 import sqlite3
 from datetime import date, datetime, timedelta
-from typing import Optional, List, Dict, Tuple, Union
+from typing import Any, Optional, Iterator, List, Dict, Sequence, Tuple, Union
 from calendar import monthrange
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from .db import (
+    get_shared_connection,
+    get_read_connection,
+    transaction,
+)
+from .models import Habit, HabitCompletion, dump_json
+
+
+_SQL_GET_HABIT = "SELECT * FROM habits WHERE id = ?"
+_SQL_GET_HABIT_BY_NAME = "SELECT * FROM habits WHERE name = ? COLLATE NOCASE"
+_SQL_INSERT_HABIT = """
+    INSERT INTO habits (name, frequency_type, frequency_target, frequency_days, category)
+    VALUES (?, ?, ?, ?, ?)
+"""
+# NULL leaves a field unchanged; an empty category clears it
+_SQL_UPDATE_HABIT = """
+    UPDATE habits
+    SET name = COALESCE(?, name),
+        frequency_type = COALESCE(?, frequency_type),
+        frequency_target = COALESCE(?, frequency_target),
+        frequency_days = CASE WHEN ? IS NULL THEN frequency_days ELSE ? END,
+        category = CASE WHEN ? IS NULL THEN category ELSE NULLIF(?, '') END,
+        status = COALESCE(?, status),
+        updated_at = datetime('now')
+    WHERE id = ?
+    RETURNING *
+"""
+_SQL_DELETE_HABIT = "DELETE FROM habits WHERE id = ?"
+_SQL_ALL = "SELECT * FROM habits ORDER BY category, name"
+_SQL_ALL_WITH_STATUS = "SELECT * FROM habits WHERE status = ? ORDER BY category, name"
+_SQL_ALL_IN_CATEGORY = "SELECT * FROM habits WHERE category = ? ORDER BY category, name"
+_SQL_ALL_WITH_STATUS_IN_CATEGORY = (
+    "SELECT * FROM habits WHERE status = ? AND category = ? ORDER BY category, name"
+)
+# Weekly/monthly habits with targets are always due (user decides when)
+_SQL_DUE_ON_DAY = """
+    SELECT * FROM habits
+    WHERE status = 'active'
+      AND (frequency_type IN ('daily', 'weekly', 'monthly')
+           OR (frequency_type = 'specific_days'
+               AND ',' || frequency_days || ',' LIKE ?))
+    ORDER BY category, name
+"""
+_SQL_INSERT_COMPLETION = """
+    INSERT INTO habit_completions (habit_id, completion_date, note)
+    VALUES (?, ?, ?)
+"""
+_SQL_GET_COMPLETION = "SELECT * FROM habit_completions WHERE id = ?"
+_SQL_GET_COMPLETION_ON_DATE = """
+    SELECT * FROM habit_completions
+    WHERE habit_id = ? AND completion_date = ?
+"""
+_SQL_DELETE_COMPLETION = "DELETE FROM habit_completions WHERE habit_id = ? AND completion_date = ?"
+_SQL_IS_COMPLETED = """
+    SELECT 1 FROM habit_completions
+    WHERE habit_id = ? AND completion_date = ?
+"""
+_SQL_COMPLETIONS_IN_RANGE = """
+    SELECT * FROM habit_completions
+    WHERE habit_id = ?
+      AND completion_date BETWEEN ? AND ?
+    ORDER BY completion_date
+"""
+_SQL_COUNT_COMPLETIONS_IN_RANGE = """
+    SELECT COUNT(*) FROM habit_completions
+    WHERE habit_id = ?
+      AND completion_date BETWEEN ? AND ?
+"""
+# Completions per week/month counted back from the target's period
+_SQL_WEEKLY_COUNTS_UNTIL = """
+    SELECT CAST((julianday(?) - julianday(completion_date)) / 7 AS INTEGER) AS age,
+           COUNT(*)
+    FROM habit_completions
+    WHERE habit_id = ? AND completion_date <= ?
+    GROUP BY age
+    ORDER BY age
+"""
+_SQL_MONTHLY_COUNTS_UNTIL = """
+    SELECT ? - (CAST(substr(completion_date, 1, 4) AS INTEGER) * 12
+                + CAST(substr(completion_date, 6, 2) AS INTEGER)) AS age,
+           COUNT(*)
+    FROM habit_completions
+    WHERE habit_id = ? AND completion_date <= ?
+    GROUP BY age
+    ORDER BY age
+"""
+_SQL_COMPLETION_DAYS_IN_RANGE = """
+    SELECT CAST(substr(completion_date, 9, 2) AS INTEGER) FROM habit_completions
+    WHERE habit_id = ?
+      AND completion_date BETWEEN ? AND ?
+"""
+_SQL_COMPLETION_DATES_FOR_HABITS = """
+    SELECT habit_id, completion_date FROM habit_completions
+    WHERE habit_id IN (SELECT value FROM json_each(?))
+      AND completion_date BETWEEN ? AND ?
+"""
+# Days between each completion and the target date, newest first
+_SQL_COMPLETION_AGES_UNTIL = """
+    SELECT CAST(julianday(?) - julianday(completion_date) AS INTEGER)
+    FROM habit_completions
+    WHERE habit_id = ? AND completion_date <= ?
+    ORDER BY completion_date DESC
+"""
+_SQL_CATEGORIES = """
+    SELECT DISTINCT category FROM habits
+    WHERE category IS NOT NULL
+    ORDER BY category
+"""
+_SQL_RECORD_UNDO = """
+    INSERT INTO undo_history (action_type, table_name, record_id, old_data, new_data)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_UNDO_CREATE_COMPLETION = """
+    INSERT INTO undo_history (action_type, table_name, record_id, new_data)
+    VALUES ('create', 'habit_completions', ?, ?)
+"""
+_SQL_UNDO_CREATE_COMPLETION_ON_DATE = """
+    INSERT INTO undo_history (action_type, table_name, record_id, new_data)
+    SELECT 'create', 'habit_completions', id, ?
+    FROM habit_completions
+    WHERE habit_id = ? AND completion_date = ?
+"""
+_SQL_UNDO_DELETE_COMPLETION = """
+    INSERT INTO undo_history (action_type, table_name, record_id, old_data)
+    VALUES ('delete', 'habit_completions', ?, ?)
+"""
+
+
+# Pinned by the CLI so every default in one command agrees on "today"
+_today_cv: ContextVar[Optional[date]] = ContextVar("habits_today", default=None)
+
+
+def _today() -> date:
+    """Get the pinned date, or the real current date if none is pinned."""
+    return _today_cv.get() or date.today()
+
+
+@contextmanager
+def pinned_today(today: Optional[date] = None) -> Iterator[date]:
+    """Use one date as the default "today" for habit functions in this block."""
+    token = _today_cv.set(today or date.today())
+    try:
+        yield _today_cv.get()
+    finally:
+        _today_cv.reset(token)
+
+
+def _execute_tuples(
+    conn: sqlite3.Connection,
+    sql: str,
+    params: Sequence[Any] = (),
+) -> sqlite3.Cursor:
+    """Execute a read whose rows are only used positionally.
 
-from .db import get_connection, ensure_db, cleanup_undo_history
-from .models import Habit, HabitCompletion, HabitStatus, FrequencyType
+    The cursor returns plain tuples instead of the connection's
+    sqlite3.Row objects; the connection's row_factory is left alone.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params)
 
 
 def validate_habit_name(name: str) -> str:
@@ -29,21 +190,20 @@ def _record_undo(
     old_data: Optional[dict] = None,
     new_data: Optional[dict] = None,
 ) -> None:
-    """Record an action for undo capability."""
+    """Record an action for undo capability.
+
+    History is capped by the undo_history_cap trigger.
+    """
     conn.execute(
-        """
-        INSERT INTO undo_history (action_type, table_name, record_id, old_data, new_data)
-        VALUES (?, ?, ?, ?, ?)
-        """,
+        _SQL_RECORD_UNDO,
         (
             action_type,
             table_name,
             record_id,
-            json.dumps(old_data) if old_data else None,
-            json.dumps(new_data) if new_data else None,
+            dump_json(old_data) if old_data else None,
+            dump_json(new_data) if new_data else None,
         ),
     )
-    cleanup_undo_history(conn)
 
 
 # Day name mappings
@@ -51,6 +211,52 @@ DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
 DAY_FULL_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
 
 
+_FIXED_FREQUENCIES = {
+    "daily": ("daily", 1, None),
+    "weekly": ("weekly", 1, None),
+    "monthly": ("monthly", 1, None),
+}
+
+_VALID_DAYS = frozenset(DAY_NAMES)
+
+
+def _parse_weekly(value: str) -> Tuple[str, int, Optional[str]]:
+    target = int(value)
+    if target < 1 or target > 7:
+        raise ValueError(f"Weekly target must be 1-7, got {target}")
+    return ("weekly", target, None)
+
+
+def _parse_monthly(value: str) -> Tuple[str, int, Optional[str]]:
+    target = int(value)
+    if target < 1 or target > 31:
+        raise ValueError(f"Monthly target must be 1-31, got {target}")
+    return ("monthly", target, None)
+
+
+def _parse_days(value: str) -> Tuple[str, int, Optional[str]]:
+    if not value.strip():
+        raise ValueError("Days list cannot be empty")
+    # Validate each day is a valid abbreviation
+    days = []
+    for d in value.split(","):
+        day = d.strip()[:3].lower()
+        if day not in _VALID_DAYS:
+            raise ValueError(f"Invalid day '{d}'. Use: mon, tue, wed, thu, fri, sat, sun")
+        days.append(day)
+    if not days:
+        raise ValueError("Days list cannot be empty")
+    return ("specific_days", len(days), ",".join(days))
+
+
+_PARAMETERIZED_FREQUENCIES = {
+    "weekly": _parse_weekly,
+    "monthly": _parse_monthly,
+    "days": _parse_days,
+}
+
+
+@lru_cache(maxsize=256)
 def parse_frequency(freq_str: str) -> Tuple[str, int, Optional[str]]:
     """Parse frequency string into (type, target, days).
 
@@ -61,44 +267,23 @@ def parse_frequency(freq_str: str) -> Tuple[str, int, Optional[str]]:
         'monthly:2' -> ('monthly', 2, None)
         'days:mon,wed,fri' -> ('specific_days', 3, 'mon,wed,fri')
 
+    Results are cached; the set of frequency strings in use is small.
+
     Raises:
         ValueError: If frequency format is invalid or values are impossible
     """
     freq_str = freq_str.lower().strip()
 
-    if freq_str == "daily":
-        return ("daily", 1, None)
-    elif freq_str == "weekly":
-        return ("weekly", 1, None)
-    elif freq_str.startswith("weekly:"):
-        target = int(freq_str.split(":")[1])
-        if target < 1 or target > 7:
-            raise ValueError(f"Weekly target must be 1-7, got {target}")
-        return ("weekly", target, None)
-    elif freq_str == "monthly":
-        return ("monthly", 1, None)
-    elif freq_str.startswith("monthly:"):
-        target = int(freq_str.split(":")[1])
-        if target < 1 or target > 31:
-            raise ValueError(f"Monthly target must be 1-31, got {target}")
-        return ("monthly", target, None)
-    elif freq_str.startswith("days:"):
-        days_part = freq_str.split(":")[1]
-        if not days_part.strip():
-            raise ValueError("Days list cannot be empty")
-        # Validate each day is a valid abbreviation
-        valid_days = {"mon", "tue", "wed", "thu", "fri", "sat", "sun"}
-        days = []
-        for d in days_part.split(","):
-            day = d.strip()[:3].lower()
-            if day not in valid_days:
-                raise ValueError(f"Invalid day '{d}'. Use: mon, tue, wed, thu, fri, sat, sun")
-            days.append(day)
-        if not days:
-            raise ValueError("Days list cannot be empty")
-        return ("specific_days", len(days), ",".join(days))
-    else:
+    fixed = _FIXED_FREQUENCIES.get(freq_str)
+    if fixed is not None:
+        return fixed
+
+    prefix, sep, rest = freq_str.partition(":")
+    parser = _PARAMETERIZED_FREQUENCIES.get(prefix) if sep else None
+    if parser is None:
         raise ValueError(f"Invalid frequency format: {freq_str}")
+    # Anything after a second colon has always been ignored
+    return parser(rest.split(":")[0])
 
 
 def create_habit(
@@ -124,69 +309,44 @@ def create_habit(
     name = validate_habit_name(name)
     freq_type, freq_target, freq_days = parse_frequency(frequency)
 
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    try:
+        conn = get_shared_connection()
 
+    with transaction(conn):
         cursor = conn.execute(
-            """
-            INSERT INTO habits (name, frequency_type, frequency_target, frequency_days, category)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+            _SQL_INSERT_HABIT,
             (name, freq_type, freq_target, freq_days, category),
         )
         habit_id = cursor.lastrowid
 
         # Fetch created habit
-        cursor = conn.execute("SELECT * FROM habits WHERE id = ?", (habit_id,))
-        habit = Habit.from_row(cursor.fetchone())
+        cursor = conn.execute(_SQL_GET_HABIT, (habit_id,))
+        habit = Habit.from_tuple(cursor.fetchone())
 
         # Record for undo
         _record_undo(conn, "create", "habits", habit_id, new_data=habit.to_dict())
 
-        conn.commit()
         return habit
-    finally:
-        if should_close:
-            conn.close()
 
 
 def get_habit(habit_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Habit]:
     """Get a habit by ID."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        cursor = conn.execute("SELECT * FROM habits WHERE id = ?", (habit_id,))
-        row = cursor.fetchone()
-        return Habit.from_row(row) if row else None
-    finally:
-        if should_close:
-            conn.close()
+    cursor = conn.execute(_SQL_GET_HABIT, (habit_id,))
+    row = cursor.fetchone()
+    return Habit.from_tuple(row) if row else None
 
 
 def get_habit_by_name(name: str, conn: Optional[sqlite3.Connection] = None) -> Optional[Habit]:
     """Get a habit by name (case-insensitive)."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        cursor = conn.execute(
-            "SELECT * FROM habits WHERE name = ? COLLATE NOCASE",
-            (name,),
-        )
-        row = cursor.fetchone()
-        return Habit.from_row(row) if row else None
-    finally:
-        if should_close:
-            conn.close()
+    cursor = conn.execute(_SQL_GET_HABIT_BY_NAME, (name,))
+    row = cursor.fetchone()
+    return Habit.from_tuple(row) if row else None
 
 
 def get_all_habits(
@@ -195,36 +355,18 @@ def get_all_habits(
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Habit]:
     """Get all habits with optional filters."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    try:
-        conditions = []
-        params = []
-
-        if status:
-            conditions.append("status = ?")
-            params.append(status)
-        if category:
-            conditions.append("category = ?")
-            params.append(category)
-
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-        cursor = conn.execute(
-            f"""
-            SELECT * FROM habits
-            WHERE {where_clause}
-            ORDER BY category, name
-            """,
-            params,
-        )
-        return [Habit.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+        conn = get_read_connection()
+
+    if status and category:
+        cursor = _execute_tuples(conn, _SQL_ALL_WITH_STATUS_IN_CATEGORY, (status, category))
+    elif status:
+        cursor = _execute_tuples(conn, _SQL_ALL_WITH_STATUS, (status,))
+    elif category:
+        cursor = _execute_tuples(conn, _SQL_ALL_IN_CATEGORY, (category,))
+    else:
+        cursor = _execute_tuples(conn, _SQL_ALL)
+    return list(map(Habit.from_tuple, cursor))
 
 
 def get_active_habits(conn: Optional[sqlite3.Connection] = None) -> List[Habit]:
@@ -241,62 +383,43 @@ def update_habit(
     conn: Optional[sqlite3.Connection] = None,
 ) -> Optional[Habit]:
     """Update a habit."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    try:
+    freq_type = freq_target = freq_days = None
+    if frequency is not None:
+        freq_type, freq_target, freq_days = parse_frequency(frequency)
+
+    with transaction(conn):
         # Get current habit for undo
-        cursor = conn.execute("SELECT * FROM habits WHERE id = ?", (habit_id,))
+        cursor = conn.execute(_SQL_GET_HABIT, (habit_id,))
         row = cursor.fetchone()
         if not row:
             return None
 
-        old_habit = Habit.from_row(row)
+        old_habit = Habit.from_tuple(row)
+        if (name, frequency, category, status) == (None,) * 4:
+            return old_habit
         old_data = old_habit.to_dict()
 
-        # Build update query
-        updates = ["updated_at = datetime('now')"]
-        params = []
-
-        if name is not None:
-            updates.append("name = ?")
-            params.append(name)
-        if frequency is not None:
-            freq_type, freq_target, freq_days = parse_frequency(frequency)
-            updates.append("frequency_type = ?")
-            params.append(freq_type)
-            updates.append("frequency_target = ?")
-            params.append(freq_target)
-            updates.append("frequency_days = ?")
-            params.append(freq_days)
-        if category is not None:
-            updates.append("category = ?")
-            params.append(category if category else None)
-        if status is not None:
-            updates.append("status = ?")
-            params.append(status)
-
-        params.append(habit_id)
-
-        conn.execute(
-            f"UPDATE habits SET {', '.join(updates)} WHERE id = ?",
-            params,
+        cursor = conn.execute(
+            _SQL_UPDATE_HABIT,
+            (
+                name,
+                freq_type,
+                freq_target,
+                freq_type, freq_days,
+                category, category,
+                status,
+                habit_id,
+            ),
         )
-
-        # Fetch updated habit
-        cursor = conn.execute("SELECT * FROM habits WHERE id = ?", (habit_id,))
-        new_habit = Habit.from_row(cursor.fetchone())
+        new_habit = Habit.from_tuple(cursor.fetchone())
 
         # Record for undo
         _record_undo(conn, "update", "habits", habit_id, old_data=old_data, new_data=new_habit.to_dict())
 
-        conn.commit()
         return new_habit
-    finally:
-        if should_close:
-            conn.close()
 
 
 def pause_habit(habit_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Habit]:
@@ -321,30 +444,24 @@ def complete_habit_permanently(habit_id: int, conn: Optional[sqlite3.Connection]
 
 def delete_habit(habit_id: int, conn: Optional[sqlite3.Connection] = None) -> bool:
     """Delete a habit and all its completions."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    try:
+    with transaction(conn):
         # Get habit for undo
-        cursor = conn.execute("SELECT * FROM habits WHERE id = ?", (habit_id,))
+        cursor = conn.execute(_SQL_GET_HABIT, (habit_id,))
         row = cursor.fetchone()
         if not row:
             return False
 
-        old_habit = Habit.from_row(row)
+        old_habit = Habit.from_tuple(row)
 
         # Record for undo
         _record_undo(conn, "delete", "habits", habit_id, old_data=old_habit.to_dict())
 
         # Cascade delete will handle completions
-        conn.execute("DELETE FROM habits WHERE id = ?", (habit_id,))
-        conn.commit()
+        conn.execute(_SQL_DELETE_HABIT, (habit_id,))
         return True
-    finally:
-        if should_close:
-            conn.close()
 
 
 def record_completion(
@@ -363,41 +480,61 @@ def record_completion(
     Returns:
         The created HabitCompletion
     """
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
     if completion_date is None:
-        completion_date = date.today().isoformat()
+        completion_date = _today().isoformat()
 
-    try:
-        cursor = conn.execute(
-            """
-            INSERT INTO habit_completions (habit_id, completion_date, note)
-            VALUES (?, ?, ?)
-            """,
-            (habit_id, completion_date, note),
-        )
+    with transaction(conn):
+        cursor = conn.execute(_SQL_INSERT_COMPLETION, (habit_id, completion_date, note))
         completion_id = cursor.lastrowid
 
-        cursor = conn.execute("SELECT * FROM habit_completions WHERE id = ?", (completion_id,))
-        completion = HabitCompletion.from_row(cursor.fetchone())
+        cursor = conn.execute(_SQL_GET_COMPLETION, (completion_id,))
+        completion = HabitCompletion.from_tuple(cursor.fetchone())
 
         # Record for undo
         conn.execute(
-            """
-            INSERT INTO undo_history (action_type, table_name, record_id, new_data)
-            VALUES ('create', 'habit_completions', ?, ?)
-            """,
-            (completion_id, json.dumps({"habit_id": habit_id, "completion_date": completion_date, "note": note})),
+            _SQL_UNDO_CREATE_COMPLETION,
+            (completion_id, dump_json({"habit_id": habit_id, "completion_date": completion_date, "note": note})),
         )
 
-        conn.commit()
         return completion
-    finally:
-        if should_close:
-            conn.close()
+
+
+def record_completions_bulk(
+    completions: List[Tuple[int, str, Optional[str]]],
+    conn: Optional[sqlite3.Connection] = None,
+) -> int:
+    """Record many habit completions in a single transaction.
+
+    Args:
+        completions: (habit_id, completion_date, note) tuples
+        conn: Optional existing connection
+
+    Returns:
+        Number of completions recorded
+
+    Raises:
+        sqlite3.IntegrityError: If any completion already exists; nothing
+            is recorded then
+    """
+    if conn is None:
+        conn = get_shared_connection()
+
+    undo_rows = [
+        (
+            dump_json({"habit_id": habit_id, "completion_date": completion_date, "note": note}),
+            habit_id,
+            completion_date,
+        )
+        for habit_id, completion_date, note in completions
+    ]
+
+    with transaction(conn):
+        conn.executemany(_SQL_INSERT_COMPLETION, completions)
+        conn.executemany(_SQL_UNDO_CREATE_COMPLETION_ON_DATE, undo_rows)
+    return len(undo_rows)
 
 
 def remove_completion(
@@ -406,49 +543,31 @@ def remove_completion(
     conn: Optional[sqlite3.Connection] = None,
 ) -> bool:
     """Remove a habit completion for a date."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
     if completion_date is None:
-        completion_date = date.today().isoformat()
+        completion_date = _today().isoformat()
 
-    try:
-        cursor = conn.execute(
-            """
-            SELECT * FROM habit_completions
-            WHERE habit_id = ? AND completion_date = ?
-            """,
-            (habit_id, completion_date),
-        )
+    with transaction(conn):
+        cursor = conn.execute(_SQL_GET_COMPLETION_ON_DATE, (habit_id, completion_date))
         row = cursor.fetchone()
         if not row:
             return False
 
-        completion = HabitCompletion.from_row(row)
+        completion = HabitCompletion.from_tuple(row)
 
         # Record for undo
         conn.execute(
-            """
-            INSERT INTO undo_history (action_type, table_name, record_id, old_data)
-            VALUES ('delete', 'habit_completions', ?, ?)
-            """,
+            _SQL_UNDO_DELETE_COMPLETION,
             (
                 completion.id,
-                json.dumps({"habit_id": habit_id, "completion_date": completion_date, "note": completion.note}),
+                dump_json({"habit_id": habit_id, "completion_date": completion_date, "note": completion.note}),
             ),
         )
 
-        conn.execute(
-            "DELETE FROM habit_completions WHERE habit_id = ? AND completion_date = ?",
-            (habit_id, completion_date),
-        )
-        conn.commit()
+        conn.execute(_SQL_DELETE_COMPLETION, (habit_id, completion_date))
         return True
-    finally:
-        if should_close:
-            conn.close()
 
 
 def is_completed_on_date(
@@ -457,26 +576,14 @@ def is_completed_on_date(
     conn: Optional[sqlite3.Connection] = None,
 ) -> bool:
     """Check if habit was completed on a date."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     if check_date is None:
-        check_date = date.today().isoformat()
+        check_date = _today().isoformat()
 
-    try:
-        cursor = conn.execute(
-            """
-            SELECT 1 FROM habit_completions
-            WHERE habit_id = ? AND completion_date = ?
-            """,
-            (habit_id, check_date),
-        )
-        return cursor.fetchone() is not None
-    finally:
-        if should_close:
-            conn.close()
+    cursor = _execute_tuples(conn, _SQL_IS_COMPLETED, (habit_id, check_date))
+    return cursor.fetchone() is not None
 
 
 def get_completions_in_range(
@@ -486,54 +593,76 @@ def get_completions_in_range(
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[HabitCompletion]:
     """Get all completions for a habit in a date range."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        cursor = conn.execute(
-            """
-            SELECT * FROM habit_completions
-            WHERE habit_id = ?
-              AND completion_date BETWEEN ? AND ?
-            ORDER BY completion_date
-            """,
-            (habit_id, start_date, end_date),
-        )
-        return [HabitCompletion.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    cursor = _execute_tuples(conn, _SQL_COMPLETIONS_IN_RANGE, (habit_id, start_date, end_date))
+    return list(map(HabitCompletion.from_tuple, cursor))
 
 
-def is_habit_due_on_date(habit: Habit, check_date: date) -> bool:
-    """Check if a habit is due on a specific date."""
-    if habit.status != "active":
-        return False
+def _count_completions_in_range(
+    conn: sqlite3.Connection,
+    habit_id: int,
+    start_date: str,
+    end_date: str,
+) -> int:
+    """Count a habit's completions in a date range without loading them."""
+    cursor = _execute_tuples(conn, _SQL_COUNT_COMPLETIONS_IN_RANGE, (habit_id, start_date, end_date))
+    return cursor.fetchone()[0]
 
-    if habit.frequency_type == "daily":
-        return True
-    elif habit.frequency_type == "specific_days":
-        day_name = DAY_NAMES[check_date.weekday()]
-        return day_name in habit.frequency_days_list
-    elif habit.frequency_type in ("weekly", "monthly"):
-        # For weekly/monthly with targets, always due (user decides when)
-        return True
 
+def _always_due(habit: Habit, check_date: date, day_name: Optional[str]) -> bool:
+    return True
+
+
+def _never_due(habit: Habit, check_date: date, day_name: Optional[str]) -> bool:
     return False
 
 
+def _due_on_specific_days(habit: Habit, check_date: date, day_name: Optional[str]) -> bool:
+    if day_name is None:
+        day_name = DAY_NAMES[check_date.weekday()]
+    return day_name in habit.frequency_days_list
+
+
+# Keyed by (status, frequency_type); anything else is never due.
+# Weekly/monthly habits with targets are always due (user decides when).
+_DUE_HANDLERS = {
+    ("active", "daily"): _always_due,
+    ("active", "weekly"): _always_due,
+    ("active", "monthly"): _always_due,
+    ("active", "specific_days"): _due_on_specific_days,
+}
+
+
+def is_habit_due_on_date(
+    habit: Habit,
+    check_date: date,
+    day_name: Optional[str] = None,
+) -> bool:
+    """Check if a habit is due on a specific date.
+
+    Callers checking many habits for one date can pass the date's
+    ``day_name`` (e.g. 'mon') to skip recomputing it per habit.
+    """
+    handler = _DUE_HANDLERS.get((habit.status, habit.frequency_type), _never_due)
+    return handler(habit, check_date, day_name)
+
+
 def get_habits_due_on_date(
     check_date: Optional[date] = None,
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Habit]:
     """Get all habits due on a specific date."""
     if check_date is None:
-        check_date = date.today()
+        check_date = _today()
 
-    habits = get_active_habits(conn=conn)
-    return [h for h in habits if is_habit_due_on_date(h, check_date)]
+    if conn is None:
+        conn = get_read_connection()
+
+    day_name = DAY_NAMES[check_date.weekday()]
+    cursor = _execute_tuples(conn, _SQL_DUE_ON_DAY, (f"%,{day_name},%",))
+    return list(map(Habit.from_tuple, cursor))
 
 
 def get_week_range(target_date: date) -> Tuple[date, date]:
@@ -550,6 +679,42 @@ def get_month_range(target_date: date) -> Tuple[date, date]:
     return first_day, last_day
 
 
+def _progress_period(habit: Habit, target_date: date) -> Tuple[str, int, date, date]:
+    """Get (period, target, start, end) of the habit's current period."""
+    if habit.frequency_type == "daily":
+        # Check today only
+        return "day", 1, target_date, target_date
+    elif habit.frequency_type in ("specific_days", "weekly"):
+        # Specific days are tracked across the week
+        start, end = get_week_range(target_date)
+        return "week", habit.frequency_target, start, end
+    elif habit.frequency_type == "monthly":
+        start, end = get_month_range(target_date)
+        return "month", habit.frequency_target, start, end
+    return "unknown", 1, target_date, target_date
+
+
+def _progress_dict(
+    completed: int,
+    target: int,
+    streak: int,
+    period: str,
+    start: date,
+    end: date,
+) -> Dict:
+    """Build the progress dict returned by get_habit_progress()."""
+    percentage = min(100, int((completed / target) * 100)) if target > 0 else 0
+    return {
+        "completed": completed,
+        "target": target,
+        "percentage": percentage,
+        "streak": streak,
+        "period": period,
+        "period_start": start.isoformat(),
+        "period_end": end.isoformat(),
+    }
+
+
 def get_habit_progress(
     habit: Habit,
     target_date: Optional[date] = None,
@@ -565,64 +730,96 @@ def get_habit_progress(
         - period: 'day', 'week', or 'month'
     """
     if target_date is None:
-        target_date = date.today()
+        target_date = _today()
 
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
+
+    period, target, start, end = _progress_period(habit, target_date)
+    if period == "unknown":
+        completed = 0
+    else:
+        completed = _count_completions_in_range(conn, habit.id, start.isoformat(), end.isoformat())
+
+    streak = calculate_streak(habit, target_date, conn)
+    return _progress_dict(completed, target, streak, period, start, end)
 
-    try:
-        if habit.frequency_type == "daily":
-            # Check today only
-            completed = 1 if is_completed_on_date(habit.id, target_date.isoformat(), conn) else 0
-            target = 1
-            period = "day"
-            start = target_date
-            end = target_date
-        elif habit.frequency_type == "specific_days":
-            # Check this week for specific days
-            start, end = get_week_range(target_date)
-            completions = get_completions_in_range(habit.id, start.isoformat(), end.isoformat(), conn)
-            completed = len(completions)
-            target = habit.frequency_target
-            period = "week"
-        elif habit.frequency_type == "weekly":
-            start, end = get_week_range(target_date)
-            completions = get_completions_in_range(habit.id, start.isoformat(), end.isoformat(), conn)
-            completed = len(completions)
-            target = habit.frequency_target
-            period = "week"
-        elif habit.frequency_type == "monthly":
-            start, end = get_month_range(target_date)
-            completions = get_completions_in_range(habit.id, start.isoformat(), end.isoformat(), conn)
-            completed = len(completions)
-            target = habit.frequency_target
-            period = "month"
-        else:
-            completed = 0
-            target = 1
-            period = "unknown"
-            start = target_date
-            end = target_date
 
-        percentage = min(100, int((completed / target) * 100)) if target > 0 else 0
+def get_all_progress(
+    habits: List[Habit],
+    target_date: Optional[date] = None,
+    conn: Optional[sqlite3.Connection] = None,
+) -> Dict[int, Dict]:
+    """Get progress for several habits at once.
+
+    Completions for every habit's current period are fetched in one
+    query and counted in Python; streaks are still computed per habit.
 
-        # Calculate streak
+    Returns dict mapping habit id to a get_habit_progress() dict.
+    """
+    if target_date is None:
+        target_date = _today()
+
+    if conn is None:
+        conn = get_read_connection()
+
+    week_start, week_end = get_week_range(target_date)
+    month_start, month_end = get_month_range(target_date)
+    cursor = _execute_tuples(
+        conn,
+        _SQL_COMPLETION_DATES_FOR_HABITS,
+        (
+            dump_json([h.id for h in habits]),
+            min(week_start, month_start).isoformat(),
+            max(week_end, month_end).isoformat(),
+        ),
+    )
+    dates_by_habit = defaultdict(list)
+    for habit_id, completion_date in cursor:
+        dates_by_habit[habit_id].append(completion_date)
+
+    progress = {}
+    for habit in habits:
+        period, target, start, end = _progress_period(habit, target_date)
+        if period == "unknown":
+            completed = 0
+        else:
+            first, last = start.isoformat(), end.isoformat()
+            completed = sum(first <= d <= last for d in dates_by_habit[habit.id])
         streak = calculate_streak(habit, target_date, conn)
+        progress[habit.id] = _progress_dict(completed, target, streak, period, start, end)
+    return progress
 
-        return {
-            "completed": completed,
-            "target": target,
-            "percentage": percentage,
-            "streak": streak,
-            "period": period,
-            "period_start": start.isoformat(),
-            "period_end": end.isoformat(),
-        }
-    finally:
-        if should_close:
-            conn.close()
+
+def _streak_daily(conn: sqlite3.Connection, habit_id: int, target_date: date) -> int:
+    """Count consecutive completed days ending at target_date.
+
+    Walks the completions newest-first in one query and stops at the
+    first gap. SQLite returns each completion's age in days, so the n-th
+    row continues the streak exactly when its age is n.
+    """
+    target = target_date.isoformat()
+    cursor = _execute_tuples(conn, _SQL_COMPLETION_AGES_UNTIL, (target, habit_id, target))
+    streak = 0
+    for (age,) in cursor:
+        if age != streak:
+            break
+        streak += 1
+    return streak
+
+
+def _streak_periods(cursor: sqlite3.Cursor, target: int) -> int:
+    """Count consecutive periods meeting target from (age, count) rows.
+
+    Rows come oldest-last with age 0 for the current period; the streak
+    ends at the first skipped period or the first one under target.
+    """
+    streak = 0
+    for age, completed in cursor:
+        if age != streak or completed < target:
+            break
+        streak += 1
+    return streak
 
 
 def calculate_streak(
@@ -632,54 +829,30 @@ def calculate_streak(
 ) -> int:
     """Calculate current streak for a habit."""
     if target_date is None:
-        target_date = date.today()
+        target_date = _today()
 
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        streak = 0
-        current_date = target_date
-
-        if habit.frequency_type == "daily":
-            # Check consecutive days
-            while True:
-                if is_completed_on_date(habit.id, current_date.isoformat(), conn):
-                    streak += 1
-                    current_date -= timedelta(days=1)
-                else:
-                    break
-        elif habit.frequency_type == "weekly" or habit.frequency_type == "specific_days":
-            # Check consecutive weeks meeting target
-            while True:
-                week_start, week_end = get_week_range(current_date)
-                completions = get_completions_in_range(
-                    habit.id, week_start.isoformat(), week_end.isoformat(), conn
-                )
-                if len(completions) >= habit.frequency_target:
-                    streak += 1
-                    current_date = week_start - timedelta(days=1)
-                else:
-                    break
-        elif habit.frequency_type == "monthly":
-            # Check consecutive months meeting target
-            while True:
-                month_start, month_end = get_month_range(current_date)
-                completions = get_completions_in_range(
-                    habit.id, month_start.isoformat(), month_end.isoformat(), conn
-                )
-                if len(completions) >= habit.frequency_target:
-                    streak += 1
-                    current_date = month_start - timedelta(days=1)
-                else:
-                    break
-
-        return streak
-    finally:
-        if should_close:
-            conn.close()
+    if habit.frequency_type == "daily":
+        return _streak_daily(conn, habit.id, target_date)
+    elif habit.frequency_type == "weekly" or habit.frequency_type == "specific_days":
+        # Check consecutive weeks meeting target
+        week_end = get_week_range(target_date)[1].isoformat()
+        cursor = _execute_tuples(
+            conn, _SQL_WEEKLY_COUNTS_UNTIL, (week_end, habit.id, week_end)
+        )
+        return _streak_periods(cursor, habit.frequency_target)
+    elif habit.frequency_type == "monthly":
+        # Check consecutive months meeting target
+        month_index = target_date.year * 12 + target_date.month
+        month_end = get_month_range(target_date)[1].isoformat()
+        cursor = _execute_tuples(
+            conn, _SQL_MONTHLY_COUNTS_UNTIL, (month_index, habit.id, month_end)
+        )
+        return _streak_periods(cursor, habit.frequency_target)
+
+    return 0
 
 
 def get_habit_calendar(
@@ -692,41 +865,23 @@ def get_habit_calendar(
 
     Returns dict mapping day number to completion status.
     """
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        start_date = f"{year:04d}-{month:02d}-01"
-        days_in_month = monthrange(year, month)[1]
-        end_date = f"{year:04d}-{month:02d}-{days_in_month:02d}"
+    start_date = f"{year:04d}-{month:02d}-01"
+    days_in_month = monthrange(year, month)[1]
+    end_date = f"{year:04d}-{month:02d}-{days_in_month:02d}"
 
-        completions = get_completions_in_range(habit_id, start_date, end_date, conn)
-        completed_days = {int(c.completion_date.split("-")[2]) for c in completions}
+    cursor = _execute_tuples(conn, _SQL_COMPLETION_DAYS_IN_RANGE, (habit_id, start_date, end_date))
+    completed_days = {day for (day,) in cursor}
 
-        return {day: day in completed_days for day in range(1, days_in_month + 1)}
-    finally:
-        if should_close:
-            conn.close()
+    return {day: day in completed_days for day in range(1, days_in_month + 1)}
 
 
 def get_categories(conn: Optional[sqlite3.Connection] = None) -> List[str]:
     """Get all unique habit categories."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
-    try:
-        cursor = conn.execute(
-            """
-            SELECT DISTINCT category FROM habits
-            WHERE category IS NOT NULL
-            ORDER BY category
-            """
-        )
-        return [row["category"] for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    cursor = _execute_tuples(conn, _SQL_CATEGORIES)
+    return [category for (category,) in cursor]
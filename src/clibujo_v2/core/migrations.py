@@ -6,37 +6,195 @@ Migrations in bullet journaling move open tasks between:
 - Collections (collection_id)
 """
 
-import json
 import sqlite3
 from datetime import date
-from typing import Optional, List
-
-from .db import get_connection, ensure_db, cleanup_undo_history
-from .models import Entry, Migration
+from typing import Optional, List, Union
+
+from .db import (
+    get_shared_connection,
+    get_read_connection,
+    transaction,
+)
+from .models import Entry, Migration, dump_json
 from .entries import get_entry, update_entry
 
 
-def _record_undo(
+_SQL_MARK_MIGRATED = """
+    UPDATE entries
+    SET status = 'migrated', updated_at = datetime('now')
+    WHERE id = ? AND entry_type = 'task' AND status = 'open'
+    RETURNING *
+"""
+_SQL_INSERT_MIGRATION_TO_DATE = """
+    INSERT INTO migrations (
+        entry_id, from_date, from_month, from_collection_id,
+        to_date, to_month, to_collection_id
+    ) VALUES (?, ?, ?, ?, ?, NULL, NULL)
+"""
+# New entries go after the last one in their exact destination, which
+# is a single seek on idx_entries_context_sort
+_SQL_INSERT_ON_DATE = """
+    INSERT INTO entries (
+        entry_date, entry_type, status, signifier, content, sort_order
+    ) VALUES (?1, 'task', 'open', ?2, ?3, (
+        SELECT COALESCE(MAX(sort_order), -1) + 1 FROM entries
+        WHERE collection_id IS NULL AND entry_date = ?1 AND entry_month IS NULL
+    ))
+    RETURNING *
+"""
+_SQL_MARK_SCHEDULED = """
+    UPDATE entries
+    SET status = 'scheduled', updated_at = datetime('now')
+    WHERE id = ? AND entry_type = 'task' AND status = 'open'
+    RETURNING *
+"""
+_SQL_INSERT_MIGRATION_TO_MONTH = """
+    INSERT INTO migrations (
+        entry_id, from_date, from_month, from_collection_id,
+        to_date, to_month, to_collection_id
+    ) VALUES (?, ?, ?, ?, NULL, ?, NULL)
+"""
+_SQL_INSERT_IN_MONTH = """
+    INSERT INTO entries (
+        entry_month, entry_type, status, signifier, content, sort_order
+    ) VALUES (?1, 'task', 'open', ?2, ?3, (
+        SELECT COALESCE(MAX(sort_order), -1) + 1 FROM entries
+        WHERE collection_id IS NULL AND entry_date IS NULL AND entry_month = ?1
+    ))
+    RETURNING *
+"""
+_SQL_INSERT_MIGRATION_TO_COLLECTION = """
+    INSERT INTO migrations (
+        entry_id, from_date, from_month, from_collection_id,
+        to_date, to_month, to_collection_id
+    ) VALUES (?, ?, ?, ?, NULL, NULL, ?)
+"""
+_SQL_INSERT_IN_COLLECTION = """
+    INSERT INTO entries (
+        collection_id, entry_type, status, signifier, content, sort_order
+    ) VALUES (?1, 'task', 'open', ?2, ?3, (
+        SELECT COALESCE(MAX(sort_order), -1) + 1 FROM entries
+        WHERE collection_id = ?1 AND entry_date IS NULL AND entry_month IS NULL
+    ))
+    RETURNING *
+"""
+_SQL_HISTORY = """
+    SELECT * FROM migrations
+    WHERE entry_id = ?
+    ORDER BY migrated_at DESC
+    LIMIT ?
+"""
+_SQL_NEEDING_MIGRATION = """
+    SELECT * FROM entries
+    WHERE entry_type = 'task'
+      AND status = 'open'
+      AND (
+          (entry_date IS NOT NULL AND entry_date < ?)
+          OR (entry_month IS NOT NULL AND entry_month < ? AND entry_date IS NULL)
+      )
+    ORDER BY entry_date, entry_month, sort_order
+"""
+# Bulk migration to one date: ids travel as a JSON array so each step is
+# a single set-based statement, and json_each's key keeps the input order
+_SQL_BULK_MARK_MIGRATED = """
+    UPDATE entries
+    SET status = 'migrated', updated_at = datetime('now')
+    WHERE id IN (SELECT value FROM json_each(?))
+      AND entry_type = 'task' AND status = 'open'
+    RETURNING id
+"""
+_SQL_BULK_INSERT_MIGRATIONS_TO_DATE = """
+    INSERT INTO migrations (
+        entry_id, from_date, from_month, from_collection_id,
+        to_date, to_month, to_collection_id
+    )
+    SELECT e.id, e.entry_date, e.entry_month, e.collection_id, ?1, NULL, NULL
+    FROM json_each(?2) AS j JOIN entries AS e ON e.id = j.value
+    ORDER BY j.key
+"""
+_SQL_BULK_INSERT_ON_DATE = """
+    INSERT INTO entries (
+        entry_date, entry_type, status, signifier, content, sort_order
+    )
+    SELECT ?1, 'task', 'open', e.signifier, e.content,
+        (
+            SELECT COALESCE(MAX(sort_order), -1) FROM entries
+            WHERE collection_id IS NULL AND entry_date = ?1 AND entry_month IS NULL
+        ) + ROW_NUMBER() OVER (ORDER BY j.key)
+    FROM json_each(?2) AS j JOIN entries AS e ON e.id = j.value
+    ORDER BY j.key
+    RETURNING *
+"""
+# Totals per destination in one pass; each record counts once, by the
+# first of to_date / to_month / to_collection_id that is set
+_SQL_STATS = """
+    SELECT
+        COUNT(*),
+        COALESCE(SUM(to_date IS NOT NULL), 0),
+        COALESCE(SUM(to_date IS NULL AND to_month IS NOT NULL), 0),
+        COALESCE(SUM(
+            to_date IS NULL AND to_month IS NULL AND to_collection_id IS NOT NULL
+        ), 0)
+    FROM migrations
+"""
+
+
+# Per destination: how the source is marked, how history is recorded,
+# and where the new entry is inserted
+_DESTINATIONS = {
+    "date": (_SQL_MARK_MIGRATED, _SQL_INSERT_MIGRATION_TO_DATE, _SQL_INSERT_ON_DATE),
+    "month": (_SQL_MARK_SCHEDULED, _SQL_INSERT_MIGRATION_TO_MONTH, _SQL_INSERT_IN_MONTH),
+    "collection": (
+        _SQL_MARK_MIGRATED,
+        _SQL_INSERT_MIGRATION_TO_COLLECTION,
+        _SQL_INSERT_IN_COLLECTION,
+    ),
+}
+
+
+def _migrate(
     conn: sqlite3.Connection,
-    action_type: str,
-    record_id: int,
-    old_data: Optional[dict] = None,
-    new_data: Optional[dict] = None,
-) -> None:
-    """Record an action for undo capability."""
+    entry_id: int,
+    destination: str,
+    target: Union[str, int],
+) -> Optional[Entry]:
+    """Move an open task to a destination without committing.
+
+    The source is claimed with a guarded UPDATE, so a missing, closed or
+    non-task entry updates nothing and None is returned.
+    """
+    mark_sql, record_sql, insert_sql = _DESTINATIONS[destination]
+
+    cursor = conn.execute(mark_sql, (entry_id,))
+    row = cursor.fetchone()
+    if not row:
+        return None
+
+    entry = Entry.from_tuple(row)
+
+    # Record migration history
     conn.execute(
-        """
-        INSERT INTO undo_history (action_type, table_name, record_id, old_data, new_data)
-        VALUES (?, 'migrations', ?, ?, ?)
-        """,
-        (
-            action_type,
-            record_id,
-            json.dumps(old_data) if old_data else None,
-            json.dumps(new_data) if new_data else None,
-        ),
+        record_sql,
+        (entry_id, entry.entry_date, entry.entry_month, entry.collection_id, target),
     )
-    cleanup_undo_history(conn)
+
+    # Create the new entry at the destination
+    cursor = conn.execute(insert_sql, (target, entry.signifier, entry.content))
+    return Entry.from_tuple(cursor.fetchone())
+
+
+def _migrate_in_transaction(
+    entry_id: int,
+    destination: str,
+    target: Union[str, int],
+    conn: Optional[sqlite3.Connection],
+) -> Optional[Entry]:
+    """Run _migrate() in its own transaction on the given or shared connection."""
+    if conn is None:
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        return _migrate(conn, entry_id, destination, target)
 
 
 def migrate_to_date(
@@ -53,85 +211,7 @@ def migrate_to_date(
     Returns:
         Updated Entry or None if not found/not a task
     """
-    ensure_db()
-    should_close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    try:
-        # Get current entry
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-        row = cursor.fetchone()
-        if not row:
-            return None
-
-        entry = Entry.from_row(row)
-
-        # Only migrate open tasks
-        if entry.entry_type != "task" or entry.status != "open":
-            return None
-
-        # Record migration history
-        cursor = conn.execute(
-            """
-            INSERT INTO migrations (
-                entry_id, from_date, from_month, from_collection_id,
-                to_date, to_month, to_collection_id
-            ) VALUES (?, ?, ?, ?, ?, NULL, NULL)
-            """,
-            (entry_id, entry.entry_date, entry.entry_month, entry.collection_id, target_date),
-        )
-        migration_id = cursor.lastrowid
-
-        # Update entry - mark as migrated at source, create new or update
-        # In bujo, migration typically marks old as migrated and references new location
-        conn.execute(
-            """
-            UPDATE entries
-            SET status = 'migrated', updated_at = datetime('now')
-            WHERE id = ?
-            """,
-            (entry_id,),
-        )
-
-        # Create new entry at target date
-        cursor = conn.execute(
-            """
-            SELECT COALESCE(MAX(sort_order), -1) + 1 FROM entries
-            WHERE entry_date = ?
-            """,
-            (target_date,),
-        )
-        sort_order = cursor.fetchone()[0]
-
-        cursor = conn.execute(
-            """
-            INSERT INTO entries (
-                entry_date, entry_type, status, signifier, content, sort_order
-            ) VALUES (?, 'task', 'open', ?, ?, ?)
-            """,
-            (target_date, entry.signifier, entry.content, sort_order),
-        )
-        new_entry_id = cursor.lastrowid
-
-        # Update migration record with new entry reference
-        conn.execute(
-            """
-            UPDATE migrations SET to_collection_id = NULL
-            WHERE id = ?
-            """,
-            (migration_id,),
-        )
-
-        # Fetch the new entry
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (new_entry_id,))
-        new_entry = Entry.from_row(cursor.fetchone())
-
-        conn.commit()
-        return new_entry
-    finally:
-        if should_close:
-            conn.close()
+    return _migrate_in_transaction(entry_id, "date", target_date, conn)
 
 
 def migrate_to_month(
@@ -141,6 +221,8 @@ def migrate_to_month(
 ) -> Optional[Entry]:
     """Migrate a task to a monthly log (future log style).
 
+    The old entry is marked scheduled (< in bujo) rather than migrated.
+
     Args:
         entry_id: Task to migrate
         target_month: Target month (YYYY-MM)
@@ -148,72 +230,7 @@ def migrate_to_month(
     Returns:
         Updated Entry or None if not found/not a task
     """
-    ensure_db()
-    should_close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    try:
-        # Get current entry
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-        row = cursor.fetchone()
-        if not row:
-            return None
-
-        entry = Entry.from_row(row)
-
-        if entry.entry_type != "task" or entry.status != "open":
-            return None
-
-        # Record migration history
-        cursor = conn.execute(
-            """
-            INSERT INTO migrations (
-                entry_id, from_date, from_month, from_collection_id,
-                to_date, to_month, to_collection_id
-            ) VALUES (?, ?, ?, ?, NULL, ?, NULL)
-            """,
-            (entry_id, entry.entry_date, entry.entry_month, entry.collection_id, target_month),
-        )
-
-        # Mark old as scheduled (< symbol in bujo means scheduled for future)
-        conn.execute(
-            """
-            UPDATE entries
-            SET status = 'scheduled', updated_at = datetime('now')
-            WHERE id = ?
-            """,
-            (entry_id,),
-        )
-
-        # Create new entry in monthly log
-        cursor = conn.execute(
-            """
-            SELECT COALESCE(MAX(sort_order), -1) + 1 FROM entries
-            WHERE entry_month = ? AND entry_date IS NULL
-            """,
-            (target_month,),
-        )
-        sort_order = cursor.fetchone()[0]
-
-        cursor = conn.execute(
-            """
-            INSERT INTO entries (
-                entry_month, entry_type, status, signifier, content, sort_order
-            ) VALUES (?, 'task', 'open', ?, ?, ?)
-            """,
-            (target_month, entry.signifier, entry.content, sort_order),
-        )
-        new_entry_id = cursor.lastrowid
-
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (new_entry_id,))
-        new_entry = Entry.from_row(cursor.fetchone())
-
-        conn.commit()
-        return new_entry
-    finally:
-        if should_close:
-            conn.close()
+    return _migrate_in_transaction(entry_id, "month", target_month, conn)
 
 
 def migrate_to_collection(
@@ -230,72 +247,7 @@ def migrate_to_collection(
     Returns:
         Updated Entry or None if not found/not a task
     """
-    ensure_db()
-    should_close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    try:
-        # Get current entry
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-        row = cursor.fetchone()
-        if not row:
-            return None
-
-        entry = Entry.from_row(row)
-
-        if entry.entry_type != "task" or entry.status != "open":
-            return None
-
-        # Record migration history
-        cursor = conn.execute(
-            """
-            INSERT INTO migrations (
-                entry_id, from_date, from_month, from_collection_id,
-                to_date, to_month, to_collection_id
-            ) VALUES (?, ?, ?, ?, NULL, NULL, ?)
-            """,
-            (entry_id, entry.entry_date, entry.entry_month, entry.collection_id, collection_id),
-        )
-
-        # Mark old as migrated
-        conn.execute(
-            """
-            UPDATE entries
-            SET status = 'migrated', updated_at = datetime('now')
-            WHERE id = ?
-            """,
-            (entry_id,),
-        )
-
-        # Create new entry in collection
-        cursor = conn.execute(
-            """
-            SELECT COALESCE(MAX(sort_order), -1) + 1 FROM entries
-            WHERE collection_id = ?
-            """,
-            (collection_id,),
-        )
-        sort_order = cursor.fetchone()[0]
-
-        cursor = conn.execute(
-            """
-            INSERT INTO entries (
-                collection_id, entry_type, status, signifier, content, sort_order
-            ) VALUES (?, 'task', 'open', ?, ?, ?)
-            """,
-            (collection_id, entry.signifier, entry.content, sort_order),
-        )
-        new_entry_id = cursor.lastrowid
-
-        cursor = conn.execute("SELECT * FROM entries WHERE id = ?", (new_entry_id,))
-        new_entry = Entry.from_row(cursor.fetchone())
-
-        conn.commit()
-        return new_entry
-    finally:
-        if should_close:
-            conn.close()
+    return _migrate_in_transaction(entry_id, "collection", collection_id, conn)
 
 
 def migrate_forward(
@@ -312,27 +264,21 @@ def migrate_forward(
 
 def get_migration_history(
     entry_id: int,
+    limit: Optional[int] = None,
     conn: Optional[sqlite3.Connection] = None,
 ) -> List[Migration]:
-    """Get migration history for an entry."""
-    ensure_db()
-    should_close = conn is None
+    """Get migration history for an entry, most recent first.
+
+    Args:
+        entry_id: Entry whose history to read
+        limit: Return at most this many records (all if None)
+    """
     if conn is None:
-        conn = get_connection()
-
-    try:
-        cursor = conn.execute(
-            """
-            SELECT * FROM migrations
-            WHERE entry_id = ?
-            ORDER BY migrated_at DESC
-            """,
-            (entry_id,),
-        )
-        return [Migration.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+        conn = get_read_connection()
+
+    # A negative LIMIT means no limit to SQLite, so one statement serves both
+    cursor = conn.execute(_SQL_HISTORY, (entry_id, -1 if limit is None else limit))
+    return list(map(Migration.from_tuple, cursor))
 
 
 def get_tasks_needing_migration(
@@ -346,10 +292,8 @@ def get_tasks_needing_migration(
     - Either have a date before the specified date
     - Or are in a monthly log for a past month
     """
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     if before_date is None:
         before_date = date.today().isoformat()
@@ -357,24 +301,8 @@ def get_tasks_needing_migration(
     # Get current month for monthly log comparison
     current_month = before_date[:7]
 
-    try:
-        cursor = conn.execute(
-            """
-            SELECT * FROM entries
-            WHERE entry_type = 'task'
-              AND status = 'open'
-              AND (
-                  (entry_date IS NOT NULL AND entry_date < ?)
-                  OR (entry_month IS NOT NULL AND entry_month < ? AND entry_date IS NULL)
-              )
-            ORDER BY entry_date, entry_month, sort_order
-            """,
-            (before_date, current_month),
-        )
-        return [Entry.from_row(row) for row in cursor.fetchall()]
-    finally:
-        if should_close:
-            conn.close()
+    cursor = conn.execute(_SQL_NEEDING_MIGRATION, (before_date, current_month))
+    return list(map(Entry.from_tuple, cursor))
 
 
 def bulk_migrate_to_today(
@@ -385,63 +313,39 @@ def bulk_migrate_to_today(
 
     Returns list of newly created entries.
     """
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
+
+    today = date.today().isoformat()
 
-    try:
-        new_entries = []
-        today = date.today().isoformat()
+    # One transaction for the whole batch rather than a commit per task
+    with transaction(conn):
+        cursor = conn.execute(_SQL_BULK_MARK_MIGRATED, (dump_json(entry_ids),))
+        claimed = {row[0] for row in cursor}
+        if not claimed:
+            return []
 
-        for entry_id in entry_ids:
-            new_entry = migrate_to_date(entry_id, today, conn)
-            if new_entry:
-                new_entries.append(new_entry)
+        # Keep the caller's order (first occurrence) for the new sort_order
+        ids = dump_json([i for i in dict.fromkeys(entry_ids) if i in claimed])
+        conn.execute(_SQL_BULK_INSERT_MIGRATIONS_TO_DATE, (today, ids))
+        cursor = conn.execute(_SQL_BULK_INSERT_ON_DATE, (today, ids))
+        new_entries = list(map(Entry.from_tuple, cursor))
 
-        return new_entries
-    finally:
-        if should_close:
-            conn.close()
+    new_entries.sort(key=lambda e: e.sort_order)
+    return new_entries
 
 
 def get_migration_stats(
     conn: Optional[sqlite3.Connection] = None,
 ) -> dict:
     """Get migration statistics."""
-    ensure_db()
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    try:
-        # Total migrations
-        cursor = conn.execute("SELECT COUNT(*) FROM migrations")
-        total = cursor.fetchone()[0]
-
-        # Migrations by destination type
-        cursor = conn.execute(
-            """
-            SELECT
-                CASE
-                    WHEN to_date IS NOT NULL THEN 'to_date'
-                    WHEN to_month IS NOT NULL THEN 'to_month'
-                    WHEN to_collection_id IS NOT NULL THEN 'to_collection'
-                    ELSE 'unknown'
-                END as dest_type,
-                COUNT(*) as count
-            FROM migrations
-            GROUP BY dest_type
-            """
-        )
-        by_type = {row["dest_type"]: row["count"] for row in cursor.fetchall()}
-
-        return {
-            "total": total,
-            "to_date": by_type.get("to_date", 0),
-            "to_month": by_type.get("to_month", 0),
-            "to_collection": by_type.get("to_collection", 0),
-        }
-    finally:
-        if should_close:
-            conn.close()
+        conn = get_read_connection()
+
+    total, to_date, to_month, to_collection = conn.execute(_SQL_STATS).fetchone()
+    return {
+        "total": total,
+        "to_date": to_date,
+        "to_month": to_month,
+        "to_collection": to_collection,
+    }
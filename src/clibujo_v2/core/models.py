@@ -2,20 +2,47 @@
 
 import json
 import sqlite3
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from enum import Enum
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, FrozenSet, Sequence
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class EntryType(Enum):
+
+if orjson is not None:
+    def dump_json(obj: Any) -> str:
+        """Serialize to a JSON string (orjson)."""
+        return orjson.dumps(obj).decode()
+
+    load_json = orjson.loads
+else:
+    def dump_json(obj: Any) -> str:
+        """Serialize to a JSON string (stdlib fallback)."""
+        return json.dumps(obj)
+
+    load_json = json.loads
+
+
+def _field_dict(obj: Any) -> Dict[str, Any]:
+    """Shallow field dict of a slotted model; every field is a scalar."""
+    return {name: getattr(obj, name) for name in obj.__slots__}
+
+
+# Value namespaces: the attributes are the plain strings stored in the
+# database, so they compare directly with model fields
+class EntryType:
     """Type of bullet journal entry."""
     TASK = "task"
     EVENT = "event"
     NOTE = "note"
 
 
-class TaskStatus(Enum):
+class TaskStatus:
     """Status of a task entry."""
     OPEN = "open"
     COMPLETE = "complete"
@@ -24,7 +51,7 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
-class Signifier(Enum):
+class Signifier:
     """Entry signifiers (priority markers)."""
     PRIORITY = "priority"
     INSPIRATION = "inspiration"
@@ -33,14 +60,14 @@ class Signifier(Enum):
     DELEGATED = "delegated"
 
 
-class CollectionType(Enum):
+class CollectionType:
     """Type of collection."""
     PROJECT = "project"
     TRACKER = "tracker"
     LIST = "list"
 
 
-class HabitStatus(Enum):
+class HabitStatus:
     """Habit lifecycle status."""
     ACTIVE = "active"
     PAUSED = "paused"
@@ -48,7 +75,7 @@ class HabitStatus(Enum):
     COMPLETED = "completed"
 
 
-class FrequencyType(Enum):
+class FrequencyType:
     """Types of habit frequencies."""
     DAILY = "daily"
     WEEKLY = "weekly"
@@ -56,7 +83,7 @@ class FrequencyType(Enum):
     SPECIFIC_DAYS = "specific_days"
 
 
-@dataclass
+@dataclass(slots=True)
 class Entry:
     """A bullet journal entry."""
     id: Optional[int] = None
@@ -77,21 +104,29 @@ class Entry:
         """Create Entry from database row."""
         return cls(**dict(row))
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> "Entry":
+        """Create Entry from a full row in table column order.
+
+        Unpacks positionally, skipping per-column name lookups.
+        """
+        return cls(*row)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return asdict(self)
+        return _field_dict(self)
 
     def to_json(self) -> str:
         """Convert to JSON string."""
-        return json.dumps(self.to_dict())
+        return dump_json(self.to_dict())
 
     @classmethod
     def from_json(cls, json_str: str) -> "Entry":
         """Create from JSON string."""
-        return cls(**json.loads(json_str))
+        return cls(**load_json(json_str))
 
 
-@dataclass
+@dataclass(slots=True)
 class Collection:
     """A collection (project, tracker, or list)."""
     id: Optional[int] = None
@@ -106,9 +141,18 @@ class Collection:
         """Create Collection from database row."""
         return cls(**dict(row))
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> "Collection":
+        """Create Collection from a full row in table column order.
+
+        Unpacks positionally, skipping per-column name lookups.
+        """
+        id, name, type, description, created_at, archived_at = row
+        return cls(id, name, type, description, created_at, archived_at)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return asdict(self)
+        return _field_dict(self)
 
     @property
     def is_archived(self) -> bool:
@@ -116,7 +160,7 @@ class Collection:
         return self.archived_at is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class Migration:
     """Record of a task migration."""
     id: Optional[int] = None
@@ -134,8 +178,22 @@ class Migration:
         """Create Migration from database row."""
         return cls(**dict(row))
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> "Migration":
+        """Create Migration from a full row in table column order.
+
+        Unpacks positionally, skipping per-column name lookups.
+        """
+        return cls(*row)
+
+
+@lru_cache(maxsize=128)
+def _day_set(frequency_days: str) -> FrozenSet[str]:
+    """Parse a comma-separated day list into a set, cached per string."""
+    return frozenset(d.strip().lower() for d in frequency_days.split(","))
+
 
-@dataclass
+@dataclass(slots=True)
 class Habit:
     """A habit to track."""
     id: Optional[int] = None
@@ -153,25 +211,33 @@ class Habit:
         """Create Habit from database row."""
         return cls(**dict(row))
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> "Habit":
+        """Create Habit from a full row in table column order.
+
+        Unpacks positionally, skipping per-column name lookups.
+        """
+        return cls(*row)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return asdict(self)
+        return _field_dict(self)
 
     def to_json(self) -> str:
         """Convert to JSON string."""
-        return json.dumps(self.to_dict())
+        return dump_json(self.to_dict())
 
     @classmethod
     def from_json(cls, json_str: str) -> "Habit":
         """Create from JSON string."""
-        return cls(**json.loads(json_str))
+        return cls(**load_json(json_str))
 
     @property
-    def frequency_days_list(self) -> List[str]:
-        """Get frequency days as list."""
+    def frequency_days_list(self) -> FrozenSet[str]:
+        """Get frequency days as a set, parsed once per distinct day list."""
         if self.frequency_days:
-            return [d.strip().lower() for d in self.frequency_days.split(",")]
-        return []
+            return _day_set(self.frequency_days)
+        return frozenset()
 
     def get_frequency_display(self) -> str:
         """Get human-readable frequency."""
@@ -190,7 +256,7 @@ class Habit:
         return self.frequency_type
 
 
-@dataclass
+@dataclass(slots=True)
 class HabitCompletion:
     """A habit completion record."""
     id: Optional[int] = None
@@ -204,8 +270,16 @@ class HabitCompletion:
         """Create HabitCompletion from database row."""
         return cls(**dict(row))
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> "HabitCompletion":
+        """Create HabitCompletion from a full row in table column order.
+
+        Unpacks positionally, skipping per-column name lookups.
+        """
+        return cls(*row)
+
 
-@dataclass
+@dataclass(slots=True)
 class UndoAction:
     """An undoable action record."""
     id: Optional[int] = None
@@ -231,7 +305,8 @@ SIGNIFIER_SYMBOLS = {
     "delegated": "#",
 }
 
-SIGNIFIER_FROM_SYMBOL = {v: k for k, v in SIGNIFIER_SYMBOLS.items()}
+# Reverse lookups are built once at import and exposed read-only
+SIGNIFIER_FROM_SYMBOL = MappingProxyType({v: k for k, v in SIGNIFIER_SYMBOLS.items()})
 
 # Task status symbols for display
 STATUS_SYMBOLS = {
@@ -242,7 +317,7 @@ STATUS_SYMBOLS = {
     "cancelled": "[~]",
 }
 
-STATUS_FROM_SYMBOL = {v: k for k, v in STATUS_SYMBOLS.items()}
+STATUS_FROM_SYMBOL = MappingProxyType({v: k for k, v in STATUS_SYMBOLS.items()})
 
 # Entry type symbols
 ENTRY_TYPE_SYMBOLS = {
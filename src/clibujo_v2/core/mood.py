@@ -1,12 +1,12 @@
 """Mood tracking models and database operations for CLIBuJo v2."""
 
-import json
 import sqlite3
 from dataclasses import dataclass, asdict
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence
 
-from .db import get_connection
+from .db import get_shared_connection, get_read_connection, transaction
+from .models import load_json
 
 
 def validate_medication_name(name: str) -> str:
@@ -44,6 +44,16 @@ class MoodEntry:
     def from_row(cls, row: sqlite3.Row) -> "MoodEntry":
         return cls(**dict(row))
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> "MoodEntry":
+        """Create from a full row in table column order."""
+        (id, date, mood, energy, sleep_hours, sleep_quality, irritability,
+         anxiety, racing_thoughts, impulsivity, concentration, social_drive,
+         appetite, note, created_at, updated_at) = row
+        return cls(date, mood, energy, sleep_hours, sleep_quality, irritability,
+                   anxiety, racing_thoughts, impulsivity, concentration,
+                   social_drive, appetite, note, id, created_at, updated_at)
+
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
@@ -63,6 +73,12 @@ class WatchData:
     def from_row(cls, row: sqlite3.Row) -> "WatchData":
         return cls(**dict(row))
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> "WatchData":
+        """Create from a full row in table column order."""
+        id, date, steps, resting_hr, hrv, created_at, updated_at = row
+        return cls(date, steps, resting_hr, hrv, id, created_at, updated_at)
+
 
 @dataclass
 class Medication:
@@ -115,6 +131,12 @@ class Episode:
     def from_row(cls, row: sqlite3.Row) -> "Episode":
         return cls(**dict(row))
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> "Episode":
+        """Create from a full row in table column order."""
+        id, start_date, end_date, type, severity, note, created_at = row
+        return cls(start_date, type, end_date, severity, note, id, created_at)
+
 
 @dataclass
 class MoodTrigger:
@@ -145,165 +167,170 @@ class Baseline:
     def from_row(cls, row: sqlite3.Row) -> "Baseline":
         return cls(**dict(row))
 
+    @classmethod
+    def from_tuple(cls, row: Sequence[Any]) -> "Baseline":
+        """Create from a full row in table column order."""
+        return cls(*row)
+
 
 # Mood Entry operations
 
 def get_mood_entry(date_str: str, conn: Optional[sqlite3.Connection] = None) -> Optional[MoodEntry]:
     """Get mood entry for a specific date."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     row = conn.execute(
         "SELECT * FROM mood_entries WHERE date = ?", (date_str,)
     ).fetchone()
 
-    if should_close:
-        conn.close()
-    return MoodEntry.from_row(row) if row else None
+    return MoodEntry.from_tuple(row) if row else None
+
+
+# Insert, or merge non-NULL fields into the existing row for the date
+_MOOD_UPSERT_SQL = """
+    INSERT INTO mood_entries
+        (date, mood, energy, sleep_hours, sleep_quality, irritability,
+         anxiety, racing_thoughts, impulsivity, concentration,
+         social_drive, appetite, note, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(date) DO UPDATE SET
+        mood = COALESCE(excluded.mood, mood),
+        energy = COALESCE(excluded.energy, energy),
+        sleep_hours = COALESCE(excluded.sleep_hours, sleep_hours),
+        sleep_quality = COALESCE(excluded.sleep_quality, sleep_quality),
+        irritability = COALESCE(excluded.irritability, irritability),
+        anxiety = COALESCE(excluded.anxiety, anxiety),
+        racing_thoughts = COALESCE(excluded.racing_thoughts, racing_thoughts),
+        impulsivity = COALESCE(excluded.impulsivity, impulsivity),
+        concentration = COALESCE(excluded.concentration, concentration),
+        social_drive = COALESCE(excluded.social_drive, social_drive),
+        appetite = COALESCE(excluded.appetite, appetite),
+        note = COALESCE(excluded.note, note),
+        updated_at = excluded.updated_at
+    RETURNING id
+"""
+# Drops the snapshot the history trigger just took for an entry
+_MOOD_DROP_LATEST_HISTORY_SQL = """
+    DELETE FROM mood_entry_history
+    WHERE id = (SELECT MAX(id) FROM mood_entry_history WHERE entry_id = ?)
+"""
 
 
 def save_mood_entry(entry: MoodEntry, save_history: bool = True,
                     conn: Optional[sqlite3.Connection] = None) -> MoodEntry:
-    """Save or update a mood entry. Returns the saved entry with id."""
-    should_close = conn is None
+    """Save or update a mood entry. Returns the saved entry with id.
+
+    Fields left as None keep their stored values when the date exists.
+    Updating an existing entry snapshots it for undo (via the
+    mood_entry_history_snapshot trigger) unless save_history is False.
+    """
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
     now = datetime.now().isoformat()
 
-    existing = conn.execute(
-        "SELECT * FROM mood_entries WHERE date = ?", (entry.date,)
-    ).fetchone()
-
-    if existing:
-        # Save history for undo
-        if save_history:
-            history_data = json.dumps(dict(existing))
-            conn.execute(
-                """INSERT OR REPLACE INTO mood_entry_history (entry_id, previous_data, changed_at)
-                   VALUES (?, ?, ?)""",
-                (existing["id"], history_data, now)
-            )
-
-        # Update existing - use COALESCE to merge with existing values
-        conn.execute(
-            """UPDATE mood_entries SET
-               mood = COALESCE(?, mood),
-               energy = COALESCE(?, energy),
-               sleep_hours = COALESCE(?, sleep_hours),
-               sleep_quality = COALESCE(?, sleep_quality),
-               irritability = COALESCE(?, irritability),
-               anxiety = COALESCE(?, anxiety),
-               racing_thoughts = COALESCE(?, racing_thoughts),
-               impulsivity = COALESCE(?, impulsivity),
-               concentration = COALESCE(?, concentration),
-               social_drive = COALESCE(?, social_drive),
-               appetite = COALESCE(?, appetite),
-               note = COALESCE(?, note),
-               updated_at = ?
-               WHERE date = ?""",
-            (entry.mood, entry.energy, entry.sleep_hours, entry.sleep_quality,
-             entry.irritability, entry.anxiety, entry.racing_thoughts,
-             entry.impulsivity, entry.concentration, entry.social_drive,
-             entry.appetite, entry.note, now, entry.date)
-        )
-        entry.id = existing["id"]
-    else:
-        # Insert new
+    with transaction(conn):
         cursor = conn.execute(
-            """INSERT INTO mood_entries
-               (date, mood, energy, sleep_hours, sleep_quality, irritability,
-                anxiety, racing_thoughts, impulsivity, concentration,
-                social_drive, appetite, note, created_at, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            _MOOD_UPSERT_SQL,
             (entry.date, entry.mood, entry.energy, entry.sleep_hours,
              entry.sleep_quality, entry.irritability, entry.anxiety,
              entry.racing_thoughts, entry.impulsivity, entry.concentration,
              entry.social_drive, entry.appetite, entry.note, now, now)
         )
-        entry.id = cursor.lastrowid
+        entry.id = cursor.fetchone()[0]
+
+        if not save_history:
+            conn.execute(_MOOD_DROP_LATEST_HISTORY_SQL, (entry.id,))
 
-    conn.commit()
-    if should_close:
-        conn.close()
     return entry
 
 
+def update_mood_note(date_str: str, note: str,
+                     conn: Optional[sqlite3.Connection] = None) -> None:
+    """Set the note for a date without a read-modify-write of the whole entry.
+
+    Creates the entry if missing. The previous row (if any) is
+    snapshotted for undo by the mood_entry_history_snapshot trigger.
+    """
+    if conn is None:
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        now = datetime.now().isoformat()
+
+        conn.execute(
+            """INSERT INTO mood_entries (date, note, created_at, updated_at)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(date) DO UPDATE SET
+               note = excluded.note,
+               updated_at = excluded.updated_at""",
+            (date_str, note, now, now)
+        )
+
+
 def undo_mood_entry(date_str: str, conn: Optional[sqlite3.Connection] = None) -> Optional[MoodEntry]:
     """Undo the last change to a mood entry. Returns the restored entry or None."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    # Get current entry
-    current = conn.execute(
-        "SELECT id FROM mood_entries WHERE date = ?", (date_str,)
-    ).fetchone()
-
-    if not current:
-        if should_close:
-            conn.close()
-        return None
+    with transaction(conn):
+        # Get current entry
+        current = conn.execute(
+            "SELECT id FROM mood_entries WHERE date = ?", (date_str,)
+        ).fetchone()
 
-    # Get history
-    history = conn.execute(
-        "SELECT previous_data FROM mood_entry_history WHERE entry_id = ?",
-        (current["id"],)
-    ).fetchone()
+        if not current:
+            return None
 
-    if not history:
-        if should_close:
-            conn.close()
-        return None
+        # Get history
+        history = conn.execute(
+            "SELECT previous_data FROM mood_entry_history WHERE entry_id = ?",
+            (current["id"],)
+        ).fetchone()
 
-    # Restore previous data
-    prev = json.loads(history["previous_data"])
-    conn.execute(
-        """UPDATE mood_entries SET
-           mood = ?, energy = ?, sleep_hours = ?, sleep_quality = ?,
-           irritability = ?, anxiety = ?, racing_thoughts = ?,
-           impulsivity = ?, concentration = ?, social_drive = ?,
-           appetite = ?, note = ?, updated_at = ?
-           WHERE id = ?""",
-        (prev["mood"], prev["energy"], prev["sleep_hours"], prev["sleep_quality"],
-         prev["irritability"], prev["anxiety"], prev["racing_thoughts"],
-         prev["impulsivity"], prev["concentration"], prev["social_drive"],
-         prev["appetite"], prev["note"], datetime.now().isoformat(), current["id"])
-    )
+        if not history:
+            return None
 
-    # Delete history (one-level undo)
-    conn.execute("DELETE FROM mood_entry_history WHERE entry_id = ?", (current["id"],))
+        # Restore previous data
+        prev = load_json(history["previous_data"])
+        conn.execute(
+            """UPDATE mood_entries SET
+               mood = ?, energy = ?, sleep_hours = ?, sleep_quality = ?,
+               irritability = ?, anxiety = ?, racing_thoughts = ?,
+               impulsivity = ?, concentration = ?, social_drive = ?,
+               appetite = ?, note = ?, updated_at = ?
+               WHERE id = ?""",
+            (prev["mood"], prev["energy"], prev["sleep_hours"], prev["sleep_quality"],
+             prev["irritability"], prev["anxiety"], prev["racing_thoughts"],
+             prev["impulsivity"], prev["concentration"], prev["social_drive"],
+             prev["appetite"], prev["note"], datetime.now().isoformat(), current["id"])
+        )
 
-    conn.commit()
-    if should_close:
-        conn.close()
+        # Delete history (one-level undo)
+        conn.execute("DELETE FROM mood_entry_history WHERE entry_id = ?", (current["id"],))
 
-    return get_mood_entry(date_str)
+    return get_mood_entry(date_str, conn)
 
 
 def get_mood_entries(start_date: str, end_date: str,
                      conn: Optional[sqlite3.Connection] = None) -> List[MoodEntry]:
     """Get mood entries in a date range (inclusive)."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     rows = conn.execute(
         "SELECT * FROM mood_entries WHERE date BETWEEN ? AND ? ORDER BY date",
         (start_date, end_date)
     ).fetchall()
 
-    if should_close:
-        conn.close()
-    return [MoodEntry.from_row(row) for row in rows]
+    return [MoodEntry.from_tuple(row) for row in rows]
 
 
 def get_recent_mood_entries(days: int, conn: Optional[sqlite3.Connection] = None) -> List[MoodEntry]:
     """Get the most recent N days of mood entries."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     rows = conn.execute(
         """SELECT * FROM mood_entries
@@ -311,73 +338,94 @@ def get_recent_mood_entries(days: int, conn: Optional[sqlite3.Connection] = None
         (days,)
     ).fetchall()
 
-    if should_close:
-        conn.close()
-    return [MoodEntry.from_row(row) for row in rows]
+    return [MoodEntry.from_tuple(row) for row in rows]
 
 
 # Watch data operations
 
 def get_watch_data(date_str: str, conn: Optional[sqlite3.Connection] = None) -> Optional[WatchData]:
     """Get watch data for a specific date."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     row = conn.execute(
         "SELECT * FROM watch_data WHERE date = ?", (date_str,)
     ).fetchone()
 
-    if should_close:
-        conn.close()
-    return WatchData.from_row(row) if row else None
+    return WatchData.from_tuple(row) if row else None
+
+
+_WATCH_UPSERT_SQL = """
+    INSERT INTO watch_data (date, steps, resting_hr, hrv, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(date) DO UPDATE SET
+        steps = COALESCE(excluded.steps, steps),
+        resting_hr = COALESCE(excluded.resting_hr, resting_hr),
+        hrv = COALESCE(excluded.hrv, hrv),
+        updated_at = excluded.updated_at
+    RETURNING id
+"""
 
 
 def save_watch_data(data: WatchData, conn: Optional[sqlite3.Connection] = None) -> WatchData:
     """Save or update watch data."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
     now = datetime.now().isoformat()
 
-    existing = conn.execute(
-        "SELECT id FROM watch_data WHERE date = ?", (data.date,)
-    ).fetchone()
-
-    if existing:
-        conn.execute(
-            """UPDATE watch_data SET
-               steps = COALESCE(?, steps),
-               resting_hr = COALESCE(?, resting_hr),
-               hrv = COALESCE(?, hrv),
-               updated_at = ?
-               WHERE date = ?""",
-            (data.steps, data.resting_hr, data.hrv, now, data.date)
-        )
-        data.id = existing["id"]
-    else:
+    with transaction(conn):
         cursor = conn.execute(
-            """INSERT INTO watch_data (date, steps, resting_hr, hrv, created_at, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?)""",
+            _WATCH_UPSERT_SQL,
             (data.date, data.steps, data.resting_hr, data.hrv, now, now)
         )
-        data.id = cursor.lastrowid
+        data.id = cursor.fetchone()[0]
 
-    conn.commit()
-    if should_close:
-        conn.close()
     return data
 
 
+# Columns of watch_data that may be set individually
+WATCH_FIELDS = ("steps", "resting_hr", "hrv")
+
+
+def update_watch_fields(date_str: str, fields: Dict[str, int],
+                        conn: Optional[sqlite3.Connection] = None) -> None:
+    """Upsert only the given watch_data columns for a date in one statement.
+
+    Raises:
+        ValueError: If a field is not a watch_data column
+    """
+    for key in fields:
+        if key not in WATCH_FIELDS:
+            raise ValueError(f"Unknown watch field: {key}")
+    if not fields:
+        return
+
+    if conn is None:
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        now = datetime.now().isoformat()
+        columns = ", ".join(fields)
+        placeholders = ", ".join("?" * len(fields))
+        set_clause = ", ".join(f"{c} = excluded.{c}" for c in fields)
+
+        conn.execute(
+            f"""INSERT INTO watch_data (date, {columns}, created_at, updated_at)
+                VALUES (?, {placeholders}, ?, ?)
+                ON CONFLICT(date) DO UPDATE SET
+                {set_clause}, updated_at = excluded.updated_at""",
+            (date_str, *fields.values(), now, now)
+        )
+
+
 # Medication operations
 
 def get_medications(active_only: bool = True,
                     conn: Optional[sqlite3.Connection] = None) -> List[Medication]:
     """Get all medications."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     if active_only:
         rows = conn.execute(
@@ -388,24 +436,19 @@ def get_medications(active_only: bool = True,
             "SELECT * FROM medications ORDER BY active DESC, time_of_day, name"
         ).fetchall()
 
-    if should_close:
-        conn.close()
     return [Medication.from_row(row) for row in rows]
 
 
 def get_medication_by_name(name: str,
                            conn: Optional[sqlite3.Connection] = None) -> Optional[Medication]:
     """Get a medication by name (case-insensitive)."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     row = conn.execute(
         "SELECT * FROM medications WHERE name = ? COLLATE NOCASE", (name,)
     ).fetchone()
 
-    if should_close:
-        conn.close()
     return Medication.from_row(row) if row else None
 
 
@@ -418,39 +461,34 @@ def add_medication(med: Medication, conn: Optional[sqlite3.Connection] = None) -
     # Validate name
     med.name = validate_medication_name(med.name)
 
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    cursor = conn.execute(
-        """INSERT INTO medications (name, dosage, time_of_day, active, created_at)
-           VALUES (?, ?, ?, 1, ?)""",
-        (med.name, med.dosage, med.time_of_day, datetime.now().isoformat())
-    )
-    med.id = cursor.lastrowid
-    conn.commit()
-
-    if should_close:
-        conn.close()
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        cursor = conn.execute(
+            """INSERT INTO medications (name, dosage, time_of_day, active, created_at)
+               VALUES (?, ?, ?, 1, ?)""",
+            (med.name, med.dosage, med.time_of_day, datetime.now().isoformat())
+        )
+        med.id = cursor.lastrowid
+
     return med
 
 
 def deactivate_medication(name: str, conn: Optional[sqlite3.Connection] = None) -> bool:
     """Deactivate a medication (soft delete)."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    cursor = conn.execute(
-        """UPDATE medications SET active = 0, deactivated_at = ?
-           WHERE name = ? COLLATE NOCASE AND active = 1""",
-        (datetime.now().isoformat(), name)
-    )
-    conn.commit()
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        cursor = conn.execute(
+            """UPDATE medications SET active = 0, deactivated_at = ?
+               WHERE name = ? COLLATE NOCASE AND active = 1""",
+            (datetime.now().isoformat(), name)
+        )
+
     affected = cursor.rowcount
 
-    if should_close:
-        conn.close()
     return affected > 0
 
 
@@ -458,19 +496,15 @@ def log_medication(med_id: int, date_str: str, taken: bool = True,
                    time_taken: Optional[str] = None, note: Optional[str] = None,
                    conn: Optional[sqlite3.Connection] = None) -> MedLog:
     """Log a medication taken/missed."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    conn.execute(
-        """INSERT OR REPLACE INTO med_logs (med_id, date, taken, time_taken, note, created_at)
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (med_id, date_str, 1 if taken else 0, time_taken, note, datetime.now().isoformat())
-    )
-    conn.commit()
+        conn = get_shared_connection()
 
-    if should_close:
-        conn.close()
+    with transaction(conn):
+        conn.execute(
+            """INSERT OR REPLACE INTO med_logs (med_id, date, taken, time_taken, note, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (med_id, date_str, 1 if taken else 0, time_taken, note, datetime.now().isoformat())
+        )
 
     return MedLog(med_id=med_id, date=date_str, taken=taken,
                   time_taken=time_taken, note=note)
@@ -479,9 +513,8 @@ def log_medication(med_id: int, date_str: str, taken: bool = True,
 def get_med_logs_for_date(date_str: str,
                           conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
     """Get medication logs for a date with medication info."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     rows = conn.execute(
         """SELECT m.name, m.dosage, m.time_of_day, ml.taken, ml.time_taken, ml.note
@@ -492,8 +525,6 @@ def get_med_logs_for_date(date_str: str,
         (date_str,)
     ).fetchall()
 
-    if should_close:
-        conn.close()
     return [dict(row) for row in rows]
 
 
@@ -501,17 +532,14 @@ def get_med_logs_for_date(date_str: str,
 
 def get_current_episode(conn: Optional[sqlite3.Connection] = None) -> Optional[Episode]:
     """Get the current open episode (no end date)."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     row = conn.execute(
         "SELECT * FROM episodes WHERE end_date IS NULL ORDER BY start_date DESC LIMIT 1"
     ).fetchone()
 
-    if should_close:
-        conn.close()
-    return Episode.from_row(row) if row else None
+    return Episode.from_tuple(row) if row else None
 
 
 def start_episode(ep_type: str, start_date: Optional[str] = None,
@@ -522,31 +550,25 @@ def start_episode(ep_type: str, start_date: Optional[str] = None,
     Raises:
         ValueError: If there's already an open episode
     """
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    # Check for existing open episode
-    cursor = conn.execute("SELECT id FROM episodes WHERE end_date IS NULL")
-    existing = cursor.fetchone()
-    if existing:
-        if should_close:
-            conn.close()
-        raise ValueError("Cannot start new episode: there's already an open episode. End it first.")
-
-    if start_date is None:
-        start_date = date.today().isoformat()
-
-    cursor = conn.execute(
-        """INSERT INTO episodes (start_date, type, severity, created_at)
-           VALUES (?, ?, ?, ?)""",
-        (start_date, ep_type, severity, datetime.now().isoformat())
-    )
-    episode_id = cursor.lastrowid
-    conn.commit()
-
-    if should_close:
-        conn.close()
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        # Check for existing open episode
+        cursor = conn.execute("SELECT id FROM episodes WHERE end_date IS NULL")
+        existing = cursor.fetchone()
+        if existing:
+            raise ValueError("Cannot start new episode: there's already an open episode. End it first.")
+
+        if start_date is None:
+            start_date = date.today().isoformat()
+
+        cursor = conn.execute(
+            """INSERT INTO episodes (start_date, type, severity, created_at)
+               VALUES (?, ?, ?, ?)""",
+            (start_date, ep_type, severity, datetime.now().isoformat())
+        )
+        episode_id = cursor.lastrowid
 
     return Episode(id=episode_id, start_date=start_date, type=ep_type, severity=severity)
 
@@ -555,44 +577,37 @@ def end_episode(episode_id: int, end_date: Optional[str] = None,
                 note: Optional[str] = None,
                 conn: Optional[sqlite3.Connection] = None) -> Episode:
     """End an episode."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    if end_date is None:
-        end_date = date.today().isoformat()
+    with transaction(conn):
+        if end_date is None:
+            end_date = date.today().isoformat()
 
-    conn.execute(
-        "UPDATE episodes SET end_date = ?, note = ? WHERE id = ?",
-        (end_date, note, episode_id)
-    )
-    conn.commit()
+        conn.execute(
+            "UPDATE episodes SET end_date = ?, note = ? WHERE id = ?",
+            (end_date, note, episode_id)
+        )
 
     row = conn.execute("SELECT * FROM episodes WHERE id = ?", (episode_id,)).fetchone()
 
-    if should_close:
-        conn.close()
-    return Episode.from_row(row)
+    return Episode.from_tuple(row)
 
 
 def add_episode(start_date: str, end_date: str, ep_type: str,
                 severity: Optional[int] = None, note: Optional[str] = None,
                 conn: Optional[sqlite3.Connection] = None) -> Episode:
     """Add a past episode with start and end dates."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    cursor = conn.execute(
-        """INSERT INTO episodes (start_date, end_date, type, severity, note, created_at)
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (start_date, end_date, ep_type, severity, note, datetime.now().isoformat())
-    )
-    episode_id = cursor.lastrowid
-    conn.commit()
+        conn = get_shared_connection()
 
-    if should_close:
-        conn.close()
+    with transaction(conn):
+        cursor = conn.execute(
+            """INSERT INTO episodes (start_date, end_date, type, severity, note, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (start_date, end_date, ep_type, severity, note, datetime.now().isoformat())
+        )
+        episode_id = cursor.lastrowid
 
     return Episode(id=episode_id, start_date=start_date, end_date=end_date,
                    type=ep_type, severity=severity, note=note)
@@ -600,9 +615,8 @@ def add_episode(start_date: str, end_date: str, ep_type: str,
 
 def get_episodes(months: int = 12, conn: Optional[sqlite3.Connection] = None) -> List[Episode]:
     """Get episodes from the last N months."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     rows = conn.execute(
         """SELECT * FROM episodes
@@ -611,9 +625,7 @@ def get_episodes(months: int = 12, conn: Optional[sqlite3.Connection] = None) ->
         (f"-{months} months",)
     ).fetchall()
 
-    if should_close:
-        conn.close()
-    return [Episode.from_row(row) for row in rows]
+    return [Episode.from_tuple(row) for row in rows]
 
 
 # Trigger operations
@@ -621,9 +633,8 @@ def get_episodes(months: int = 12, conn: Optional[sqlite3.Connection] = None) ->
 def get_mood_triggers(active_only: bool = True,
                       conn: Optional[sqlite3.Connection] = None) -> List[MoodTrigger]:
     """Get all mood triggers."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     if active_only:
         rows = conn.execute(
@@ -632,62 +643,53 @@ def get_mood_triggers(active_only: bool = True,
     else:
         rows = conn.execute("SELECT * FROM mood_triggers").fetchall()
 
-    if should_close:
-        conn.close()
     return [MoodTrigger.from_row(row) for row in rows]
 
 
 def add_mood_trigger(condition: str, message: str,
                      conn: Optional[sqlite3.Connection] = None) -> MoodTrigger:
     """Add a new trigger."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    cursor = conn.execute(
-        """INSERT INTO mood_triggers (condition, message, active, created_at)
-           VALUES (?, ?, 1, ?)""",
-        (condition, message, datetime.now().isoformat())
-    )
-    trigger_id = cursor.lastrowid
-    conn.commit()
-
-    if should_close:
-        conn.close()
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        cursor = conn.execute(
+            """INSERT INTO mood_triggers (condition, message, active, created_at)
+               VALUES (?, ?, 1, ?)""",
+            (condition, message, datetime.now().isoformat())
+        )
+        trigger_id = cursor.lastrowid
+
     return MoodTrigger(id=trigger_id, condition=condition, message=message)
 
 
 def set_mood_trigger_active(trigger_id: int, active: bool,
                             conn: Optional[sqlite3.Connection] = None) -> bool:
     """Enable or disable a trigger."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        cursor = conn.execute(
+            "UPDATE mood_triggers SET active = ? WHERE id = ?",
+            (1 if active else 0, trigger_id)
+        )
 
-    cursor = conn.execute(
-        "UPDATE mood_triggers SET active = ? WHERE id = ?",
-        (1 if active else 0, trigger_id)
-    )
-    conn.commit()
     affected = cursor.rowcount
 
-    if should_close:
-        conn.close()
     return affected > 0
 
 
 def delete_mood_trigger(trigger_id: int, conn: Optional[sqlite3.Connection] = None) -> bool:
     """Delete a trigger."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        cursor = conn.execute("DELETE FROM mood_triggers WHERE id = ?", (trigger_id,))
 
-    cursor = conn.execute("DELETE FROM mood_triggers WHERE id = ?", (trigger_id,))
-    conn.commit()
     affected = cursor.rowcount
 
-    if should_close:
-        conn.close()
     return affected > 0
 
 
@@ -695,48 +697,39 @@ def delete_mood_trigger(trigger_id: int, conn: Optional[sqlite3.Connection] = No
 
 def get_baseline(metric: str, conn: Optional[sqlite3.Connection] = None) -> Optional[Baseline]:
     """Get baseline for a metric."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     row = conn.execute(
         "SELECT * FROM baselines WHERE metric = ?", (metric,)
     ).fetchone()
 
-    if should_close:
-        conn.close()
-    return Baseline.from_row(row) if row else None
+    return Baseline.from_tuple(row) if row else None
 
 
 def get_all_baselines(conn: Optional[sqlite3.Connection] = None) -> List[Baseline]:
     """Get all baselines."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     rows = conn.execute("SELECT * FROM baselines").fetchall()
 
-    if should_close:
-        conn.close()
-    return [Baseline.from_row(row) for row in rows]
+    return [Baseline.from_tuple(row) for row in rows]
 
 
 def save_baseline(baseline: Baseline, conn: Optional[sqlite3.Connection] = None) -> Baseline:
     """Save or update a baseline."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
-
-    conn.execute(
-        """INSERT OR REPLACE INTO baselines (metric, value, std_dev, calculated_at, days_used)
-           VALUES (?, ?, ?, ?, ?)""",
-        (baseline.metric, baseline.value, baseline.std_dev,
-         baseline.calculated_at, baseline.days_used)
-    )
-    conn.commit()
-
-    if should_close:
-        conn.close()
+        conn = get_shared_connection()
+
+    with transaction(conn):
+        conn.execute(
+            """INSERT OR REPLACE INTO baselines (metric, value, std_dev, calculated_at, days_used)
+               VALUES (?, ?, ?, ?, ?)""",
+            (baseline.metric, baseline.value, baseline.std_dev,
+             baseline.calculated_at, baseline.days_used)
+        )
+
     return baseline
 
 
@@ -744,44 +737,35 @@ def save_baseline(baseline: Baseline, conn: Optional[sqlite3.Connection] = None)
 
 def get_target(metric: str, conn: Optional[sqlite3.Connection] = None) -> Optional[float]:
     """Get target for a metric."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     row = conn.execute(
         "SELECT value FROM targets WHERE metric = ?", (metric,)
     ).fetchone()
 
-    if should_close:
-        conn.close()
     return row["value"] if row else None
 
 
 def get_all_targets(conn: Optional[sqlite3.Connection] = None) -> Dict[str, float]:
     """Get all targets."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_read_connection()
 
     rows = conn.execute("SELECT metric, value FROM targets").fetchall()
 
-    if should_close:
-        conn.close()
     return {row["metric"]: row["value"] for row in rows}
 
 
 def set_target(metric: str, value: float, conn: Optional[sqlite3.Connection] = None) -> None:
     """Set a target for a metric."""
-    should_close = conn is None
     if conn is None:
-        conn = get_connection()
+        conn = get_shared_connection()
 
-    conn.execute(
-        """INSERT OR REPLACE INTO targets (metric, value, set_at)
-           VALUES (?, ?, ?)""",
-        (metric, value, datetime.now().isoformat())
-    )
-    conn.commit()
+    with transaction(conn):
+        conn.execute(
+            """INSERT OR REPLACE INTO targets (metric, value, set_at)
+               VALUES (?, ?, ?)""",
+            (metric, value, datetime.now().isoformat())
+        )
 
-    if should_close:
-        conn.close()
@@ -3,12 +3,11 @@
 Provides 50 levels of undo for entries, collections, and habits.
 """
 
-import json
 import sqlite3
 from typing import Optional, List, Dict, Any
 
 from .db import get_connection, ensure_db
-from .models import UndoAction
+from .models import UndoAction, load_json
 
 
 def get_undo_history(
@@ -85,8 +84,8 @@ def undo_last_action(conn: Optional[sqlite3.Connection] = None) -> Optional[Dict
             return {"action": None, "success": False, "message": "Nothing to undo"}
 
         action = UndoAction.from_row(row)
-        old_data = json.loads(action.old_data) if action.old_data else None
-        new_data = json.loads(action.new_data) if action.new_data else None
+        old_data = load_json(action.old_data) if action.old_data else None
+        new_data = load_json(action.new_data) if action.new_data else None
 
         message = ""
         success = True
@@ -213,8 +212,8 @@ def clear_undo_history(conn: Optional[sqlite3.Connection] = None) -> int:
 
 def describe_action(action: UndoAction) -> str:
     """Get human-readable description of an action."""
-    old_data = json.loads(action.old_data) if action.old_data else {}
-    new_data = json.loads(action.new_data) if action.new_data else {}
+    old_data = load_json(action.old_data) if action.old_data else {}
+    new_data = load_json(action.new_data) if action.new_data else {}
 
     table_friendly = {
         "entries": "entry",
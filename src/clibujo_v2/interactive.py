@@ -22,7 +22,7 @@ from .core.habits import (
     remove_completion,
     get_habit_by_name,
     get_active_habits,
-    get_habit_progress,
+    get_all_progress,
 )
 from .core.migrations import migrate_forward, get_tasks_needing_migration
 from .core.undo import undo_last_action, get_undo_preview
@@ -188,7 +188,7 @@ def process_command(cmd: str, current_date: date) -> date:
             if entry:
                 print(f"Reopened: {format_entry(entry)}")
             else:
-                print(f"Not found: {entry_id}")
+                print(f"Not found or not a task: {entry_id}")
         except ValueError:
             print("Usage: o <entry_id>")
         return current_date
@@ -284,9 +284,10 @@ def process_command(cmd: str, current_date: date) -> date:
             print("\nHabits:")
             today_d = date.today()
             today_str = today_d.isoformat()
+            progress_map = get_all_progress(habits_list, today_d)
             for h in habits_list:
                 completed = is_completed_on_date(h.id, today_str)
-                progress = get_habit_progress(h, today_d)
+                progress = progress_map[h.id]
                 status = "[x]" if completed else "[ ]"
                 streak = f" (streak: {progress['streak']})" if progress['streak'] > 0 else ""
                 print(f"  {status} {h.name} ({h.get_frequency_display()}){streak}")
@@ -19,7 +19,7 @@ from ..core.entries import (
 from ..core.collections import get_collection, get_collection_by_name, get_all_collections
 from ..core.habits import (
     get_all_habits,
-    get_habit_progress,
+    get_all_progress,
     is_completed_on_date,
     get_habit_calendar,
     get_completions_in_range,
@@ -155,9 +155,10 @@ class BujoPDF(FPDF):
 
         date_str = target_date.isoformat()
 
+        progress_map = get_all_progress(habits, target_date)
         for habit in habits:
             completed = is_completed_on_date(habit.id, date_str)
-            progress = get_habit_progress(habit, target_date)
+            progress = progress_map[habit.id]
 
             status = "[x]" if completed else "[ ]"
             freq = habit.get_frequency_display()
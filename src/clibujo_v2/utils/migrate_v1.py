@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Optional, List, Dict, Tuple
 
 from ..core.db import ensure_db, get_connection
-from ..core.entries import create_entry
+from ..core.entries import create_entries
 from ..core.collections import create_collection, get_collection_by_name
 from ..core.habits import create_habit, record_completion
 
@@ -227,17 +227,21 @@ def migrate_from_v1(
                     date_str, entries = parse_daily_log(md_file)
                     stats["daily_logs"] += 1
 
-                    for entry_data in entries:
-                        if not dry_run:
-                            create_entry(
-                                content=entry_data["content"],
-                                entry_type=entry_data["type"],
-                                entry_date=date_str,
-                                status=entry_data["status"],
-                                signifier=entry_data["signifier"],
-                                conn=conn,
-                            )
-                        stats["entries"] += 1
+                    if not dry_run:
+                        create_entries(
+                            [
+                                {
+                                    "content": entry_data["content"],
+                                    "entry_type": entry_data["type"],
+                                    "entry_date": date_str,
+                                    "status": entry_data["status"],
+                                    "signifier": entry_data["signifier"],
+                                }
+                                for entry_data in entries
+                            ],
+                            conn=conn,
+                        )
+                    stats["entries"] += len(entries)
 
                 except Exception as e:
                     stats["errors"].append(f"Daily {md_file.name}: {e}")
@@ -251,19 +255,23 @@ def migrate_from_v1(
                     month_str = md_file.stem
 
                     with open(md_file, "r", encoding="utf-8") as f:
-                        for line in f:
-                            entry = parse_entry_line(line)
-                            if entry:
-                                if not dry_run:
-                                    create_entry(
-                                        content=entry["content"],
-                                        entry_type=entry["type"],
-                                        entry_month=month_str,
-                                        status=entry["status"],
-                                        signifier=entry["signifier"],
-                                        conn=conn,
-                                    )
-                                stats["entries"] += 1
+                        entries = [e for e in map(parse_entry_line, f) if e]
+
+                    if not dry_run:
+                        create_entries(
+                            [
+                                {
+                                    "content": entry["content"],
+                                    "entry_type": entry["type"],
+                                    "entry_month": month_str,
+                                    "status": entry["status"],
+                                    "signifier": entry["signifier"],
+                                }
+                                for entry in entries
+                            ],
+                            conn=conn,
+                        )
+                    stats["entries"] += len(entries)
 
                 except Exception as e:
                     stats["errors"].append(f"Monthly {md_file.name}: {e}")
@@ -285,16 +293,20 @@ def migrate_from_v1(
                             coll_id = coll.id
                             stats["collections"] += 1
 
-                        for entry_data in entries:
-                            create_entry(
-                                content=entry_data["content"],
-                                entry_type=entry_data["type"],
-                                collection_id=coll_id,
-                                status=entry_data["status"],
-                                signifier=entry_data["signifier"],
-                                conn=conn,
-                            )
-                            stats["collection_entries"] += 1
+                        create_entries(
+                            [
+                                {
+                                    "content": entry_data["content"],
+                                    "entry_type": entry_data["type"],
+                                    "collection_id": coll_id,
+                                    "status": entry_data["status"],
+                                    "signifier": entry_data["signifier"],
+                                }
+                                for entry_data in entries
+                            ],
+                            conn=conn,
+                        )
+                        stats["collection_entries"] += len(entries)
                     else:
                         stats["collections"] += 1
                         stats["collection_entries"] += len(entries)
@@ -10,7 +10,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple
 
-from ..core.db import get_db_path, get_data_dir
+from ..core.db import get_db_path, get_data_dir, close_shared_connection
 
 
 def get_backup_dir() -> Path:
@@ -177,7 +177,8 @@ def pull(remote: Optional[str] = None, force: bool = False) -> Tuple[bool, str]:
         except Exception as e:
             return False, f"Backup failed: {e}"
 
-    # Pull
+    # Pull (drop our open handle on the file being replaced)
+    close_shared_connection()
     result = subprocess.run(
         ["rclone", "copy", f"{remote}/bujo.db", str(db_path.parent), "--progress"],
         capture_output=True,
@@ -279,6 +280,7 @@ def restore_backup(backup_name: str) -> Tuple[bool, str]:
     if db_path.exists():
         create_backup()
 
+    close_shared_connection()
     shutil.copy2(backup_path, db_path)
     return True, f"Restored from {backup_name}"
 
@@ -1,6 +1,7 @@
 """Tests for CLI commands."""
 
 import pytest
+from datetime import date
 from click.testing import CliRunner
 
 from clibujo_v2.cli import cli
@@ -58,6 +59,14 @@ class TestAddCommand:
         assert result.exit_code == 0
         assert "*" in result.output  # Priority signifier
 
+    def test_add_with_leading_symbol(self, runner):
+        """A leading signifier symbol is parsed off the content."""
+        result = runner.invoke(cli, ["add", "!", "Big", "idea"])
+
+        assert result.exit_code == 0
+        entry = get_entries_by_date(date.today().isoformat())[0]
+        assert (entry.signifier, entry.content) == ("inspiration", "Big idea")
+
     def test_add_event(self, runner):
         """Add an event."""
         result = runner.invoke(cli, ["add", "-t", "event", "Meeting at 2pm"])
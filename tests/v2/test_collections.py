@@ -6,6 +6,7 @@ from clibujo_v2.core.collections import (
     create_collection,
     get_collection,
     get_collection_by_name,
+    get_collections,
     get_all_collections,
     update_collection,
     archive_collection,
@@ -227,6 +228,24 @@ class TestCollectionStats:
         assert stats["complete"] == 1
 
 
+class TestGetCollections:
+    """Tests for batch lookup by id."""
+
+    def test_get_many(self, db_connection):
+        """Known ids are returned keyed by id; unknown ids are skipped."""
+        a = create_collection("A", conn=db_connection)
+        b = create_collection("B", conn=db_connection)
+
+        result = get_collections([a.id, b.id, 9999, a.id], conn=db_connection)
+
+        assert set(result) == {a.id, b.id}
+        assert result[b.id].name == "B"
+
+    def test_get_none(self, db_connection):
+        """An empty id list returns an empty dict."""
+        assert get_collections([], conn=db_connection) == {}
+
+
 class TestSearchCollections:
     """Tests for searching collections."""
 
@@ -239,3 +258,38 @@ class TestSearchCollections:
         results = search_collections("Project")
 
         assert len(results) == 2
+
+    def test_search_substring_case_insensitive(self, db_connection):
+        """Search matches inside names regardless of case."""
+        create_collection("Reading List", conn=db_connection)
+
+        assert [c.name for c in search_collections("DING")] == ["Reading List"]
+
+    def test_search_short_query(self, db_connection):
+        """Queries under the trigram length still match."""
+        create_collection("Q1 Goals", conn=db_connection)
+
+        assert [c.name for c in search_collections("q1")] == ["Q1 Goals"]
+
+    def test_search_follows_rename_and_archive(self, db_connection):
+        """The index tracks renames; archived collections are hidden."""
+        coll = create_collection("Old Name", conn=db_connection)
+        update_collection(coll.id, name="New Name", conn=db_connection)
+
+        assert search_collections("Old") == []
+        assert len(search_collections("New")) == 1
+
+        archive_collection(coll.id, conn=db_connection)
+        assert search_collections("New") == []
+        assert len(search_collections("New", include_archived=True)) == 1
+
+
+class TestDefaultConnection:
+    """Collections work on a fresh database without an explicit init."""
+
+    def test_fresh_database(self, test_db_env):
+        """The shared connections create the schema on first use."""
+        coll = create_collection("Fresh", "project")
+
+        assert get_collection(coll.id).name == "Fresh"
+        assert [c.name for c in get_all_collections()] == ["Fresh"]
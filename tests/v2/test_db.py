@@ -0,0 +1,173 @@
+"""Tests for database connection management."""
+
+import os
+import sqlite3
+
+import pytest
+
+from clibujo_v2.core.db import (
+    init_db,
+    ensure_db,
+    get_db_path,
+    get_schema_version,
+    SCHEMA_VERSION,
+    get_shared_connection,
+    get_read_connection,
+    close_shared_connection,
+    transaction,
+)
+from clibujo_v2.core.collections import create_collection, get_collection_by_name
+
+
+class TestSharedConnection:
+    """Tests for the per-thread shared connection."""
+
+    def test_reused_between_calls(self, test_db_env):
+        """The same connection is returned while the path is unchanged."""
+        init_db()
+        assert get_shared_connection() is get_shared_connection()
+
+    def test_replaced_when_path_changes(self, test_db_env, tmp_path):
+        """Pointing BUJO_DIR elsewhere opens a new connection."""
+        init_db()
+        first = get_shared_connection()
+
+        other_dir = tmp_path / "other"
+        other_dir.mkdir()
+        os.environ["BUJO_DIR"] = str(other_dir)
+        init_db()
+
+        assert get_shared_connection() is not first
+
+    def test_rollback_on_error(self, test_db_env):
+        """A failed mutation does not leave a transaction open."""
+        init_db()
+        create_collection("Dup")
+        with pytest.raises(Exception):
+            create_collection("Dup")
+
+        assert not get_shared_connection().in_transaction
+        assert get_collection_by_name("Dup") is not None
+
+    def test_pragmas(self, test_db_env):
+        """Connections run WAL with synchronous=NORMAL and in-memory temp."""
+        init_db()
+        conn = get_shared_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+
+    def test_read_connection_pragmas(self, test_db_env):
+        """The read-only connection sees WAL and gets the same cache tuning."""
+        reader = get_read_connection()
+        assert reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert reader.execute("PRAGMA temp_store").fetchone()[0] == 2
+        assert reader.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+
+    def test_creates_database_on_first_use(self, test_db_env):
+        """Opening either connection initializes a missing database."""
+        reader = get_read_connection()
+        assert get_schema_version(reader) == SCHEMA_VERSION
+        assert get_db_path().exists()
+
+    def test_close(self, test_db_env):
+        """Closing drops the cached connection."""
+        init_db()
+        first = get_shared_connection()
+        close_shared_connection()
+
+        assert get_shared_connection() is not first
+
+
+class TestReadConnection:
+    """Tests for the per-thread read-only connection."""
+
+    def test_separate_from_writer(self, test_db_env):
+        """Readers get their own cached connection."""
+        init_db()
+        reader = get_read_connection()
+        assert reader is get_read_connection()
+        assert reader is not get_shared_connection()
+
+    def test_rejects_writes(self, test_db_env):
+        """The reader is opened read-only."""
+        init_db()
+        with pytest.raises(sqlite3.OperationalError):
+            get_read_connection().execute("INSERT INTO config (key, value) VALUES ('a', '1')")
+
+    def test_sees_committed_writes(self, test_db_env):
+        """Writes committed on the writer are visible to the reader."""
+        init_db()
+        create_collection("Visible")
+        row = get_read_connection().execute(
+            "SELECT name FROM collections WHERE name = 'Visible'"
+        ).fetchone()
+        assert row is not None
+
+
+class TestTransaction:
+    """Tests for the transaction helper."""
+
+    def test_commits(self, db_connection):
+        """The block is committed on success."""
+        with transaction(db_connection):
+            db_connection.execute("INSERT INTO config (key, value) VALUES ('a', '1')")
+
+        assert not db_connection.in_transaction
+        row = db_connection.execute("SELECT value FROM config WHERE key = 'a'").fetchone()
+        assert row[0] == "1"
+
+    def test_rolls_back(self, db_connection):
+        """The block is rolled back on error."""
+        with pytest.raises(RuntimeError):
+            with transaction(db_connection):
+                db_connection.execute("INSERT INTO config (key, value) VALUES ('a', '1')")
+                raise RuntimeError("boom")
+
+        assert db_connection.execute("SELECT COUNT(*) FROM config").fetchone()[0] == 0
+
+    def test_nested_joins_outer(self, db_connection):
+        """An inner block leaves committing to the outer one."""
+        with transaction(db_connection):
+            with transaction(db_connection):
+                db_connection.execute("INSERT INTO config (key, value) VALUES ('a', '1')")
+            assert db_connection.in_transaction
+
+        assert not db_connection.in_transaction
+
+
+class TestEnsureDb:
+    """Tests for ensure_db."""
+
+    def test_creates_database(self, test_db_env):
+        """A missing database is created."""
+        ensure_db()
+        assert get_db_path().exists()
+
+    def test_checked_once_per_dir(self, test_db_env, tmp_path):
+        """Later calls skip the check until BUJO_DIR changes."""
+        ensure_db()
+        get_db_path().unlink()
+        ensure_db()
+        assert not get_db_path().exists()
+
+        other_dir = tmp_path / "other"
+        other_dir.mkdir()
+        os.environ["BUJO_DIR"] = str(other_dir)
+        ensure_db()
+        assert get_db_path().exists()
+
+    def test_upgrades_old_schema(self, test_db_env):
+        """A database without a schema version is brought up to date."""
+        old = sqlite3.connect(get_db_path())
+        old.execute("CREATE TABLE collections (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE COLLATE NOCASE, type TEXT NOT NULL, description TEXT, created_at TEXT, archived_at TEXT)")
+        old.execute("INSERT INTO collections (name, type) VALUES ('Legacy Project', 'project')")
+        old.commit()
+        old.close()
+
+        ensure_db()
+
+        assert get_schema_version(get_shared_connection()) == SCHEMA_VERSION
+        from clibujo_v2.core.collections import search_collections
+        assert [c.name for c in search_collections("Legacy")] == ["Legacy Project"]
@@ -6,6 +6,7 @@ from datetime import date
 from clibujo_v2.core.db import init_db
 from clibujo_v2.core.entries import (
     create_entry,
+    create_entries,
     get_entry,
     get_entries_by_date,
     get_entries_by_month,
@@ -18,6 +19,7 @@ from clibujo_v2.core.entries import (
     delete_entry,
     search_entries,
     get_entries_date_range,
+    reorder_entry,
 )
 
 
@@ -34,6 +36,40 @@ class TestCreateEntry:
         assert entry.status == "open"
         assert entry.entry_date == "2025-01-15"
 
+    def test_type_constants_match_stored_values(self, db_connection):
+        """The model constants are the plain strings stored on entries."""
+        from clibujo_v2.core.models import EntryType, Signifier, TaskStatus
+
+        entry = create_entry(
+            "Test task", entry_type=EntryType.TASK, entry_date="2025-01-15",
+            signifier=Signifier.PRIORITY, conn=db_connection,
+        )
+
+        assert entry.entry_type == EntryType.TASK == "task"
+        assert entry.status == TaskStatus.OPEN
+        assert entry.signifier == Signifier.PRIORITY
+
+    def test_slots_and_to_dict(self, sample_entries):
+        """Entries carry no __dict__ and to_dict lists fields in order."""
+        from dataclasses import asdict
+
+        entry = sample_entries[0]
+
+        assert not hasattr(entry, "__dict__")
+        assert list(entry.to_dict().items()) == list(asdict(entry).items())
+
+    def test_json_round_trip(self, sample_entries):
+        """to_json and from_json restore an equal entry."""
+        import json
+
+        from clibujo_v2.core.models import Entry
+
+        entry = sample_entries[3]
+        data = entry.to_json()
+
+        assert json.loads(data)["signifier"] == "priority"
+        assert Entry.from_json(data) == entry
+
     def test_create_event(self, db_connection):
         """Create an event."""
         entry = create_entry("Test event", entry_type="event", entry_date="2025-01-15", conn=db_connection)
@@ -83,6 +119,54 @@ class TestCreateEntry:
         assert entry.entry_month == "2025-02"
         assert entry.entry_date is None
 
+    def test_next_sort_order_is_index_seek(self, db_connection):
+        """The next sort_order comes from the context index, not a scan."""
+        from clibujo_v2.core.entries import _SQL_INSERT
+
+        params = (1, None, None, "task", "open", None, "x", None, None, 1)
+        plan = " ".join(
+            row[3] for row in db_connection.execute("EXPLAIN QUERY PLAN " + _SQL_INSERT, params)
+        )
+
+        assert "COVERING INDEX idx_entries_context_sort" in plan
+
+    @pytest.mark.parametrize("bad_date", ["2025-02-30", "20250115", "2025-W03-1", "2025-1-5"])
+    def test_rejects_invalid_date(self, db_connection, bad_date):
+        """Malformed or impossible dates are rejected."""
+        with pytest.raises(ValueError):
+            create_entry("Bad date", entry_date=bad_date, conn=db_connection)
+
+
+class TestCreateEntries:
+    """Tests for bulk entry creation."""
+
+    def test_create_entries(self, db_connection):
+        """Entries are created in order with increasing sort_order."""
+        entries = create_entries(
+            [
+                {"content": "First", "entry_date": "2025-01-15"},
+                {"content": "Second", "entry_type": "note", "entry_date": "2025-01-15"},
+            ],
+            conn=db_connection,
+        )
+
+        assert [e.content for e in entries] == ["First", "Second"]
+        assert [e.sort_order for e in entries] == [0, 1]
+        assert entries[1].status is None
+
+    def test_invalid_entry_rolls_back(self, db_connection):
+        """One invalid entry means nothing is created."""
+        with pytest.raises(ValueError):
+            create_entries(
+                [
+                    {"content": "Fine", "entry_date": "2025-01-15"},
+                    {"content": "   ", "entry_date": "2025-01-15"},
+                ],
+                conn=db_connection,
+            )
+
+        assert get_entries_by_date("2025-01-15", conn=db_connection) == []
+
 
 class TestGetEntry:
     """Tests for retrieving entries."""
@@ -156,6 +240,26 @@ class TestUpdateEntry:
 
         assert entry.signifier is None
 
+    def test_move_to_month(self, sample_entries):
+        """Clearing the date and setting a month moves the entry."""
+        entry = update_entry(sample_entries[0].id, entry_date="", entry_month="2025-02")
+
+        assert entry.entry_date is None
+        assert entry.entry_month == "2025-02"
+        assert entry.content == "Buy groceries"
+        assert entry.status == "open"
+
+    def test_detach_from_collection(self, db_connection, sample_collection):
+        """collection_id=-1 removes the entry from its collection."""
+        entry = create_entry("In project", collection_id=sample_collection.id, conn=db_connection)
+        entry = update_entry(entry.id, collection_id=-1, conn=db_connection)
+
+        assert entry.collection_id is None
+
+    def test_missing_entry(self, db_connection):
+        """Updating a missing entry returns None."""
+        assert update_entry(9999, content="x", conn=db_connection) is None
+
 
 class TestCompleteEntry:
     """Tests for completing tasks."""
@@ -168,14 +272,35 @@ class TestCompleteEntry:
         assert entry.completed_at is not None
 
     def test_complete_non_task(self, sample_entries):
-        """Try to complete an event (should fail)."""
-        # Events don't have status
+        """Completing an event does nothing and returns None."""
         event = sample_entries[1]
         result = complete_entry(event.id)
 
-        # update_entry returns the entry even if status wasn't applicable
-        # but the status should remain None
-        assert result is not None
+        assert result is None
+        assert get_entry(event.id).status is None
+
+    def test_complete_note_returns_none(self, db_connection, sample_entries):
+        """Status changes on a note are refused without recording undo."""
+        note = sample_entries[2]
+        undo_count = db_connection.execute("SELECT COUNT(*) FROM undo_history").fetchone()[0]
+
+        assert complete_entry(note.id) is None
+        assert cancel_entry(note.id) is None
+        assert reopen_entry(note.id) is None
+
+        stored = get_entry(note.id)
+        assert stored.status is None
+        assert stored.completed_at is None
+        after = db_connection.execute("SELECT COUNT(*) FROM undo_history").fetchone()[0]
+        assert after == undo_count
+
+    def test_edit_note_content_still_allowed(self, sample_entries):
+        """Non-status edits still apply to notes."""
+        note = sample_entries[2]
+
+        entry = update_entry(note.id, content="Call John tomorrow")
+
+        assert entry.content == "Call John tomorrow"
 
 
 class TestCancelEntry:
@@ -242,6 +367,22 @@ class TestSearchEntries:
 
         assert results == []
 
+    def test_search_all_words(self, db_connection):
+        """Every word must match, but not necessarily adjacently."""
+        create_entry("Buy milk and bread", entry_date="2025-01-15", conn=db_connection)
+        create_entry("Buy stamps", entry_date="2025-01-15", conn=db_connection)
+
+        results = search_entries("bread buy", conn=db_connection)
+
+        assert [e.content for e in results] == ["Buy milk and bread"]
+
+    @pytest.mark.parametrize("query", ['"unbalanced', "email:work", "a-b", "NOT", "(x OR", "milk*"])
+    def test_search_special_characters(self, db_connection, query):
+        """FTS5 operators in the query don't raise syntax errors."""
+        create_entry("Buy milk", entry_date="2025-01-15", conn=db_connection)
+
+        search_entries(query, conn=db_connection)
+
 
 class TestGetOpenTasks:
     """Tests for getting open tasks."""
@@ -265,3 +406,24 @@ class TestGetOpenTasks:
         tasks = get_open_tasks()
 
         assert len(tasks) == 1
+
+
+class TestReorderEntry:
+    """Tests for reordering entries."""
+
+    def test_move_up(self, sample_entries):
+        """Moving an entry shifts the ones it passes."""
+        assert reorder_entry(sample_entries[3].id, 0)
+
+        entries = get_entries_by_date("2025-01-15")
+        assert [e.id for e in entries] == [
+            sample_entries[3].id,
+            sample_entries[0].id,
+            sample_entries[1].id,
+            sample_entries[2].id,
+        ]
+        assert [e.sort_order for e in entries] == [0, 1, 2, 3]
+
+    def test_missing_entry(self, db_connection):
+        """Reordering a missing entry returns False."""
+        assert reorder_entry(9999, 0) is False
@@ -1,5 +1,7 @@
 """Tests for habit tracking operations."""
 
+import sqlite3
+
 import pytest
 from datetime import date, timedelta
 
@@ -15,14 +17,19 @@ from clibujo_v2.core.habits import (
     quit_habit,
     delete_habit,
     record_completion,
+    record_completions_bulk,
     remove_completion,
     is_completed_on_date,
     get_habits_due_on_date,
+    is_habit_due_on_date,
     get_habit_progress,
+    get_all_progress,
     calculate_streak,
     get_habit_calendar,
     parse_frequency,
+    pinned_today,
 )
+from clibujo_v2.core.models import Habit
 
 
 class TestParseFrequency:
@@ -72,6 +79,14 @@ class TestParseFrequency:
         assert target == 3
         assert days == "mon,wed,fri"
 
+    @pytest.mark.parametrize(
+        "freq", ["hourly", "daily:2", "weekly:8", "monthly:0", "days:", "days:mon,xyz"]
+    )
+    def test_parse_invalid(self, freq):
+        """Invalid frequencies raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_frequency(freq)
+
 
 class TestCreateHabit:
     """Tests for habit creation."""
@@ -107,6 +122,30 @@ class TestCreateHabit:
             create_habit("Unique Habit", conn=db_connection)
 
 
+class TestHabitModel:
+    """Tests for the Habit model."""
+
+    def test_from_tuple_matches_from_row(self, sample_habits, db_connection):
+        """Positional and named construction agree."""
+        row = db_connection.execute(
+            "SELECT * FROM habits WHERE id = ?", (sample_habits[2].id,)
+        ).fetchone()
+
+        assert Habit.from_tuple(row) == Habit.from_row(row)
+
+    def test_tuple_reads_keep_row_factory(self, sample_habits, db_connection):
+        """Tuple-only reads leave the connection's row factory in place."""
+        record_completion(sample_habits[0].id, "2024-01-15", conn=db_connection)
+
+        assert is_completed_on_date(sample_habits[0].id, "2024-01-15", conn=db_connection)
+        assert get_all_habits(conn=db_connection)[0].name == "Exercise"
+        assert db_connection.row_factory is sqlite3.Row
+
+    def test_slots(self, sample_habits):
+        """Habits carry no per-instance __dict__."""
+        assert not hasattr(sample_habits[0], "__dict__")
+
+
 class TestGetHabit:
     """Tests for retrieving habits."""
 
@@ -167,6 +206,34 @@ class TestUpdateHabit:
         assert habit.frequency_type == "weekly"
         assert habit.frequency_target == 3
 
+    def test_update_frequency_clears_days(self, sample_habits):
+        """Leaving specific days drops the day list."""
+        habit = update_habit(sample_habits[2].id, frequency="daily")
+
+        assert habit.frequency_type == "daily"
+        assert habit.frequency_days is None
+
+    def test_update_category(self, sample_habits):
+        """Set and clear a category without touching other fields."""
+        habit = update_habit(sample_habits[2].id, category="health")
+
+        assert habit.category == "health"
+        assert habit.frequency_days == "mon,wed,fri"
+
+        habit = update_habit(sample_habits[2].id, category="")
+
+        assert habit.category is None
+
+    def test_update_nothing(self, sample_habits):
+        """An update with no fields returns the habit unchanged."""
+        habit = update_habit(sample_habits[0].id)
+
+        assert habit == sample_habits[0]
+
+    def test_update_missing(self, db_connection):
+        """Updating a missing habit returns None."""
+        assert update_habit(9999, name="Ghost") is None
+
 
 class TestHabitLifecycle:
     """Tests for habit status changes."""
@@ -240,6 +307,107 @@ class TestRecordCompletion:
         assert is_completed_on_date(habit.id, today) is False
 
 
+class TestOuterTransaction:
+    """Habit writers join a caller's transaction instead of ending it."""
+
+    def test_failed_write_keeps_outer_batch(self, sample_habits):
+        """A caught duplicate completion doesn't roll back earlier work."""
+        from clibujo_v2.core.db import get_shared_connection, transaction
+        from clibujo_v2.core.entries import create_entry, get_entries_by_date
+
+        habit = sample_habits[0]
+        record_completion(habit.id, "2024-01-15")
+        conn = get_shared_connection()
+
+        with transaction(conn):
+            create_entry("batch task", entry_date="2024-01-15")
+            with pytest.raises(sqlite3.IntegrityError):
+                record_completion(habit.id, "2024-01-15")
+            create_entry("after", entry_date="2024-01-15")
+
+        contents = [e.content for e in get_entries_by_date("2024-01-15")]
+        assert contents == ["batch task", "after"]
+
+    def test_write_does_not_commit_outer(self, sample_habits):
+        """A successful habit write leaves committing to the outer block."""
+        from clibujo_v2.core.db import get_shared_connection, transaction
+
+        habit = sample_habits[0]
+        conn = get_shared_connection()
+
+        with transaction(conn):
+            record_completion(habit.id, "2024-01-15")
+            assert conn.in_transaction
+            conn.rollback()
+
+        assert not is_completed_on_date(habit.id, "2024-01-15")
+
+
+class TestCompletionQueryPlans:
+    """Per-habit completion queries use the (habit_id, completion_date) index."""
+
+    @pytest.mark.parametrize(
+        "sql_name,params",
+        [
+            ("_SQL_IS_COMPLETED", (1, "2024-01-15")),
+            ("_SQL_COUNT_COMPLETIONS_IN_RANGE", (1, "2024-01-01", "2024-01-31")),
+            ("_SQL_COMPLETION_AGES_UNTIL", ("2024-01-15", 1, "2024-01-15")),
+        ],
+    )
+    def test_uses_unique_index(self, db_connection, sql_name, params):
+        """The query seeks the unique index instead of scanning."""
+        from clibujo_v2.core import habits
+
+        sql = getattr(habits, sql_name)
+        plan = " ".join(
+            row[3] for row in db_connection.execute("EXPLAIN QUERY PLAN " + sql, params)
+        )
+
+        assert "sqlite_autoindex_habit_completions_1" in plan
+        assert "SCAN" not in plan
+
+
+class TestRecordCompletionsBulk:
+    """Tests for bulk completion recording."""
+
+    def test_records_all(self, sample_habits):
+        """Every completion is recorded."""
+        exercise, read = sample_habits[0], sample_habits[1]
+        count = record_completions_bulk(
+            [
+                (exercise.id, "2024-01-15", None),
+                (exercise.id, "2024-01-16", "gym"),
+                (read.id, "2024-01-15", None),
+            ]
+        )
+
+        assert count == 3
+        assert is_completed_on_date(exercise.id, "2024-01-16")
+        assert is_completed_on_date(read.id, "2024-01-15")
+
+    def test_duplicate_rolls_back(self, sample_habits):
+        """A duplicate completion records nothing."""
+        habit = sample_habits[0]
+        record_completion(habit.id, "2024-01-15")
+
+        with pytest.raises(sqlite3.IntegrityError):
+            record_completions_bulk(
+                [(habit.id, "2024-01-14", None), (habit.id, "2024-01-15", None)]
+            )
+
+        assert not is_completed_on_date(habit.id, "2024-01-14")
+
+    def test_undo_removes_completion(self, sample_habits):
+        """Bulk completions are recorded for undo."""
+        from clibujo_v2.core.undo import undo_last_action
+
+        habit = sample_habits[0]
+        record_completions_bulk([(habit.id, "2024-01-15", None)])
+
+        assert undo_last_action() is not None
+        assert not is_completed_on_date(habit.id, "2024-01-15")
+
+
 class TestGetHabitsDueOnDate:
     """Tests for getting habits due on a date."""
 
@@ -262,6 +430,44 @@ class TestGetHabitsDueOnDate:
         habit_names = [h.name for h in habits]
         assert "Exercise" not in habit_names
 
+    def test_specific_days(self, sample_habits):
+        """Specific-day habits are due only on their days."""
+        monday = date(2024, 1, 15)
+
+        monday_names = [h.name for h in get_habits_due_on_date(monday)]
+        tuesday_names = [h.name for h in get_habits_due_on_date(monday + timedelta(days=1))]
+
+        assert "Meditate" in monday_names
+        assert "Meditate" not in tuesday_names
+        assert "Read" in tuesday_names
+
+    @pytest.mark.parametrize(
+        "status,frequency_type,expected",
+        [
+            ("active", "daily", True),
+            ("active", "weekly", True),
+            ("active", "monthly", True),
+            ("paused", "daily", False),
+            ("quit", "weekly", False),
+            ("active", "hourly", False),
+        ],
+    )
+    def test_is_due_by_status_and_type(self, status, frequency_type, expected):
+        """Due-ness depends on status and frequency type."""
+        habit = Habit(name="Test", status=status, frequency_type=frequency_type)
+
+        assert is_habit_due_on_date(habit, date(2024, 1, 15)) is expected
+
+    def test_is_due_with_day_name(self, sample_habits):
+        """A precomputed day name gives the same answer."""
+        habit = sample_habits[2]  # Meditate, mon/wed/fri
+        monday = date(2024, 1, 15)
+
+        assert habit.frequency_days_list == frozenset({"mon", "wed", "fri"})
+        assert is_habit_due_on_date(habit, monday)
+        assert is_habit_due_on_date(habit, monday, day_name="mon")
+        assert not is_habit_due_on_date(habit, monday + timedelta(days=1), day_name="tue")
+
 
 class TestHabitProgress:
     """Tests for habit progress calculation."""
@@ -289,6 +495,50 @@ class TestHabitProgress:
         assert progress["completed"] == 1
         assert progress["percentage"] == 100
 
+    def test_weekly_progress_counts_week(self, sample_habits):
+        """Weekly progress counts completions in the current week."""
+        habit = sample_habits[1]  # Read, weekly:3
+        monday = date(2024, 1, 15)
+
+        record_completion(habit.id, monday.isoformat())
+        record_completion(habit.id, (monday + timedelta(days=2)).isoformat())
+        record_completion(habit.id, (monday - timedelta(days=1)).isoformat())
+        progress = get_habit_progress(habit, monday + timedelta(days=3))
+
+        assert progress["completed"] == 2
+        assert progress["target"] == 3
+        assert progress["period"] == "week"
+
+
+class TestGetAllProgress:
+    """Tests for batched habit progress."""
+
+    def test_matches_single_progress(self, sample_habits):
+        """Batched progress equals per-habit progress."""
+        exercise, read, meditate = sample_habits
+        target = date(2024, 1, 31)
+        record_completions_bulk(
+            [
+                (exercise.id, "2024-01-31", None),
+                (exercise.id, "2024-01-30", None),
+                (read.id, "2024-01-29", None),
+                (read.id, "2024-01-27", None),
+                (meditate.id, "2024-01-31", None),
+                (meditate.id, "2024-02-01", None),
+            ]
+        )
+
+        progress = get_all_progress(sample_habits, target)
+
+        for habit in sample_habits:
+            assert progress[habit.id] == get_habit_progress(habit, target)
+        assert progress[exercise.id]["streak"] == 2
+        assert progress[read.id]["completed"] == 1
+
+    def test_empty(self, db_connection):
+        """No habits gives no progress."""
+        assert get_all_progress([]) == {}
+
 
 class TestCalculateStreak:
     """Tests for streak calculation."""
@@ -329,6 +579,67 @@ class TestCalculateStreak:
 
         assert streak == 1  # Only today counts
 
+    def test_weekly_streak_stops_under_target(self, sample_habits):
+        """A week below target ends the weekly streak."""
+        habit = sample_habits[1]  # Read, weekly:3
+        monday = date(2024, 1, 15)
+        days = [monday + timedelta(days=i) for i in range(3)]
+        days += [monday - timedelta(weeks=1)]  # only one the week before
+        days += [monday - timedelta(weeks=2, days=-i) for i in range(3)]
+        record_completions_bulk([(habit.id, d.isoformat(), None) for d in days])
+
+        assert calculate_streak(habit, monday) == 1
+
+    def test_monthly_streak_across_year(self, db_connection):
+        """Monthly streak counts back across a year boundary."""
+        habit = create_habit("Review", "monthly:2")
+        days = ["2023-11-03", "2023-11-20", "2023-12-01", "2023-12-31",
+                "2024-01-10", "2024-01-11", "2023-09-01", "2023-09-02"]
+        record_completions_bulk([(habit.id, d, None) for d in days])
+
+        assert calculate_streak(habit, date(2024, 1, 15)) == 3
+        assert calculate_streak(habit, date(2024, 2, 1)) == 0
+
+    def test_long_streak_across_months(self, sample_habits):
+        """Daily streak spans month boundaries and stops at the gap."""
+        habit = sample_habits[0]
+        target = date(2024, 3, 10)
+        days = [target - timedelta(days=i) for i in range(40)]
+        days.append(target - timedelta(days=45))
+        record_completions_bulk([(habit.id, d.isoformat(), None) for d in days])
+
+        assert calculate_streak(habit, target) == 40
+        assert calculate_streak(habit, target + timedelta(days=1)) == 0
+
+    def test_streak_consecutive_weeks(self, sample_habits):
+        """Weekly streak counts weeks that met the target."""
+        habit = sample_habits[1]  # Read, weekly:3
+        monday = date(2024, 1, 15)
+
+        for week in range(2):
+            start = monday - timedelta(weeks=week)
+            for i in range(3):
+                record_completion(habit.id, (start + timedelta(days=i)).isoformat())
+
+        assert calculate_streak(habit, monday + timedelta(days=6)) == 2
+
+
+class TestPinnedToday:
+    """Tests for pinning the default date."""
+
+    def test_defaults_use_pinned_date(self, sample_habits):
+        """Date defaults follow the pinned date and revert afterwards."""
+        habit = sample_habits[0]
+        pinned = date(2024, 1, 15)
+
+        with pinned_today(pinned):
+            completion = record_completion(habit.id)
+            assert is_completed_on_date(habit.id)
+            assert calculate_streak(habit) == 1
+
+        assert completion.completion_date == "2024-01-15"
+        assert not is_completed_on_date(habit.id)
+
 
 class TestHabitCalendar:
     """Tests for habit calendar."""
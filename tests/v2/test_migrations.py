@@ -13,6 +13,7 @@ from clibujo_v2.core.migrations import (
     get_migration_history,
     get_tasks_needing_migration,
     bulk_migrate_to_today,
+    get_migration_stats,
 )
 
 
@@ -82,6 +83,33 @@ class TestMigrateToDate:
 
         assert result is None
 
+    def test_appends_after_existing_entries(self, db_connection):
+        """The migrated task goes after everything already on the target day."""
+        for content in ("First", "Second"):
+            create_entry(content, entry_date="2025-01-15", conn=db_connection)
+        task = create_entry(
+            "Late task", entry_type="task", entry_date="2025-01-10", conn=db_connection
+        )
+
+        new_entry = migrate_to_date(task.id, "2025-01-15", conn=db_connection)
+
+        assert new_entry.sort_order == 2
+
+    @pytest.mark.parametrize(
+        "sql_name",
+        ["_SQL_INSERT_ON_DATE", "_SQL_INSERT_IN_MONTH", "_SQL_INSERT_IN_COLLECTION"],
+    )
+    def test_next_sort_order_is_index_seek(self, db_connection, sql_name):
+        """The new entry's sort_order comes from the context index, not a scan."""
+        from clibujo_v2.core import migrations
+
+        sql = getattr(migrations, sql_name)
+        plan = " ".join(
+            row[3] for row in db_connection.execute("EXPLAIN QUERY PLAN " + sql, (1, ".", "x"))
+        )
+
+        assert "COVERING INDEX idx_entries_context_sort" in plan
+
 
 class TestMigrateToMonth:
     """Tests for scheduling tasks to a future month."""
@@ -168,6 +196,43 @@ class TestMigrationHistory:
         assert len(history) == 1
         assert history[0].from_date == "2025-01-01"
         assert history[0].to_date == "2025-01-05"
+        assert history[0].to_month is None
+        assert history[0].to_collection_id is None
+
+    def test_history_limit(self, db_connection):
+        """A limit keeps only the most recent records."""
+        task = create_entry("Task", entry_type="task", entry_date="2025-01-01", conn=db_connection)
+        db_connection.executemany(
+            "INSERT INTO migrations (entry_id, to_date, migrated_at) VALUES (?, ?, ?)",
+            [(task.id, f"2025-01-0{day}", f"2025-01-0{day} 09:00:00") for day in (2, 3, 4)],
+        )
+
+        history = get_migration_history(task.id, limit=2, conn=db_connection)
+
+        assert [m.to_date for m in history] == ["2025-01-04", "2025-01-03"]
+        assert len(get_migration_history(task.id, conn=db_connection)) == 3
+
+    def test_history_reads_index_in_order(self, db_connection):
+        """History is a range scan on its index with no sort step."""
+        from clibujo_v2.core.migrations import _SQL_HISTORY
+
+        plan = " ".join(
+            row[3] for row in db_connection.execute("EXPLAIN QUERY PLAN " + _SQL_HISTORY, (1, 10))
+        )
+
+        assert "idx_migrations_entry_time" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_from_tuple_matches_from_row(self, db_connection):
+        """Positional construction agrees with the name-based one."""
+        from clibujo_v2.core.models import Migration
+
+        task = create_entry("Task", entry_type="task", entry_date="2025-01-01", conn=db_connection)
+        migrate_to_month(task.id, "2025-02", conn=db_connection)
+
+        row = db_connection.execute("SELECT * FROM migrations").fetchone()
+
+        assert Migration.from_tuple(row) == Migration.from_row(row)
 
 
 class TestGetTasksNeedingMigration:
@@ -207,6 +272,25 @@ class TestGetTasksNeedingMigration:
 
         assert len(tasks) == 0
 
+    def test_reads_open_tasks_index_in_order(self, db_connection):
+        """The open-task partial index serves both the filter and the ORDER BY."""
+        from clibujo_v2.core.migrations import _SQL_NEEDING_MIGRATION
+
+        for day in range(1, 29):
+            for status in ("open", "complete", "complete", "cancelled"):
+                create_entry("x", entry_type="task", status=status,
+                             entry_date=f"2025-01-{day:02d}", conn=db_connection)
+        db_connection.execute("ANALYZE")
+
+        plan = " ".join(
+            row[3] for row in db_connection.execute(
+                "EXPLAIN QUERY PLAN " + _SQL_NEEDING_MIGRATION, ("2025-01-10", "2025-01")
+            )
+        )
+
+        assert "idx_entries_open_tasks_due" in plan
+        assert "TEMP B-TREE" not in plan
+
 
 class TestBulkMigration:
     """Tests for bulk migration."""
@@ -232,3 +316,110 @@ class TestBulkMigration:
 
         today = date.today().isoformat()
         assert all(e.entry_date == today for e in new_entries)
+
+    def test_bulk_migrate_is_one_transaction(self, db_connection):
+        """A failure partway through leaves every task unmigrated."""
+        from clibujo_v2.core.db import transaction
+
+        task1 = create_entry("Task 1", entry_type="task", entry_date="2025-01-01", conn=db_connection)
+        task2 = create_entry("Task 2", entry_type="task", entry_date="2025-01-02", conn=db_connection)
+
+        with pytest.raises(RuntimeError):
+            with transaction(db_connection):
+                bulk_migrate_to_today([task1.id, task2.id], conn=db_connection)
+                raise RuntimeError("abort")
+
+        assert get_entry(task1.id, conn=db_connection).status == "open"
+        assert get_entry(task2.id, conn=db_connection).status == "open"
+        assert get_migration_history(task1.id, conn=db_connection) == []
+
+    def test_bulk_migrate_skips_non_tasks(self, db_connection):
+        """Events and missing ids are skipped."""
+        task = create_entry("Task", entry_type="task", entry_date="2025-01-01", conn=db_connection)
+        event = create_entry("Event", entry_type="event", entry_date="2025-01-01", conn=db_connection)
+
+        new_entries = bulk_migrate_to_today([task.id, event.id, 9999], conn=db_connection)
+
+        assert [e.content for e in new_entries] == ["Task"]
+
+    def test_bulk_migrate_claims_tasks_once(self, db_connection):
+        """The batch validates and claims all tasks in one statement."""
+        tasks = [
+            create_entry(f"Task {i}", entry_type="task", entry_date="2025-01-01", conn=db_connection)
+            for i in range(20)
+        ]
+        statements = []
+        db_connection.set_trace_callback(statements.append)
+        try:
+            new_entries = bulk_migrate_to_today([t.id for t in tasks], conn=db_connection)
+        finally:
+            db_connection.set_trace_callback(None)
+
+        assert len(new_entries) == 20
+        # The trace shows expanded SQL, so match on the statement text
+        assert len([s for s in statements if "UPDATE entries" in s]) == 1
+
+    def test_bulk_migrate_keeps_order_and_history(self, db_connection):
+        """New entries follow the caller's order after today's entries."""
+        today = date.today().isoformat()
+        create_entry("Already today", entry_type="note", entry_date=today, conn=db_connection)
+        first = create_entry("First", entry_type="task", entry_date="2025-01-01", conn=db_connection)
+        second = create_entry("Second", entry_type="task", entry_month="2025-01", conn=db_connection)
+
+        new_entries = bulk_migrate_to_today([second.id, first.id, second.id], conn=db_connection)
+
+        assert [(e.content, e.sort_order) for e in new_entries] == [("Second", 1), ("First", 2)]
+        assert get_entry(first.id, conn=db_connection).status == "migrated"
+        history = get_migration_history(second.id, conn=db_connection)
+        assert [(m.from_month, m.to_date, m.to_collection_id) for m in history] == [
+            ("2025-01", today, None)
+        ]
+
+
+class TestMigrationStats:
+    """Tests for migration statistics."""
+
+    def test_empty(self, db_connection):
+        """No migrations yields zero counts."""
+        assert get_migration_stats(conn=db_connection) == {
+            "total": 0, "to_date": 0, "to_month": 0, "to_collection": 0,
+        }
+
+    def test_counts_by_destination(self, db_connection):
+        """Each migration is counted once under its destination."""
+        collection = create_collection("Project", conn=db_connection)
+        tasks = [
+            create_entry(f"Task {i}", entry_type="task", entry_date="2025-01-01", conn=db_connection)
+            for i in range(4)
+        ]
+        migrate_to_date(tasks[0].id, "2025-01-02", conn=db_connection)
+        migrate_to_date(tasks[1].id, "2025-01-03", conn=db_connection)
+        migrate_to_month(tasks[2].id, "2025-02", conn=db_connection)
+        migrate_to_collection(tasks[3].id, collection.id, conn=db_connection)
+
+        assert get_migration_stats(conn=db_connection) == {
+            "total": 4, "to_date": 2, "to_month": 1, "to_collection": 1,
+        }
+
+
+class TestDefaultConnection:
+    """Tests for calls made without an explicit connection."""
+
+    def test_reuses_shared_connection(self):
+        """Migrations run on the shared writer, which stays open afterwards."""
+        from clibujo_v2.core.db import get_shared_connection
+
+        conn = get_shared_connection()
+        task = create_entry("Task", entry_type="task", entry_date="2025-01-01")
+
+        new_entry = migrate_to_date(task.id, "2025-01-02")
+
+        assert get_shared_connection() is conn
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+        assert new_entry.entry_date == "2025-01-02"
+        assert get_migration_history(task.id)[0].to_date == "2025-01-02"
+
+    def test_works_on_fresh_database(self):
+        """No ensure_db() is needed; the default connections create the schema."""
+        assert get_migration_stats()["total"] == 0
+        assert get_tasks_needing_migration("2025-01-10") == []
@@ -8,7 +8,7 @@ from clibujo_v2.core.mood import (
     MoodEntry, WatchData, Medication, Episode, MoodTrigger, Baseline,
     get_mood_entry, save_mood_entry, undo_mood_entry,
     get_mood_entries, get_recent_mood_entries,
-    get_watch_data, save_watch_data,
+    update_mood_note, get_watch_data, save_watch_data, update_watch_fields,
     get_medications, get_medication_by_name, add_medication,
     deactivate_medication, log_medication, get_med_logs_for_date,
     get_current_episode, start_episode, end_episode, add_episode, get_episodes,
@@ -66,6 +66,15 @@ class TestMoodEntry:
         assert retrieved.mood == 3
         assert retrieved.energy == 5  # Should be preserved
         assert retrieved.anxiety == 2
+        assert update.id == entry.id == retrieved.id
+
+    def test_first_save_records_no_history(self, db_connection):
+        """Only an update of an existing entry leaves an undo snapshot."""
+        save_mood_entry(MoodEntry(date="2025-01-15", mood=1), conn=db_connection)
+
+        count = db_connection.execute("SELECT COUNT(*) FROM mood_entry_history").fetchone()[0]
+        assert count == 0
+        assert undo_mood_entry("2025-01-15", conn=db_connection) is None
 
     def test_mood_entry_with_all_fields(self, db_connection):
         """Create mood entry with all fields."""
@@ -154,6 +163,21 @@ class TestWatchData:
         retrieved = get_watch_data("2025-01-15", conn=db_connection)
         assert retrieved.steps == 8000  # Preserved
         assert retrieved.hrv == 50  # Added
+        assert update.id == data.id == retrieved.id
+
+    def test_update_watch_fields(self, db_connection):
+        """Only the given watch columns are written."""
+        update_watch_fields("2025-01-15", {"steps": 8000}, conn=db_connection)
+        update_watch_fields("2025-01-15", {"hrv": 50}, conn=db_connection)
+
+        retrieved = get_watch_data("2025-01-15", conn=db_connection)
+        assert retrieved.steps == 8000
+        assert retrieved.hrv == 50
+
+    def test_update_watch_fields_rejects_unknown(self, db_connection):
+        """Unknown watch columns are rejected."""
+        with pytest.raises(ValueError):
+            update_watch_fields("2025-01-15", {"bogus": 1}, conn=db_connection)
 
 
 class TestMedications:
@@ -380,3 +404,169 @@ class TestMoodUndo:
         result = undo_mood_entry("2025-01-15", conn=db_connection)
 
         assert result is None
+
+    def test_update_mood_note_keeps_values_and_undo(self, db_connection):
+        """Setting a note preserves other fields and can be undone."""
+        save_mood_entry(MoodEntry(date="2025-01-15", mood=2, note="before"), conn=db_connection)
+
+        update_mood_note("2025-01-15", "after", conn=db_connection)
+        entry = get_mood_entry("2025-01-15", conn=db_connection)
+        assert entry.mood == 2
+        assert entry.note == "after"
+
+        restored = undo_mood_entry("2025-01-15", conn=db_connection)
+        assert restored.note == "before"
+
+    def test_direct_update_records_history(self, db_connection):
+        """The history trigger snapshots any UPDATE, not just mood.py writers."""
+        save_mood_entry(MoodEntry(date="2025-01-15", mood=1), conn=db_connection)
+
+        db_connection.execute(
+            "UPDATE mood_entries SET mood = 3, updated_at = 'now' WHERE date = '2025-01-15'"
+        )
+
+        restored = undo_mood_entry("2025-01-15", conn=db_connection)
+        assert restored.mood == 1
+        count = db_connection.execute("SELECT COUNT(*) FROM mood_entry_history").fetchone()[0]
+        assert count == 0
+
+    def test_save_without_history(self, db_connection):
+        """save_history=False leaves no snapshot behind."""
+        save_mood_entry(MoodEntry(date="2025-01-15", mood=1), conn=db_connection)
+        save_mood_entry(MoodEntry(date="2025-01-15", mood=2), conn=db_connection)
+        save_mood_entry(MoodEntry(date="2025-01-15", mood=3), conn=db_connection,
+                        save_history=False)
+
+        count = db_connection.execute("SELECT COUNT(*) FROM mood_entry_history").fetchone()[0]
+        assert count == 1
+
+    def test_update_mood_note_creates_entry(self, db_connection):
+        """Setting a note on an empty date creates the entry."""
+        update_mood_note("2025-01-16", "fresh", conn=db_connection)
+
+        entry = get_mood_entry("2025-01-16", conn=db_connection)
+        assert entry is not None
+        assert entry.note == "fresh"
+        assert entry.mood is None
+
+
+class TestDefaultConnection:
+    """Tests for calls made without an explicit connection."""
+
+    def test_reuses_shared_connections(self):
+        """Writes use the shared writer and reads see them; neither is closed."""
+        from clibujo_v2.core.db import get_shared_connection, get_read_connection
+
+        writer = get_shared_connection()
+        save_mood_entry(MoodEntry(date="2025-01-15", mood=1))
+        set_target("mood", 0.5)
+
+        assert get_mood_entry("2025-01-15").mood == 1
+        assert get_target("mood") == 0.5
+        assert get_shared_connection() is writer
+        assert writer.execute("SELECT 1").fetchone()[0] == 1
+        assert get_read_connection().execute("SELECT 1").fetchone()[0] == 1
+
+
+class TestBatchedWrites:
+    """Tests for grouping several mood writes into one transaction."""
+
+    def test_writes_join_outer_transaction(self, db_connection):
+        """Inside transaction() the writers defer to the outer commit."""
+        from clibujo_v2.core.db import transaction
+
+        with transaction(db_connection):
+            for day in range(1, 4):
+                save_mood_entry(MoodEntry(date=f"2025-01-0{day}", mood=day), conn=db_connection)
+                save_watch_data(WatchData(date=f"2025-01-0{day}", steps=day), conn=db_connection)
+            assert db_connection.in_transaction
+
+        assert not db_connection.in_transaction
+        assert len(get_mood_entries("2025-01-01", "2025-01-03", conn=db_connection)) == 3
+
+    def test_failure_rolls_back_whole_batch(self, db_connection):
+        """An error partway through discards the earlier writes too."""
+        from clibujo_v2.core.db import transaction
+
+        with pytest.raises(RuntimeError):
+            with transaction(db_connection):
+                save_mood_entry(MoodEntry(date="2025-01-01", mood=1), conn=db_connection)
+                raise RuntimeError("import failed")
+
+        assert get_mood_entry("2025-01-01", conn=db_connection) is None
+
+
+class TestMoodQueryPlans:
+    """Hot mood queries are served by indexes rather than scans and sorts."""
+
+    def _plan(self, conn, sql, params=()):
+        return " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+    def test_current_episode_uses_partial_index(self, db_connection):
+        """The open episode comes straight off the partial index."""
+        plan = self._plan(
+            db_connection,
+            "SELECT * FROM episodes WHERE end_date IS NULL ORDER BY start_date DESC LIMIT 1",
+        )
+
+        assert "idx_episodes_open" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_recent_episodes_use_start_index(self, db_connection):
+        """Recent episodes are range-scanned in start_date order."""
+        plan = self._plan(
+            db_connection,
+            "SELECT * FROM episodes WHERE start_date >= date('now', ?) ORDER BY start_date DESC",
+            ("-30 days",),
+        )
+
+        assert "idx_episodes_start" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_active_medications_in_index_order(self, db_connection):
+        """Active medications are read in display order without a sort."""
+        plan = self._plan(
+            db_connection,
+            "SELECT * FROM medications WHERE active = 1 ORDER BY time_of_day, name",
+        )
+
+        assert "idx_medications_active" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_no_redundant_date_indexes(self, db_connection):
+        """Date indexes duplicating UNIQUE constraints are dropped."""
+        names = {
+            row[0] for row in db_connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+
+        assert "idx_mood_entries_date" not in names
+        assert "idx_watch_data_date" not in names
+        assert "idx_med_logs_date" not in names
+
+
+class TestFromTuple:
+    """Positional construction agrees with the name-based one."""
+
+    @pytest.mark.parametrize("model,table", [
+        (MoodEntry, "mood_entries"),
+        (WatchData, "watch_data"),
+        (Episode, "episodes"),
+        (Baseline, "baselines"),
+    ])
+    def test_from_tuple_matches_from_row(self, db_connection, model, table):
+        """Each mood model builds the same object from a row by position."""
+        save_mood_entry(MoodEntry(date="2025-01-15", mood=2, energy=6, note="n"),
+                        conn=db_connection)
+        save_watch_data(WatchData(date="2025-01-15", steps=9000, hrv=40), conn=db_connection)
+        add_episode("2025-01-01", "2025-01-10", "depression", severity=3,
+                    note="x", conn=db_connection)
+        save_baseline(Baseline(metric="mood", value=1.5, std_dev=0.5,
+                               calculated_at="2025-01-15", days_used=30),
+                      conn=db_connection)
+
+        row = db_connection.execute(f"SELECT * FROM {table}").fetchone()
+
+        assert model.from_tuple(row) == model.from_row(row)
+        assert model.from_tuple(tuple(row)) == model.from_row(row)
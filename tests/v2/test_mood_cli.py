@@ -5,7 +5,7 @@ from click.testing import CliRunner
 from datetime import date
 
 from clibujo_v2.cli import cli
-from clibujo_v2.core.db import init_db
+from clibujo_v2.core.db import get_connection, init_db
 from clibujo_v2.core.mood import (
     get_mood_entry, get_medications, get_medication_by_name,
     get_current_episode, get_mood_triggers, get_all_targets,
@@ -167,6 +167,56 @@ class TestEpisodeCommands:
         assert result.exit_code == 0
 
 
+class TestDateParsing:
+    """Only exact ASCII YYYY-MM-DD / YYYY-MM strings are accepted."""
+
+    MALFORMED_DATES = ["+025-03-14", "2025- 3-14", "\u0662\u0660\u0662\u0665-03-14", "2025-3-14"]
+
+    @pytest.mark.parametrize("bad", MALFORMED_DATES)
+    def test_parse_mood_date_rejects(self, bad):
+        """Signs, spaces and non-ASCII digits raise BadParameter."""
+        import click
+        from clibujo_v2.commands.mood import parse_mood_date
+
+        with pytest.raises(click.BadParameter):
+            parse_mood_date(bad)
+
+    def test_parse_mood_date_accepts_iso(self):
+        """A well-formed date round-trips."""
+        from clibujo_v2.commands.mood import parse_mood_date
+
+        assert parse_mood_date("2025-03-14") == "2025-03-14"
+
+    @pytest.mark.parametrize("bad", MALFORMED_DATES)
+    def test_log_rejects_and_stores_nothing(self, runner, bad):
+        """mood log -d refuses malformed dates."""
+        result = runner.invoke(cli, ["mood", "log", "-d", bad])
+
+        assert result.exit_code != 0
+        assert "Invalid date format" in result.output
+        assert get_mood_entry("0025-03-14") is None
+        assert get_mood_entry("2025-03-14") is None
+
+    @pytest.mark.parametrize("bad", ["+025-03", "2025- 3", "\u0662\u0660\u0662\u0665-03", "2025-13"])
+    def test_month_rejects(self, runner, bad):
+        """mood month prints an error for malformed months."""
+        result = runner.invoke(cli, ["mood", "month", "-m", bad])
+
+        assert "Invalid month format" in result.output
+
+    @pytest.mark.parametrize("bad", MALFORMED_DATES)
+    def test_episode_add_rejects(self, runner, bad):
+        """episode add prints an error and records nothing."""
+        result = runner.invoke(
+            cli, ["mood", "episode", "add", "--start", bad, "--end", "2025-03-20", "--type", "depression"]
+        )
+
+        assert "Invalid date format" in result.output
+        conn = get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM episodes").fetchone()[0] == 0
+        conn.close()
+
+
 class TestTriggerCommands:
     """Tests for trigger CLI commands."""
 
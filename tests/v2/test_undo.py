@@ -2,7 +2,8 @@
 
 import pytest
 
-from clibujo_v2.core.entries import create_entry, get_entry, update_entry, delete_entry
+from clibujo_v2.core.collections import create_collection
+from clibujo_v2.core.entries import create_entry, get_entry, update_entry, delete_entry, complete_entry
 from clibujo_v2.core.undo import (
     get_undo_history,
     get_last_action,
@@ -47,6 +48,30 @@ class TestUndoHistory:
         assert history[0].action_type == "delete"
 
 
+    def test_history_capped(self, db_connection):
+        """Undo history keeps only the most recent 50 actions."""
+        for i in range(60):
+            create_collection(f"Coll {i}", conn=db_connection)
+
+        count = db_connection.execute("SELECT COUNT(*) FROM undo_history").fetchone()[0]
+        assert count == 50
+
+        kept = [a.new_data for a in get_undo_history(limit=100, conn=db_connection)]
+        assert any('"Coll 59"' in data for data in kept)
+        assert not any('"Coll 9"' in data for data in kept)
+
+    def test_habit_history_capped(self, db_connection):
+        """Habit actions rely on the same insert trigger to cap history."""
+        from clibujo_v2.core.habits import create_habit
+
+        for i in range(60):
+            create_habit(f"Habit {i}", conn=db_connection)
+
+        count = db_connection.execute("SELECT COUNT(*) FROM undo_history").fetchone()[0]
+        assert count == 50
+        assert "Habit 59" in get_last_action(conn=db_connection).new_data
+
+
 class TestGetLastAction:
     """Tests for getting last action."""
 
@@ -90,6 +115,18 @@ class TestUndoLastAction:
         entry = get_entry(entry.id, conn=db_connection)
         assert entry.content == "Original content"
 
+    def test_undo_complete(self, db_connection):
+        """Undo completing a task."""
+        entry = create_entry("Test task", entry_date="2025-01-15", conn=db_connection)
+        complete_entry(entry.id, conn=db_connection)
+
+        result = undo_last_action(conn=db_connection)
+
+        assert result["success"] is True
+        entry = get_entry(entry.id, conn=db_connection)
+        assert entry.status == "open"
+        assert entry.completed_at is None
+
     def test_undo_delete(self, db_connection):
         """Undo entry deletion."""
         entry = create_entry("Test task", entry_date="2025-01-15", conn=db_connection)
@@ -101,6 +138,20 @@ class TestUndoLastAction:
         assert result["success"] is True
         assert "Restored" in result["message"]
 
+    def test_undo_habit_update(self, db_connection):
+        """Undo habit rename."""
+        from clibujo_v2.core.habits import create_habit, update_habit, get_habit
+
+        habit = create_habit("Exercise", "days:mon,wed", conn=db_connection)
+        update_habit(habit.id, name="Workout", conn=db_connection)
+
+        result = undo_last_action(conn=db_connection)
+
+        assert result["success"] is True
+        habit = get_habit(habit.id, conn=db_connection)
+        assert habit.name == "Exercise"
+        assert habit.frequency_days == "mon,wed"
+
     def test_undo_nothing(self, db_connection):
         """Undo with empty history."""
         # Clear any existing history
@@ -166,3 +217,12 @@ class TestDescribeAction:
 
         assert len(description) < 100
         assert "..." in description
+
+    def test_describe_entry_update(self, db_connection):
+        """Entry update snapshots carry both old and new values."""
+        entry = create_entry("Test task", entry_date="2025-01-15", conn=db_connection)
+        update_entry(entry.id, status="complete", conn=db_connection)
+
+        description = describe_action(get_last_action(conn=db_connection))
+
+        assert "open -> complete" in description